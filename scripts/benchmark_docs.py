@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Benchmark do pipeline de documentação do Bota Love App
+Mede os geradores em corpora sintéticos (1k e 10k linhas por padrão; 100k com
+--sizes) e nos docs/*.md reais; cada medição roda em um processo novo para que
+o pico de RSS seja só dela. O resultado sai em JSON e pode ser comparado com um
+baseline salvo para pegar regressões nos loops por linha
+
+O baseline depende da máquina: não há um versionado. Gere o seu antes de
+mexer no código e compare depois, com as mesmas opções:
+    python scripts/benchmark_docs.py --save-baseline
+    python scripts/benchmark_docs.py -o resultado.json
+Com as opções padrão leva cerca de 1 minuto em um núcleo
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from docgen.backends import module_available
+from docgen.batch import find_markdown_files
+from docgen.metadata import GENERATOR_VERSION
+
+# Caminhos padrão
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DOCS_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), 'docs')
+DEFAULT_BASELINE = os.path.join(SCRIPT_DIR, 'benchmark_baseline.json')
+
+DEFAULT_SIZES = (1000, 10000)
+# Cada medição repete até repeat vezes, mas para quando o tempo somado passa
+# do orçamento (um build ReportLab de 10k linhas leva ~10 s)
+DEFAULT_REPEAT = 3
+DEFAULT_BUDGET = 5.0
+# Data fixa: a saída (e o tempo) não dependem do dia da execução
+BUILD_DATE = '2026-02-01'
+
+WORDS = (
+    'validação perfil match chat agronegócio usuário premium cadastro fazenda '
+    'evento notificação segurança firebase regra índice consulta mensagem foto '
+    'assinatura plano produtor rural localização filtro distância moderação'
+).split()
+
+
+# Corpus sintético
+
+def _sentence(rng, words=12):
+    """Frase com marcação inline variada"""
+    parts = []
+    for _ in range(words):
+        word = rng.choice(WORDS)
+        roll = rng.random()
+        if roll < 0.06:
+            word = f'**{word}**'
+        elif roll < 0.10:
+            word = f'*{word}*'
+        elif roll < 0.14:
+            word = f'`{word}()`'
+        elif roll < 0.16:
+            word = f'[{word}](https://botalove.app/{word})'
+        parts.append(word)
+    return ' '.join(parts).capitalize() + '.'
+
+
+def _block(rng, index):
+    """Um bloco markdown (lista de linhas) escolhido ao acaso"""
+    if index % 60 == 0:
+        return [f'# Capítulo {index // 60 + 1}', '']
+    if index % 8 == 0:
+        return [f'## Seção {index}: {rng.choice(WORDS).capitalize()}', '']
+
+    roll = rng.random()
+    if roll < 0.35:
+        return [_sentence(rng, rng.randint(8, 30)), '']
+    if roll < 0.55:
+        lines = []
+        ordered = rng.random() < 0.3
+        for number in range(1, rng.randint(3, 8) + 1):
+            marker = f'{number}.' if ordered else rng.choice(('-', '-', '*'))
+            indent = '  ' if number > 1 and rng.random() < 0.2 else ''
+            lines.append(f'{indent}{marker} {_sentence(rng, rng.randint(3, 10))}')
+        if rng.random() < 0.3:
+            lines.append(f'✅ {_sentence(rng, 4)}')
+        return lines + ['']
+    if roll < 0.68:
+        language = rng.choice(('typescript', 'json', 'bash', ''))
+        body = [f'  const {rng.choice(WORDS)}{n} = await service.get({n});' for n in range(rng.randint(4, 15))]
+        return [f'```{language}', *body, '```', '']
+    if roll < 0.82:
+        columns = rng.randint(2, 4)
+        lines = [
+            '| ' + ' | '.join(rng.choice(WORDS).capitalize() for _ in range(columns)) + ' |',
+            '|' + '|'.join(rng.choice(('---', ':---:', '---:')) for _ in range(columns)) + '|',
+        ]
+        for _ in range(rng.randint(3, 10)):
+            lines.append('| ' + ' | '.join(_sentence(rng, rng.randint(1, 6)) for _ in range(columns)) + ' |')
+        return lines + ['']
+    if roll < 0.88:
+        return [f'#### {_sentence(rng, 4)}', '']
+    if roll < 0.95:
+        return [f'> {_sentence(rng, rng.randint(6, 16))}', '']
+    return ['---', '']
+
+
+def synthetic_markdown(line_count, seed=0):
+    """Markdown determinístico com cerca de line_count linhas (blocos completos)"""
+    rng = random.Random(seed)
+    lines = []
+    index = 0
+    while len(lines) < line_count:
+        lines.extend(_block(rng, index))
+        index += 1
+    return '\n'.join(lines) + '\n'
+
+
+def build_corpora(work_dir, sizes, include_docs=True):
+    """Escreve os corpora em work_dir; retorna {nome: caminho}"""
+    corpora = {}
+    for size in sizes:
+        name = f'synthetic-{size // 1000}k' if size % 1000 == 0 else f'synthetic-{size}'
+        path = os.path.join(work_dir, name + '.md')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(synthetic_markdown(size))
+        corpora[name] = path
+
+    if include_docs:
+        # Docs reais concatenados (mesma entrada do manual completo)
+        path = os.path.join(work_dir, 'docs.md')
+        with open(path, 'w', encoding='utf-8') as out:
+            for markdown_file in find_markdown_files(DOCS_DIR):
+                with open(markdown_file, 'r', encoding='utf-8') as f:
+                    out.write(f.read().rstrip('\n') + '\n\n')
+        corpora['docs'] = path
+
+    return corpora
+
+
+# Benchmarks (cada um recebe o corpus e devolve a função medida)
+
+def _clear_caches():
+    """Zera os caches por processo para medir sempre a partir do estado frio"""
+    from docgen.inline import parse_inline
+    parse_inline.cache_clear()
+    if module_available('reportlab'):
+        from docgen.render_reportlab import table_column_widths, text_width
+        text_width.cache_clear()
+        table_column_widths.cache_clear()
+
+
+def bench_html_page(corpus_file, work_dir):
+    """generate_html_pdf.markdown_to_html: página completa em uma string"""
+    from generate_html_pdf import markdown_to_html
+    with open(corpus_file, 'r', encoding='utf-8') as f:
+        source = f.read()
+    return lambda: markdown_to_html(source, BUILD_DATE)
+
+
+def bench_html_body(corpus_file, work_dir):
+    """generate_pdf.markdown_to_html: só o corpo, em uma string"""
+    from generate_pdf import markdown_to_html
+    with open(corpus_file, 'r', encoding='utf-8') as f:
+        source = f.read()
+    return lambda: markdown_to_html(source)
+
+
+def bench_html_stream(corpus_file, work_dir):
+    """Modo streaming: lê linha a linha e escreve direto no arquivo"""
+    from generate_html_pdf import stream_markdown
+    html_file = os.path.join(work_dir, 'stream.html')
+
+    def run():
+        with open(html_file, 'w', encoding='utf-8') as f:
+            stream_markdown([corpus_file], f, BUILD_DATE)
+    return run
+
+
+def bench_reportlab(corpus_file, work_dir):
+    """Build ReportLab completo (seções + flowables + layout), sem cache de seções"""
+    from docgen.sections import load_sections
+    from generate_pdf import create_pdf_with_reportlab
+    pdf_file = os.path.join(work_dir, 'reportlab.pdf')
+
+    def run():
+        create_pdf_with_reportlab(load_sections(corpus_file), pdf_file, BUILD_DATE)
+    return run
+
+
+def bench_cli_html(corpus_file, work_dir):
+    """CLI generate_html_pdf.py de ponta a ponta (processo novo)"""
+    command = [
+        sys.executable, os.path.join(SCRIPT_DIR, 'generate_html_pdf.py'), corpus_file,
+        '-o', os.path.join(work_dir, 'cli.html'), '--build-date', BUILD_DATE, '--no-cache',
+    ]
+    return lambda: subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+
+
+def bench_cli_pdf(corpus_file, work_dir):
+    """CLI generate_pdf.py de ponta a ponta com ReportLab (processo novo)"""
+    command = [
+        sys.executable, os.path.join(SCRIPT_DIR, 'generate_pdf.py'), corpus_file,
+        '-o', os.path.join(work_dir, 'cli.pdf'), '--backend', 'reportlab',
+        '--build-date', BUILD_DATE, '--no-cache',
+    ]
+    return lambda: subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+
+
+# nome: (função, usa subprocesso, precisa de reportlab)
+BENCHMARKS = {
+    'html_page': (bench_html_page, False, False),
+    'html_body': (bench_html_body, False, False),
+    'html_stream': (bench_html_stream, False, False),
+    'reportlab': (bench_reportlab, False, True),
+    'cli_html': (bench_cli_html, True, False),
+    'cli_pdf': (bench_cli_pdf, True, True),
+}
+
+
+# Medição
+
+def _silenced(func):
+    """Executa func com stdout descartado (os geradores imprimem progresso)"""
+    stdout = sys.stdout
+    with open(os.devnull, 'w') as devnull:
+        sys.stdout = devnull
+        try:
+            return func()
+        finally:
+            sys.stdout = stdout
+
+
+def _gc_allocations():
+    """Objetos rastreados pelo GC alocados até agora (aproximação por geração 0)"""
+    threshold = gc.get_threshold()[0]
+    return gc.get_stats()[0]['collections'] * threshold + gc.get_count()[0]
+
+
+def measure(name, corpus_file, work_dir, repeat, trace=False, budget=DEFAULT_BUDGET):
+    """
+    Mede um benchmark em um corpus (executado em um processo próprio)
+    Tempo: até repeat execuções com caches frios, parando quando o tempo somado
+    passa de budget segundos (sempre ao menos uma); memória: pico de RSS do
+    processo (ou dos subprocessos, nas medições de CLI) e, com trace, uma
+    execução extra com tracemalloc
+    """
+    import tracemalloc
+
+    factory, uses_subprocess, _ = BENCHMARKS[name]
+    run = factory(corpus_file, work_dir)
+
+    times = []
+    for _ in range(repeat):
+        _clear_caches()
+        gc.collect()
+        start = time.perf_counter()
+        _silenced(run)
+        times.append(time.perf_counter() - start)
+        if sum(times) >= budget:
+            break
+
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    who = resource.RUSAGE_CHILDREN if uses_subprocess else resource.RUSAGE_SELF
+    peak_rss = resource.getrusage(who).ru_maxrss
+    if sys.platform == 'darwin':
+        peak_rss //= 1024
+
+    result = {
+        'runs': len(times),
+        'seconds_min': round(min(times), 4),
+        'seconds_median': round(statistics.median(times), 4),
+        'peak_rss_kb': peak_rss,
+        'peak_traced_bytes': None,
+        'gc_allocations': None,
+    }
+
+    # tracemalloc deixa a execução bem mais lenta: fica fora das medições de tempo
+    if trace and not uses_subprocess:
+        _clear_caches()
+        gc.collect()
+        allocations = _gc_allocations()
+        tracemalloc.start()
+        _silenced(run)
+        result['peak_traced_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        result['gc_allocations'] = _gc_allocations() - allocations
+
+    return result
+
+
+def measure_isolated(name, corpus_file, work_dir, repeat, trace=False, budget=DEFAULT_BUDGET):
+    """Roda measure() em um processo novo (spawn) para isolar o pico de memória"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+        return executor.submit(measure, name, corpus_file, work_dir, repeat, trace, budget).result()
+
+
+def count_lines(path):
+    with open(path, 'rb') as f:
+        return sum(1 for _ in f)
+
+
+def run_benchmarks(corpora, names, repeat, work_dir, trace=False, budget=DEFAULT_BUDGET):
+    """Executa os benchmarks em todos os corpora; retorna a lista de resultados"""
+    has_reportlab = module_available('reportlab')
+    results = []
+
+    for corpus, corpus_file in corpora.items():
+        lines = count_lines(corpus_file)
+        size = os.path.getsize(corpus_file)
+
+        for name in names:
+            entry = {'benchmark': name, 'corpus': corpus}
+            if BENCHMARKS[name][2] and not has_reportlab:
+                entry['skipped'] = 'reportlab não instalado'
+                print(f"⚠ {name} / {corpus}: {entry['skipped']}", file=sys.stderr)
+                results.append(entry)
+                continue
+
+            try:
+                measured = measure_isolated(name, corpus_file, work_dir, repeat, trace, budget)
+            except Exception as e:
+                entry['error'] = str(e)
+                print(f"✗ {name} / {corpus}: {e}", file=sys.stderr)
+                results.append(entry)
+                continue
+
+            entry.update(measured)
+            seconds = measured['seconds_median']
+            entry['lines_per_second'] = round(lines / seconds) if seconds else None
+            entry['mb_per_second'] = round(size / seconds / 1e6, 3) if seconds else None
+            results.append(entry)
+            print(f"✓ {name} / {corpus}: {seconds:.3f}s, {entry['lines_per_second']} linhas/s, "
+                  f"RSS {measured['peak_rss_kb'] // 1024} MB", file=sys.stderr)
+
+    return results
+
+
+# Baseline
+
+def compare_with_baseline(results, baseline, tolerance):
+    """
+    Compara tempo mediano e pico de RSS com o baseline
+    Regressão: valor atual acima de baseline * (1 + tolerance)
+    """
+    previous = {
+        (entry['benchmark'], entry['corpus']): entry
+        for entry in baseline.get('results', [])
+        if 'seconds_median' in entry
+    }
+
+    comparison = []
+    for entry in results:
+        old = previous.get((entry['benchmark'], entry['corpus']))
+        if old is None or 'seconds_median' not in entry:
+            continue
+        for metric in ('seconds_median', 'peak_rss_kb'):
+            if not old.get(metric):
+                continue
+            ratio = entry[metric] / old[metric]
+            comparison.append({
+                'benchmark': entry['benchmark'],
+                'corpus': entry['corpus'],
+                'metric': metric,
+                'baseline': old[metric],
+                'current': entry[metric],
+                'ratio': round(ratio, 3),
+                'regression': ratio > 1 + tolerance,
+            })
+    return comparison
+
+
+def baseline_mismatches(report, baseline):
+    """Diferenças de ambiente e de corpora que tornam a comparação pouco confiável"""
+    warnings = []
+    for key in ('python', 'platform', 'generator_version'):
+        if baseline.get(key) != report[key]:
+            warnings.append(f"{key} {baseline.get(key)} → {report[key]}")
+    for name, corpus in report['corpora'].items():
+        old = baseline.get('corpora', {}).get(name)
+        if old is not None and old != corpus:
+            warnings.append(f"corpus {name} mudou ({old['lines']} → {corpus['lines']} linhas)")
+    return warnings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do pipeline de documentação do Bota Love App')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help='Tamanhos dos corpora sintéticos em linhas (padrão: 1000,10000; '
+                             'ex.: 1000,10000,100000 para o corpus grande)')
+    parser.add_argument('--no-docs', action='store_true', help='Não inclui os docs/*.md reais')
+    parser.add_argument('--benchmarks', default=','.join(BENCHMARKS),
+                        help=f'Benchmarks a executar (padrão: {",".join(BENCHMARKS)})')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f'Máximo de execuções por medição (padrão: {DEFAULT_REPEAT})')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET,
+                        help='Tempo por medição (s): para de repetir quando o total passa disso '
+                             f'(padrão: {DEFAULT_BUDGET:g}; 0 = sempre uma execução)')
+    parser.add_argument('--trace', action='store_true',
+                        help='Mede também pico de memória Python e alocações com tracemalloc '
+                             '(uma execução extra, várias vezes mais lenta)')
+    parser.add_argument('-o', '--output', help='Arquivo JSON de saída (padrão: saída padrão)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='Baseline para comparação (padrão: scripts/benchmark_baseline.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='Grava o resultado como novo baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Piora aceita antes de acusar regressão (padrão: 0.2 = 20%%)')
+    args = parser.parse_args()
+
+    names = [name for name in args.benchmarks.split(',') if name]
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"benchmark desconhecido: {', '.join(unknown)}")
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    # Um baseline pedido explicitamente que não existe é erro (antes de gastar o tempo da medição)
+    if not args.save_baseline and args.baseline != DEFAULT_BASELINE and not os.path.exists(args.baseline):
+        parser.error(f"baseline não encontrado: {args.baseline}")
+
+    with tempfile.TemporaryDirectory(prefix='docgen-bench-') as work_dir:
+        corpora = build_corpora(work_dir, sizes, include_docs=not args.no_docs)
+        report = {
+            'generator_version': GENERATOR_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'budget': args.budget,
+            'trace': args.trace,
+            'corpora': {
+                name: {'lines': count_lines(path), 'bytes': os.path.getsize(path)}
+                for name, path in corpora.items()
+            },
+            'results': run_benchmarks(corpora, names, args.repeat, work_dir, args.trace, args.budget),
+        }
+
+    regressions = []
+    if not args.save_baseline and not os.path.exists(args.baseline):
+        report['comparison'] = None
+        print(f"⚠ Baseline não encontrado: {args.baseline}", file=sys.stderr)
+        print("⚠ NADA FOI COMPARADO. O baseline depende da máquina: gere o seu com --save-baseline "
+              "(mesmas opções) antes de comparar", file=sys.stderr)
+    elif not args.save_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        for warning in baseline_mismatches(report, baseline):
+            print(f"⚠ Baseline com outras condições: {warning}", file=sys.stderr)
+        report['comparison'] = compare_with_baseline(report['results'], baseline, args.tolerance)
+        if not report['comparison']:
+            print("⚠ Nenhuma medição em comum com o baseline: nada foi comparado", file=sys.stderr)
+        regressions = [item for item in report['comparison'] if item['regression']]
+        for item in regressions:
+            print(f"✗ Regressão em {item['benchmark']} / {item['corpus']} ({item['metric']}): "
+                  f"{item['ratio']:.2f}x o baseline", file=sys.stderr)
+        if report['comparison'] and not regressions:
+            print("✓ Nenhuma regressão em relação ao baseline", file=sys.stderr)
+
+    data = json.dumps(report, indent=2, ensure_ascii=False) + '\n'
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            f.write(data)
+        print(f"✓ Baseline gravado: {args.baseline}", file=sys.stderr)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data)
+    elif not args.save_baseline:
+        sys.stdout.write(data)
+
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
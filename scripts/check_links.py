@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Verificação offline dos links da documentação do Bota Love App
+Monta o grafo de links de todos os docs (da mesma tokenização dos geradores,
+via cache de seções) e confere arquivos e âncoras do repositório de uma vez;
+URLs externas são apenas contadas
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from docgen.batch import find_markdown_files
+from docgen.links import broken_links, build_link_graph, check_links, scan_repository
+from docgen.sections import SectionCache
+
+# Caminhos padrão
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SCRIPT_DIR)
+DOCS_DIR = os.path.join(REPO_DIR, 'docs')
+SECTION_CACHE_DIR = os.path.join(DOCS_DIR, '.docgen-cache', 'sections')
+
+STATUS_LABELS = {
+    'missing-file': 'arquivo não encontrado',
+    'missing-anchor': 'âncora inexistente',
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verifica os links da documentação técnica do Bota Love App')
+    parser.add_argument('--docs-dir', default=DOCS_DIR, help='Diretório dos markdown (padrão: docs/)')
+    parser.add_argument('--json', action='store_true', help='Links quebrados em JSON')
+    parser.add_argument('--graph', action='store_true', help='Mostra também quais docs linkam quais')
+    parser.add_argument('--no-cache', action='store_true', help='Não usa o cache de seções')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    markdown_files = find_markdown_files(args.docs_dir)
+    cache = None if args.no_cache else SectionCache(SECTION_CACHE_DIR)
+    graph = build_link_graph(markdown_files, REPO_DIR, cache)
+    checked = check_links(graph, scan_repository(REPO_DIR))
+    broken = broken_links(checked)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        json.dump([link._asdict() for link in broken], sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        sys.exit(1 if broken else 0)
+
+    source = None
+    for link in broken:
+        if link.source != source:
+            source = link.source
+            print(f"📄 {source}")
+        where = f" (em #{link.section})" if link.section else ''
+        hint = f" → {link.hint}?" if link.hint else ''
+        print(f"  ✗ {link.href}: {STATUS_LABELS[link.status]}{hint}{where}")
+
+    if args.graph:
+        print()
+        for name, targets in graph.edges(checked).items():
+            if targets:
+                print(f"🔗 {name} → {', '.join(sorted(targets))}")
+
+    external = sum(link.status == 'external' for link in checked)
+    print()
+    summary = (f"{len(checked)} link(s) em {len(graph.docs)} doc(s), {external} externo(s) não verificado(s), "
+               f"{elapsed:.0f} ms")
+    if broken:
+        print(f"✗ {len(broken)} link(s) quebrado(s) - {summary}")
+        sys.exit(1)
+    print(f"✓ Nenhum link quebrado - {summary}")
+
+
+if __name__ == '__main__':
+    main()
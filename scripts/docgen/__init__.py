@@ -0,0 +1,37 @@
+"""
+Pipeline de documentação do Bota Love App
+O markdown é lido e tokenizado uma única vez; os back ends (HTML, ReportLab,
+texto, JSON) consomem a mesma árvore de nós
+Os nomes abaixo são carregados no primeiro acesso (import docgen não importa
+nenhum back end): cada gerador paga só pelos módulos que usa
+"""
+
+import importlib
+
+# Nome público -> módulo que o define
+_EXPORTS = {
+    'iter_blocks': 'parser',
+    'load_document': 'parser',
+    'parse_markdown': 'parser',
+    'escape_html': 'render_html',
+    'render_html': 'render_html',
+    'stream_html': 'render_html',
+    'write_chunks': 'render_html',
+    'document_to_dict': 'render_json',
+    'render_text': 'render_text',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
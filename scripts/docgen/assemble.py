@@ -0,0 +1,121 @@
+"""
+Manual completo: todos os docs em um único PDF, montado por partes (--assemble)
+Cada documento (ou grupo de capítulos '# ' de um documento grande) é
+diagramado em um PDF separado, em processos paralelos; capa e índice são
+feitos depois, já com as páginas finais, e as partes são unidas pelo pypdf,
+que preserva marcadores e links de cada uma. O rodapé com a numeração
+contínua é carimbado por cima das páginas das partes. Memória e tempo de cada
+processo crescem com o tamanho da parte, não com o do manual
+"""
+
+import io
+import os
+import time
+from collections import namedtuple
+
+from .profiling import stage
+from .sections import load_sections
+
+# Tamanho máximo de uma parte, em linhas de markdown (um capítulo maior fica inteiro)
+CHUNK_LINES = 1500
+
+# Fatia das seções de um markdown: [start, end) e total de linhas
+Chunk = namedtuple('Chunk', 'markdown_file start end lines')
+
+# Parte diagramada: arquivo, número de páginas e (TocEntry, página na parte) de cada título
+ChunkResult = namedtuple('ChunkResult', 'pdf_file pages headings')
+
+
+def _chapters(sections):
+    # Índices de início de cada capítulo; seções antes do primeiro '# ' formam o seu próprio
+    starts = [index for index, section in enumerate(sections) if section.is_chapter and index]
+    bounds = [0] + starts + [len(sections)]
+    for start, end in zip(bounds, bounds[1:]):
+        lines = sum(section.source.count('\n') + 1 for section in sections[start:end])
+        yield start, end, lines
+
+
+def plan_chunks(markdown_files, max_lines=CHUNK_LINES):
+    """
+    Divide os docs em partes, na ordem do manual: cada documento é uma parte,
+    e os que passam de max_lines são cortados entre capítulos '# '
+    """
+    chunks = []
+    for markdown_file in markdown_files:
+        sections = load_sections(markdown_file)
+        start = end = lines = 0
+        for chapter_start, chapter_end, chapter_lines in _chapters(sections):
+            if lines and lines + chapter_lines > max_lines:
+                chunks.append(Chunk(markdown_file, start, end, lines))
+                start, lines = chapter_start, 0
+            end = chapter_end
+            lines += chapter_lines
+        if lines:
+            chunks.append(Chunk(markdown_file, start, end, lines))
+    return chunks
+
+
+def run_chunks(chunks, worker, *args, jobs=None, in_process=False):
+    """
+    Executa worker(chunk, índice, *args) para cada parte em um pool de processos
+    worker deve ser uma função de módulo (picklable) que retorna um ChunkResult
+    in_process=True roda tudo em sequência no processo atual (ex.: --profile)
+    Retorna os resultados na ordem das partes
+    """
+    jobs = 1 if in_process else jobs or os.cpu_count() or 1
+    jobs = min(jobs, len(chunks)) or 1
+    results = [None] * len(chunks)
+    start = time.perf_counter()
+
+    if jobs == 1:
+        print(f"⚙ Diagramando {len(chunks)} parte(s) em sequência...")
+        for index, chunk in enumerate(chunks):
+            results[index] = worker(chunk, index, *args)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        print(f"⚙ Diagramando {len(chunks)} parte(s) com {jobs} processo(s)...")
+        # As maiores primeiro: a última a terminar não fica sozinha no fim
+        order = sorted(range(len(chunks)), key=lambda index: -chunks[index].lines)
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {index: executor.submit(worker, chunks[index], index, *args) for index in order}
+            for index, future in futures.items():
+                results[index] = future.result()
+
+    pages = sum(result.pages for result in results)
+    print(f"✓ {pages} página(s) diagramada(s) em {time.perf_counter() - start:.2f}s")
+    return results
+
+
+def page_offsets(first_page, results):
+    """Número (final) da primeira página de cada parte, começando em first_page"""
+    offsets = []
+    for result in results:
+        offsets.append(first_page)
+        first_page += result.pages
+    return offsets
+
+
+def merge_pdfs(pdf_files, output, overlay=None, overlay_start=0, metadata=None):
+    """
+    Une os PDFs em output, na ordem (marcadores e links de cada um preservados)
+    overlay: PDF (bytes) com uma página para cada página do resultado a partir
+    de overlay_start, desenhada por cima (ex.: rodapé com a numeração contínua)
+    metadata: informações do documento ({'/Title': ...})
+    """
+    from pypdf import PdfReader, PdfWriter
+
+    with stage('merge'):
+        writer = PdfWriter()
+        for pdf_file in pdf_files:
+            writer.append(pdf_file)
+        if overlay is not None:
+            stamps = PdfReader(io.BytesIO(overlay)).pages
+            for page, stamp in zip(writer.pages[overlay_start:], stamps):
+                page.merge_page(stamp)
+        if metadata:
+            writer.add_metadata(metadata)
+
+    with stage('write'):
+        with open(output, 'wb') as f:
+            writer.write(f)
+    return len(writer.pages)
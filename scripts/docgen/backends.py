@@ -0,0 +1,64 @@
+"""
+Registro de back ends de saída
+Cada back end declara um teste barato de disponibilidade (sem importar nada)
+e só carrega suas dependências quando é de fato usado
+"""
+
+import importlib.util
+import shutil
+
+_REGISTRY = {}
+
+
+class Backend:
+    """Back end registrado: nome, tipo de saída, teste de disponibilidade e renderização"""
+
+    def __init__(self, name, render, probe, output):
+        self.name = name
+        self.render = render
+        self.probe = probe
+        self.output = output
+
+    def available(self):
+        return self.probe()
+
+
+def module_available(name):
+    """True se o módulo pode ser importado (sem importá-lo)"""
+    return importlib.util.find_spec(name) is not None
+
+
+def command_available(name):
+    """True se o executável está no PATH"""
+    return shutil.which(name) is not None
+
+
+def register_backend(name, probe=lambda: True, output='pdf'):
+    """Decorador que registra a função como back end; a ordem de registro é a de preferência"""
+    def decorator(render):
+        _REGISTRY[name] = Backend(name, render, probe, output)
+        return render
+    return decorator
+
+
+def backend_names():
+    """Nomes registrados, em ordem de preferência"""
+    return list(_REGISTRY)
+
+
+def get_backend(name):
+    """Back end pelo nome, sem testar disponibilidade"""
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Back end desconhecido: {name} (disponíveis: {', '.join(_REGISTRY)})")
+
+
+def candidate_backends(name=None):
+    """
+    Back ends a tentar, em ordem
+    Com nome explícito, retorna só ele (sem testar); senão, os disponíveis
+    """
+    if name and name != 'auto':
+        return [get_backend(name)]
+    return [backend for backend in _REGISTRY.values() if backend.available()]
@@ -0,0 +1,77 @@
+"""
+Modo batch: renderiza vários arquivos markdown em paralelo
+Cada documento roda em um processo separado (layout do ReportLab é CPU-bound)
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+
+def find_markdown_files(docs_dir):
+    """Lista os arquivos .md de docs_dir (recursivo), em ordem alfabética"""
+    found = []
+    for root, dirs, files in os.walk(docs_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        found.extend(os.path.join(root, name) for name in sorted(files) if name.endswith('.md'))
+    return found
+
+
+def _timed(worker, markdown_file, args):
+    """Executa o worker e mede o tempo dentro do processo filho"""
+    start = time.perf_counter()
+    try:
+        code = worker(markdown_file, *args)
+    except Exception as e:
+        print(f"✗ {os.path.basename(markdown_file)}: {e}")
+        code = 1
+    return code, time.perf_counter() - start
+
+
+def run_batch(markdown_files, worker, *args, jobs=None, threads=False, in_process=False):
+    """
+    Executa worker(markdown_file, *args) para cada arquivo em um pool de processos
+    worker deve ser uma função de módulo (picklable) que retorna o código de saída
+    threads=True usa um pool de threads (trabalho que espera subprocessos, ex.: pandoc)
+    in_process=True roda tudo em sequência no processo atual (ex.: --profile)
+    Retorna um dict {markdown_file: código de saída}
+    """
+    jobs = 1 if in_process else jobs or os.cpu_count() or 1
+    jobs = min(jobs, len(markdown_files)) or 1
+    results = {}
+    failed = 0
+    start = time.perf_counter()
+
+    def report(markdown_file, code, elapsed):
+        nonlocal failed
+        status = '✓' if code == 0 else '✗'
+        print(f"{status} {os.path.basename(markdown_file)} ({elapsed:.2f}s)")
+        results[markdown_file] = code
+        failed += code != 0
+
+    if in_process:
+        print(f"⚙ Renderizando {len(markdown_files)} arquivo(s) em sequência...")
+        for markdown_file in markdown_files:
+            report(markdown_file, *_timed(worker, markdown_file, args))
+    else:
+        unit = 'thread(s)' if threads else 'processo(s)'
+        print(f"⚙ Renderizando {len(markdown_files)} arquivo(s) com {jobs} {unit}...")
+
+        pool = ThreadPoolExecutor if threads else ProcessPoolExecutor
+        with pool(max_workers=jobs) as executor:
+            futures = {
+                executor.submit(_timed, worker, markdown_file, args): markdown_file
+                for markdown_file in markdown_files
+            }
+            for future in as_completed(futures):
+                try:
+                    code, elapsed = future.result()
+                except Exception as e:
+                    print(f"✗ {os.path.basename(futures[future])}: {e}")
+                    code, elapsed = 1, 0.0
+                report(futures[future], code, elapsed)
+
+    total = time.perf_counter() - start
+    print()
+    print(f"Concluído em {total:.2f}s - {len(markdown_files) - failed} ok, {failed} com erro")
+    return results
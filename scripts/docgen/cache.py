@@ -0,0 +1,111 @@
+"""
+Cache de build incremental baseado em hash de conteúdo
+O manifesto guarda, para cada arquivo gerado, o hash do markdown de origem e
+o contexto de build (versão do gerador, back end, estilos, data)
+"""
+
+import hashlib
+import json
+import os
+
+from .metadata import GENERATOR_VERSION
+
+MANIFEST_VERSION = 1
+
+
+def hash_bytes(data):
+    """Hash SHA-256 em hexadecimal"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    """Hash SHA-256 do conteúdo de um arquivo"""
+    with open(path, 'rb') as f:
+        return hash_bytes(f.read())
+
+
+def build_context(backend, settings, build_date):
+    """
+    Chave de tudo que influencia a saída além do markdown
+    settings: texto ou dict com CSS/estilos do back end
+    """
+    if not isinstance(settings, str):
+        settings = json.dumps(settings, sort_keys=True, default=str)
+    payload = '\0'.join([GENERATOR_VERSION, backend, settings, str(build_date)])
+    return hash_bytes(payload.encode('utf-8'))
+
+
+class BuildCache:
+    """Manifesto de saídas geradas, persistido em JSON"""
+
+    def __init__(self, manifest_file, force=False):
+        self.manifest_file = manifest_file
+        self.force = force
+        self.root = os.path.dirname(os.path.abspath(manifest_file))
+        self.entries = {}
+        self._hashes = {}
+        self._dirty = False
+
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            pass
+
+    def _key(self, output_file):
+        return os.path.relpath(os.path.abspath(output_file), self.root)
+
+    def _source_hash(self, markdown_file):
+        # Chave inclui mtime/tamanho: processos longos (--watch) veem as edições
+        path = os.path.abspath(markdown_file)
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size)
+        if key not in self._hashes:
+            self._hashes[key] = hash_file(path)
+        return self._hashes[key]
+
+    def is_fresh(self, markdown_file, output_file, context):
+        """True se output_file já corresponde ao markdown e ao contexto atuais"""
+        if self.force:
+            return False
+
+        entry = self.entries.get(self._key(output_file))
+        if not entry or entry['context'] != context or not os.path.exists(output_file):
+            return False
+
+        # Caminho rápido: arquivo de origem intocado desde o último build
+        st = os.stat(markdown_file)
+        if entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            return True
+
+        # mtime mudou (checkout, touch): confirma pelo conteúdo
+        if entry['source'] != self._source_hash(markdown_file):
+            return False
+
+        entry['mtime_ns'] = st.st_mtime_ns
+        entry['size'] = st.st_size
+        self._dirty = True
+        return True
+
+    def record(self, markdown_file, output_file, context):
+        """Registra que output_file foi gerado a partir do markdown atual"""
+        st = os.stat(markdown_file)
+        self.entries[self._key(output_file)] = {
+            'source': self._source_hash(markdown_file),
+            'context': context,
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+        }
+        self._dirty = True
+
+    def save(self):
+        """Grava o manifesto em disco (somente se algo mudou)"""
+        if not self._dirty:
+            return
+        tmp_file = self.manifest_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'entries': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.manifest_file)
+        self._dirty = False
@@ -0,0 +1,371 @@
+"""
+Fontes do PDF (ReportLab): TTFs da marca, fallback de símbolos e cache
+As Helvetica/Courier padrão do PDF não têm glifos como ✓ e ─; cada caractere
+que a fonte do trecho não cobre é envolvido em <font> com a primeira fonte de
+fallback que o tenha (emoji sem nenhuma fonte disponível são omitidos, e
+✅/❌ viram ✔/✘). O ReportLab já embute só os glifos usados (subconjuntos);
+as tabelas lidas de cada TTF e os subconjuntos gerados ficam em cache em
+disco, então fontes extras não custam uma nova leitura a cada build. O cache
+remonta TTFont/TTFontFace pelos atributos internos: só é usado nas versões do
+ReportLab listadas em CACHED_FONT_VERSIONS; nas demais, TTFont(nome, arquivo)
+"""
+
+import os
+import pickle
+import re
+from functools import lru_cache
+
+from .cache import hash_bytes
+from .profiling import stage
+
+# Fontes da marca distribuídas com o app
+FONT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'assets', 'fonts'
+)
+
+# Onde procurar as fontes de fallback (além de FONT_DIR)
+FONT_SEARCH_DIRS = (
+    '/usr/share/fonts',
+    '/usr/local/share/fonts',
+    os.path.expanduser('~/.fonts'),
+    os.path.expanduser('~/.local/share/fonts'),
+    '/Library/Fonts',
+    '/System/Library/Fonts',
+    'C:\\Windows\\Fonts',
+)
+
+# Fallback de símbolos/emoji, em ordem de preferência: (nome no PDF, arquivo)
+FALLBACK_FONTS = (
+    ('NotoEmoji', 'NotoEmoji-Regular.ttf'),
+    ('Symbola', 'Symbola.ttf'),
+    ('SegoeUISymbol', 'seguisym.ttf'),
+    ('DejaVuSans', 'DejaVuSans.ttf'),
+)
+
+# Fonte padrão do PDF (sem embutir) tentada por último: ✓ ✔ ✘ ★ ❤ →
+LAST_RESORT_FONT = 'ZapfDingbats'
+
+# Substitutos quando nenhuma fonte tem o caractere original
+GLYPH_SUBSTITUTES = {
+    '✅': '✔',
+    '❌': '✘',
+    '⭐': '★',
+}
+
+# Seletores de variação e ZWJ: só fazem sentido com emoji coloridos
+IGNORED_CHARS = frozenset('\ufe0e\ufe0f\u200d')
+
+# Quebras e tabulação não são glifos: passam sem consultar a fonte
+LAYOUT_CHARS = frozenset('\n\r\t')
+
+TAG_PATTERN = re.compile(r'(<[^>]*>)')
+
+# Versões do ReportLab (major.minor) cujos internos de TTFont/TTFontFace o
+# cache reproduz (conferido com a 5.0.1); em outra versão, sem cache de fontes
+CACHED_FONT_VERSIONS = ('5.0',)
+
+
+@lru_cache(maxsize=None)
+def _system_fonts():
+    """{arquivo: caminho} das fontes TTF nos diretórios do sistema"""
+    found = {}
+    for directory in FONT_SEARCH_DIRS:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.lower().endswith('.ttf'):
+                    found.setdefault(name, os.path.join(root, name))
+    return found
+
+
+def find_font_file(filename):
+    """Caminho de um TTF em assets/fonts ou nas fontes do sistema (ou None)"""
+    path = os.path.join(FONT_DIR, filename)
+    if os.path.isfile(path):
+        return path
+    return _system_fonts().get(filename)
+
+
+class FontCache:
+    """
+    Tabelas já lidas de cada TTF e subconjuntos gerados, em cache_dir
+    Chaves: caminho, mtime e tamanho da fonte e a versão do ReportLab
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(os.path.join(cache_dir, 'subsets'), exist_ok=True)
+
+    def font_key(self, path):
+        from reportlab import Version
+
+        st = os.stat(path)
+        return hash_bytes(f'{Version}\0{os.path.abspath(path)}\0{st.st_mtime_ns}\0{st.st_size}'.encode('utf-8'))
+
+    def load_face(self, path):
+        """TTFontFace da fonte, das tabelas em cache quando possível"""
+        face_class = _face_class()
+        key = self.font_key(path)
+        face_file = os.path.join(self.cache_dir, key + '.pickle') if self.cache_dir else None
+        if face_file:
+            try:
+                with open(face_file, 'rb') as f:
+                    state = pickle.load(f)
+                face = face_class.__new__(face_class)
+                face.__dict__.update(state)
+                face._pdfScale = _pdf_scale(face.unitsPerEm)
+                face.cache, face.key = self, key
+                return face
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError):
+                pass
+
+        face = face_class(path)
+        face.cache, face.key = self, key
+        if face_file:
+            # _pdfScale é uma lambda (não serializável): recriada na leitura
+            state = {name: value for name, value in vars(face).items()
+                     if name not in ('_pdfScale', 'cache', 'key')}
+            self._write(face_file, pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+        return face
+
+    def subset(self, key, subset, make):
+        """Bytes do subconjunto (lista de códigos) da fonte, gerado por make() se preciso"""
+        if not self.cache_dir:
+            return make()
+        subset_key = hash_bytes(f"{key}\0{','.join(map(str, subset))}".encode('utf-8'))
+        subset_file = os.path.join(self.cache_dir, 'subsets', subset_key + '.ttf')
+        try:
+            with open(subset_file, 'rb') as f:
+                return f.read()
+        except OSError:
+            pass
+        data = make()
+        self._write(subset_file, data)
+        return data
+
+    @staticmethod
+    def _write(path, data):
+        tmp_file = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, path)
+
+
+def _pdf_scale(units_per_em):
+    # Mesmo cálculo de TTFontFile.extractInfo
+    if units_per_em == 1000:
+        return lambda x: x
+    factor = 1000 / units_per_em
+    return lambda x: x * factor
+
+
+@lru_cache(maxsize=None)
+def _face_class():
+    # Classe derivada do ReportLab criada só no primeiro uso (import tardio)
+    from reportlab.pdfbase.ttfonts import TTFontFace
+
+    class CachedFontFace(TTFontFace):
+        """TTFontFace cujos subconjuntos passam pelo FontCache"""
+
+        cache = None
+        key = None
+
+        def makeSubset(self, subset):
+            make = lambda: TTFontFace.makeSubset(self, subset)
+            if self.cache is None:
+                return make()
+            return self.cache.subset(self.key, subset, make)
+
+    return CachedFontFace
+
+
+@lru_cache(maxsize=None)
+def font_cache_supported():
+    """True se a versão instalada do ReportLab é uma das de CACHED_FONT_VERSIONS"""
+    from reportlab import Version
+
+    return '.'.join(Version.split('.')[:2]) in CACHED_FONT_VERSIONS
+
+
+def create_ttfont(name, path, cache):
+    """
+    TTFont com as tabelas do cache (mesmos atributos que TTFont.__init__ define)
+    Em versões do ReportLab não conferidas, ou se os internos não baterem,
+    usa o TTFont(name, path) público, sem cache
+    """
+    from reportlab.pdfbase import ttfonts
+
+    if font_cache_supported():
+        try:
+            return _cached_ttfont(name, path, cache)
+        except (AttributeError, TypeError):
+            pass
+    return ttfonts.TTFont(name, path)
+
+
+def _cached_ttfont(name, path, cache):
+    from fnmatch import fnmatch
+    from weakref import WeakKeyDictionary
+
+    from reportlab import rl_config
+    from reportlab.pdfbase import ttfonts
+
+    font = ttfonts.TTFont.__new__(ttfonts.TTFont)
+    font.fontName = name
+    font.face = cache.load_face(path)
+    font.encoding = ttfonts.TTEncoding()
+    font.state = WeakKeyDictionary()
+    font._asciiReadable = rl_config.ttfAsciiReadable
+    font.shapable = not any(fnmatch(name, glob) for glob in getattr(ttfonts, 'unShapedFontGlob', ()))
+    return font
+
+
+def register_ttf(name, path, cache):
+    """Registra o TTF como fonte e família (negrito/itálico usam o mesmo arquivo)"""
+    from reportlab.pdfbase import pdfmetrics
+
+    if name not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(create_ttfont(name, path, cache))
+        pdfmetrics.registerFontFamily(name, normal=name, bold=name, italic=name, boldItalic=name)
+
+
+@lru_cache(maxsize=None)
+def font_covers(font_name, char):
+    """True se a fonte registrada tem glifo para o caractere"""
+    from reportlab.pdfbase import pdfmetrics
+
+    font = pdfmetrics.getFont(font_name)
+    face = getattr(font, 'face', None)
+    char_to_glyph = getattr(face, 'charToGlyph', None)
+    if char_to_glyph is not None:
+        return ord(char) in char_to_glyph
+    # Fontes padrão do PDF: o que a codificação delas representa
+    encoding = font.encName[:-len('Encoding')].lower()
+    try:
+        char.encode(encoding)
+    except (UnicodeError, LookupError):
+        return False
+    return True
+
+
+class FontSet:
+    """
+    Fontes registradas para um tema
+    names: {papel: fonte} (title, heading, subheading, table_header)
+    fallbacks: fontes de fallback registradas, em ordem
+    """
+
+    def __init__(self, names, fallbacks):
+        self.names = names
+        self.fallbacks = list(fallbacks) + [LAST_RESORT_FONT]
+
+    def settings(self):
+        """Fontes resolvidas na máquina, para os contextos de cache (PDF, flowables)"""
+        return {'fonts': dict(self.names), 'fallback_fonts': list(self.fallbacks)}
+
+    def fallback_for(self, char):
+        """(fonte, caractere) para um glifo que a fonte do trecho não tem, ou None"""
+        for candidate in (char, GLYPH_SUBSTITUTES.get(char)):
+            if candidate is None:
+                continue
+            for font_name in self.fallbacks:
+                if font_covers(font_name, candidate):
+                    return font_name, candidate
+        return None
+
+    def text(self, text, font_name):
+        """Texto já escapado com os caracteres não cobertos trocados por <font>"""
+        if text.isascii():
+            return text
+        parts = []
+        run_font = None
+        for char in text:
+            if char in IGNORED_CHARS:
+                continue
+            if char in LAYOUT_CHARS or font_covers(font_name, char):
+                target = None
+            else:
+                found = self.fallback_for(char)
+                if found is None:
+                    continue
+                target, char = found
+            if target != run_font:
+                if run_font is not None:
+                    parts.append('</font>')
+                if target is not None:
+                    parts.append(f'<font name="{target}">')
+                run_font = target
+            parts.append(char)
+        if run_font is not None:
+            parts.append('</font>')
+        return ''.join(parts)
+
+    def markup(self, markup, font_name):
+        """Marcação de parágrafo com fallback aplicado ao texto fora das tags"""
+        if markup.isascii():
+            return markup
+        parts = []
+        stack = [font_name]
+        for index, segment in enumerate(TAG_PATTERN.split(markup)):
+            if index % 2:
+                if segment.startswith('<font '):
+                    stack.append(_attribute(segment, 'name') or stack[-1])
+                elif segment == '</font>' and len(stack) > 1:
+                    stack.pop()
+                parts.append(segment)
+            elif segment:
+                parts.append(self.text(segment, stack[-1]))
+        return ''.join(parts)
+
+
+def _attribute(tag, name):
+    marker = f'{name}="'
+    start = tag.find(marker)
+    if start < 0:
+        return None
+    start += len(marker)
+    return tag[start:tag.find('"', start)]
+
+
+def load_fonts(theme, cache_dir=None):
+    """
+    Registra os TTFs do tema e os fallbacks encontrados na máquina
+    Fontes da marca ausentes ou inválidas caem para Helvetica-Bold (com aviso)
+    """
+    with stage('fonts'):
+        return _load_fonts(theme, cache_dir)
+
+
+def _load_fonts(theme, cache_dir):
+    from reportlab.pdfbase.ttfonts import TTFError
+
+    cache = FontCache(cache_dir)
+    failed = {}
+
+    def register(font_name, filename):
+        if font_name in failed:
+            return False
+        path = find_font_file(filename)
+        try:
+            if path is None:
+                raise OSError('arquivo não encontrado')
+            register_ttf(font_name, path, cache)
+            return True
+        except (OSError, TTFError) as e:
+            failed[font_name] = e
+            return False
+
+    names = {}
+    for role, default in (('title', 'Helvetica-Bold'), ('heading', 'Helvetica-Bold'),
+                          ('subheading', 'Helvetica-Bold'), ('table_header', 'Helvetica-Bold')):
+        font_name = theme.get(f'{role}_font')
+        if font_name and register(font_name, theme['font_files'][font_name]):
+            names[role] = font_name
+        else:
+            names[role] = default
+
+    for font_name, error in failed.items():
+        print(f"⚠ Fonte {font_name} indisponível ({error}); usando Helvetica-Bold")
+
+    fallbacks = [font_name for font_name, filename in FALLBACK_FONTS if register(font_name, filename)]
+    return FontSet(names, fallbacks)
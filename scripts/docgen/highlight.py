@@ -0,0 +1,118 @@
+"""
+Realce de sintaxe dos blocos de código (```typescript, ```json, ...)
+O Pygments só é importado quando aparece um bloco com linguagem conhecida; os
+tokens de cada bloco são memorizados por (linguagem, hash do código), já que
+os mesmos trechos se repetem entre os docs, e servem aos dois back ends (HTML
+com classes CSS, ReportLab com <font color>). Sem Pygments, o código sai sem
+realce
+"""
+
+from functools import lru_cache
+
+from .cache import hash_bytes
+from .profiling import stage
+
+# Tags de cerca sem lexer próprio no Pygments
+LANGUAGE_ALIASES = {
+    'env': 'bash',
+    'dotenv': 'bash',
+    'sh': 'bash',
+    'shell': 'bash',
+    'rules': 'javascript',
+    'firestore': 'javascript',
+    'plaintext': 'text',
+    'txt': 'text',
+}
+
+# Categorias realçadas: (classe CSS, cor, itálico); o restante sai na cor do texto
+TOKEN_STYLES = {
+    'Comment': ('c', '#8A7A6A', True),
+    'Keyword': ('k', '#8E3B12', False),
+    'Keyword.Type': ('kt', '#6A1B9A', False),
+    'Name.Builtin': ('nb', '#6A1B9A', False),
+    'Name.Class': ('nc', '#6A1B9A', False),
+    'Name.Function': ('nf', '#1565C0', False),
+    'Name.Decorator': ('nd', '#1565C0', False),
+    'Name.Tag': ('nt', '#8E3B12', False),
+    'Name.Attribute': ('na', '#8E3B12', False),
+    'Name.Variable': ('nv', '#1565C0', False),
+    'Literal.String': ('s', '#2E7D32', False),
+    'Literal.Number': ('m', '#B15C00', False),
+    'Operator.Word': ('k', '#8E3B12', False),
+}
+
+# Blocos memorizados por processo (os docs inteiros têm poucas centenas)
+HIGHLIGHT_CACHE_SIZE = 2048
+
+_highlighted = {}
+
+
+@lru_cache(maxsize=None)
+def get_lexer(language):
+    """Lexer do Pygments para a tag da cerca, ou None (sem Pygments ou tag desconhecida)"""
+    language = LANGUAGE_ALIASES.get(language.lower(), language.lower())
+    if language == 'text':
+        return None
+    try:
+        from pygments.lexers import get_lexer_by_name
+        from pygments.util import ClassNotFound
+    except ImportError:
+        return None
+    try:
+        # Sem remover quebras de linha: as linhas do bloco precisam ser preservadas
+        return get_lexer_by_name(language, stripnl=False, ensurenl=False)
+    except ClassNotFound:
+        return None
+
+
+@lru_cache(maxsize=None)
+def token_style(token_type):
+    """(classe CSS, cor, itálico) do tipo de token, herdado da categoria mais próxima"""
+    while token_type:
+        found = TOKEN_STYLES.get(str(token_type)[len('Token.'):])
+        if found is not None:
+            return found
+        token_type = token_type.parent
+    return None
+
+
+def highlight(language, lines):
+    """
+    Linhas do bloco como listas de trechos (estilo, texto); estilo é uma entrada
+    de TOKEN_STYLES ou None. Retorna None quando não há realce para a linguagem
+    O resultado é compartilhado entre chamadas com o mesmo código: não modificar
+    """
+    if not language:
+        return None
+    code = '\n'.join(lines)
+    key = (language, hash_bytes(code.encode('utf-8')))
+    if key in _highlighted:
+        return _highlighted[key]
+
+    lexer = get_lexer(language)
+    if lexer is None:
+        return None
+
+    with stage('highlight'):
+        result = [[]]
+        for token_type, value in lexer.get_tokens(code):
+            style = token_style(token_type)
+            for index, part in enumerate(value.split('\n')):
+                if index:
+                    result.append([])
+                if part:
+                    result[-1].append((style, part))
+        result = tuple(tuple(line) for line in result)
+
+    if len(_highlighted) >= HIGHLIGHT_CACHE_SIZE:
+        _highlighted.clear()
+    _highlighted[key] = result
+    return result
+
+
+def highlight_css(selector='pre code', indent=''):
+    """Regras CSS das classes geradas por render_html (uma por categoria)"""
+    rules = {}
+    for css_class, color, italic in TOKEN_STYLES.values():
+        rules[css_class] = f'color: {color};' + (' font-style: italic;' if italic else '')
+    return ''.join(f'{indent}{selector} .{css_class} {{ {rule} }}\n' for css_class, rule in rules.items())
@@ -0,0 +1,22 @@
+"""
+Back end HTML/CSS → PDF em processo (WeasyPrint)
+Respeita o CSS de impressão da página gerada (@page, page-break-*), sem
+abrir navegador nem depender de LaTeX; o WeasyPrint só é importado no uso
+"""
+
+
+def html_to_pdf(html, pdf_file, base_url=None):
+    """
+    Converte uma página HTML completa (string) em PDF
+    base_url: diretório usado para resolver caminhos relativos (imagens, links)
+    """
+    from weasyprint import HTML
+
+    HTML(string=html, base_url=base_url).write_pdf(pdf_file)
+
+
+def html_file_to_pdf(html_file, pdf_file):
+    """Converte um arquivo HTML já gerado em PDF"""
+    from weasyprint import HTML
+
+    HTML(filename=html_file).write_pdf(pdf_file)
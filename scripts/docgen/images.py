@@ -0,0 +1,253 @@
+"""
+Imagens do markdown (![alt](src)) redimensionadas e cacheadas por conteúdo
+Cada imagem de origem é reduzida para a largura útil da página na densidade
+do back end (PDF: 150 dpi; HTML: 2x) e recodificada: JPEG para fotos, PNG
+para imagens com transparência/paleta no HTML; no PDF tudo vira JPEG sobre
+fundo branco (o ReportLab grava JPEG sem recompressão, PNG fica 5-10x
+maior). JPEGs que já cabem na página são copiados sem recodificar. As
+rendições ficam em um diretório
+endereçado por conteúdo (hash da origem + largura em pixels): builds
+repetidos só consultam o stat() da origem, sem abrir o Pillow
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+import sys
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from .cache import hash_file
+from .inline import DESTINATION
+from .profiling import stage
+
+# Versão das rendições (incrementar se o redimensionamento/codificação mudar)
+RENDITION_VERSION = 1
+
+# Densidades: unidade de exibição de tela (CSS px) e alvo de cada back end
+SCREEN_DPI = 96
+PDF_DPI = 150
+HTML_DPI = 2 * SCREEN_DPI
+JPEG_QUALITY = 80
+
+# JPEG que precisaria de uma redução menor que esta é copiado sem recodificar
+# (recodificar quase no mesmo tamanho gera um arquivo maior que o original)
+PASSTHROUGH_SCALE = 0.9
+
+# Referências de imagem no markdown (para a chave do cache de seções), com o
+# mesmo destino que o tokenizador inline aceita (ex.: app/(tabs)/a.png)
+IMAGE_REF_PATTERN = re.compile(rf'!\[[^\]]*\]\(({DESTINATION})')
+
+# Modos do Pillow codificados como PNG (transparência, paleta, tons de cinza de 1 bit)
+LOSSLESS_MODES = ('RGBA', 'LA', 'PA', 'P', '1')
+
+# Orientações EXIF que trocam largura e altura
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+SourceInfo = namedtuple('SourceInfo', 'hash width height lossless passthrough')
+Rendition = namedtuple('Rendition', 'path url width height')
+
+
+class ImageCache:
+    """
+    Rendições em cache_dir/<hh>/<hash>-<largura>.<ext>
+    Hash e dimensões de cada origem ficam em sources/<hh>/<chave do caminho>.json,
+    validados por (mtime, tamanho), então origens intocadas não são relidas.
+    Uma entrada por origem: workers paralelos (--all, --assemble) nunca
+    reescrevem as entradas uns dos outros
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.sources_dir = os.path.join(cache_dir, 'sources')
+        self.sources = {}
+        self.processed = 0
+
+    def _entry_path(self, path):
+        key = hashlib.sha1(path.encode('utf-8', 'surrogateescape')).hexdigest()
+        return os.path.join(self.sources_dir, key[:2], key + '.json')
+
+    def _load_entry(self, path):
+        try:
+            with open(self._entry_path(path), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('version') != RENDITION_VERSION or data.get('path') != path:
+            return None
+        return data.get('entry')
+
+    def _save_entry(self, path, entry):
+        entry_file = self._entry_path(path)
+        os.makedirs(os.path.dirname(entry_file), exist_ok=True)
+        tmp_file = f'{entry_file}.{os.getpid()}.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': RENDITION_VERSION, 'path': path, 'entry': entry}, f)
+        os.replace(tmp_file, entry_file)
+
+    def source_info(self, path):
+        """Hash e dimensões da imagem de origem (Pillow só quando ela muda)"""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        entry = self.sources.get(path)
+        if entry is None:
+            entry = self._load_entry(path)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            self.sources[path] = entry
+            return SourceInfo(*entry[2:])
+
+        from PIL import Image
+
+        # Só o cabeçalho é lido para obter tamanho, modo e orientação
+        with Image.open(path) as image:
+            width, height = image.size
+            orientation = image.getexif().get(0x0112, 1)
+            if orientation in ROTATED_ORIENTATIONS:
+                width, height = height, width
+            lossless = image.mode in LOSSLESS_MODES or 'transparency' in image.info
+            # JPEG sem rotação pendente pode ser usado como está
+            passthrough = image.format == 'JPEG' and image.mode in ('RGB', 'L') and orientation == 1
+        info = SourceInfo(hash_file(path), width, height, lossless, passthrough)
+
+        entry = [st.st_mtime_ns, st.st_size, *info]
+        self.sources[path] = entry
+        self._save_entry(path, entry)
+        return info
+
+    def rendition(self, path, info, pixels, opaque=False):
+        """
+        Caminho da rendição com a largura pedida, gerada se ainda não existir
+        opaque: transparência aplicada sobre fundo branco e saída sempre em JPEG
+        """
+        lossless = info.lossless and not opaque
+        ext = 'png' if lossless else 'jpg'
+        target = os.path.join(self.cache_dir, info.hash[:2], f'{info.hash}-{pixels}.{ext}')
+        if os.path.exists(target):
+            return target
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_file = f'{target}.{os.getpid()}.tmp'
+        if info.passthrough and pixels >= info.width * PASSTHROUGH_SCALE:
+            shutil.copyfile(path, tmp_file)
+        else:
+            self._encode(path, tmp_file, info, pixels, lossless)
+        os.replace(tmp_file, target)
+        self.processed += 1
+        return target
+
+    @staticmethod
+    def _encode(path, target, info, pixels, lossless):
+        from PIL import Image, ImageOps
+
+        with Image.open(path) as image:
+            image = ImageOps.exif_transpose(image)
+            if lossless:
+                image = image.convert('RGBA')
+            elif info.lossless:
+                rgba = image.convert('RGBA')
+                image = Image.new('RGB', rgba.size, 'white')
+                image.paste(rgba, mask=rgba.getchannel('A'))
+            else:
+                image = image.convert('RGB')
+
+            if pixels < image.width:
+                height = max(1, round(image.height * pixels / image.width))
+                image = image.resize((pixels, height), Image.LANCZOS)
+
+            if lossless:
+                image.save(target, 'PNG', optimize=True)
+            else:
+                image.save(target, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+
+
+@lru_cache(maxsize=None)
+def get_image_cache(cache_dir):
+    """ImageCache compartilhado pelo processo (batch, watch)"""
+    return ImageCache(cache_dir)
+
+
+class ImageResolver:
+    """
+    Resolve o src das imagens de um documento para rendições do back end
+    max_width/max_height: área útil na unidade do back end (unit_dpi: 72 = pontos
+    do PDF, 96 = CSS px); dpi: densidade das rendições; opaque: só JPEG (PDF)
+    export_dir: copia as rendições para este diretório (ex.: images/ ao lado do
+    HTML) e usa 'images/<arquivo>' como url; sem ele, a url é file://
+    """
+
+    def __init__(self, cache, base_dir, max_width, max_height=None, dpi=PDF_DPI, unit_dpi=72,
+                 opaque=False, export_dir=None):
+        self.cache = cache
+        self.base_dir = base_dir
+        self.max_width = max_width
+        self.max_height = max_height
+        self.dpi = dpi
+        self.unit_dpi = unit_dpi
+        self.opaque = opaque
+        self.export_dir = export_dir
+        self._resolved = {}
+
+    def source_path(self, src):
+        """Caminho local do src ou None (URLs remotas, data:, âncoras)"""
+        parts = urlsplit(src)
+        if parts.scheme not in ('', 'file') or not parts.path:
+            return None
+        path = unquote(parts.path)
+        if parts.scheme == 'file' or os.path.isabs(path):
+            return path
+        return os.path.normpath(os.path.join(self.base_dir, path))
+
+    def resolve(self, src):
+        """Rendição da imagem (memorizada por src) ou None se não houver arquivo local"""
+        if src not in self._resolved:
+            try:
+                with stage('images'):
+                    self._resolved[src] = self._resolve(src)
+            except (OSError, ImportError, ValueError) as e:
+                # stderr: o HTML pode estar sendo escrito na saída padrão
+                print(f"⚠ Imagem ignorada: {src} ({e})", file=sys.stderr)
+                self._resolved[src] = None
+        return self._resolved[src]
+
+    def _resolve(self, src):
+        path = self.source_path(src)
+        if path is None or not os.path.isfile(path):
+            return None
+        info = self.cache.source_info(path)
+
+        # Tamanho natural (pixels a 96 dpi), reduzido para caber na área útil
+        scale = self.unit_dpi / SCREEN_DPI
+        width, height = info.width * scale, info.height * scale
+        fit = min(1.0, self.max_width / width)
+        if self.max_height:
+            fit = min(fit, self.max_height / height)
+        width, height = width * fit, height * fit
+
+        pixels = min(info.width, max(1, round(width / self.unit_dpi * self.dpi)))
+        rendition = self.cache.rendition(path, info, pixels, self.opaque)
+        return Rendition(rendition, self._url(rendition), width, height)
+
+    def _url(self, rendition):
+        if self.export_dir is None:
+            return Path(rendition).resolve().as_uri()
+
+        name = os.path.basename(rendition)
+        target = os.path.join(self.export_dir, name)
+        if not os.path.exists(target):
+            os.makedirs(self.export_dir, exist_ok=True)
+            shutil.copyfile(rendition, target)
+        return posixpath.join(os.path.basename(os.path.normpath(self.export_dir)), name)
+
+    def fingerprint(self, text):
+        """Rendições referenciadas no markdown (entra na chave do cache de seções)"""
+        parts = []
+        for src in IMAGE_REF_PATTERN.findall(text):
+            rendition = self.resolve(src)
+            if rendition is not None:
+                parts.append(f'{src}={rendition.url}@{rendition.width:.2f}x{rendition.height:.2f}')
+        return '\n'.join(parts)
@@ -0,0 +1,101 @@
+"""
+Tokenizador de markdown inline: negrito, itálico, código, links, imagens e escapes
+O padrão é compilado uma vez no carregamento do módulo e os resultados são
+memorizados por linha (os docs repetem muitas linhas idênticas, ex.: checklists)
+"""
+
+import re
+from functools import lru_cache
+
+from .nodes import Code, Emphasis, Image, Link, Strong, Text
+from .profiling import stage
+
+# Caracteres que podem iniciar alguma marcação; linhas sem nenhum deles são texto puro
+MARKUP_CHARS = frozenset('`*[\\')
+
+# Destino de link/imagem: sem espaços, com um nível de parênteses balanceados
+# (como no GFM: app/(tabs)/index.tsx), e título opcional entre aspas
+DESTINATION = r'(?:[^()\s]|\([^()\s]*\))+'
+
+# Um único padrão cobre todas as marcações inline; a ordem das alternativas
+# garante que `***` seja reconhecido antes de `**`, e `**` antes de `*`
+# (o itálico pode conter negrito: *a **b** c*)
+INLINE_PATTERN = re.compile(
+    r'\\(?P<escaped>[\\`*_{}\[\]()#+\-.!|>~])'
+    r'|(?P<ticks>`+)(?P<code>.+?)(?P=ticks)'
+    r'|\*\*\*(?=\S)(?P<strong_em>.+?)(?<=\S)\*\*\*'
+    r'|\*\*(?=\S)(?P<strong>.+?)(?<=\S)\*\*'
+    r'|\*(?=[^\s*])(?P<em>(?:[^*]|\*\*[^*]+?\*\*)+?)(?<=\S)\*'
+    rf'|!\[(?P<alt>[^\]]*)\]\((?P<src>{DESTINATION})(?:\s+"(?P<title>[^"]*)")?\)'
+    rf'|\[(?P<label>[^\]]+)\]\((?P<href>{DESTINATION})(?:\s+"(?P<link_title>[^"]*)")?\)'
+)
+
+INLINE_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=INLINE_CACHE_SIZE)
+def parse_inline(text):
+    """
+    Converte texto markdown inline em tupla de nós
+    O resultado é compartilhado entre chamadas com o mesmo texto: não modificar
+    """
+    with stage('inline'):
+        return _tokenize_inline(text)
+
+
+def _tokenize_inline(text):
+    if MARKUP_CHARS.isdisjoint(text):
+        return (Text(text),) if text else ()
+
+    nodes = []
+    pending = []
+    pos = 0
+
+    for match in INLINE_PATTERN.finditer(text):
+        if match.start() > pos:
+            pending.append(text[pos:match.start()])
+        pos = match.end()
+
+        kind = match.lastgroup
+        if kind == 'escaped':
+            pending.append(match.group('escaped'))
+            continue
+
+        # Texto acumulado (incluindo escapes) vira um único nó
+        if pending:
+            nodes.append(Text(''.join(pending)))
+            pending = []
+
+        if kind == 'code':
+            nodes.append(Code(match.group('code').strip()))
+        elif kind == 'strong_em':
+            nodes.append(Strong((Emphasis(parse_inline(match.group('strong_em'))),)))
+        elif kind == 'strong':
+            nodes.append(Strong(parse_inline(match.group('strong'))))
+        elif kind == 'em':
+            nodes.append(Emphasis(parse_inline(match.group('em'))))
+        elif kind in ('src', 'title'):
+            nodes.append(Image(match.group('src'), match.group('alt'), match.group('title') or ''))
+        else:
+            nodes.append(Link(match.group('href'), parse_inline(match.group('label')),
+                              match.group('link_title') or ''))
+
+    if pos < len(text):
+        pending.append(text[pos:])
+    if pending:
+        nodes.append(Text(''.join(pending)))
+
+    return tuple(nodes)
+
+
+def plain_text(nodes):
+    """Extrai o texto puro de uma lista de nós inline"""
+    parts = []
+    for node in nodes:
+        if isinstance(node, (Text, Code)):
+            parts.append(node.text)
+        elif isinstance(node, Image):
+            parts.append(node.alt)
+        else:
+            parts.append(plain_text(node.children))
+    return ''.join(parts)
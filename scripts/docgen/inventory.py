@@ -0,0 +1,479 @@
+"""
+Inventário da API extraído do código do app (Cloud Functions, serviços do
+Firebase, índices e regras do Firestore), gerado em markdown como os demais
+docs. A leitura é feita por expressões regulares sobre o TypeScript, sem
+compilador; o resultado de cada arquivo fica em cache pelo mtime/tamanho e,
+quando eles mudam, pelo hash do conteúdo: depois de editar um arquivo, só
+ele é relido
+"""
+
+import json
+import os
+import re
+
+from .cache import hash_bytes
+from .profiling import count, stage
+
+# Versão das regras de extração (mudar invalida o cache)
+SCANNER_VERSION = 1
+
+FUNCTIONS_DIR = 'functions/src'
+FUNCTIONS_INDEX = 'functions/src/index.ts'
+SERVICES_DIR = 'firebase'
+INDEXES_FILE = 'firestore.indexes.json'
+RULES_FILE = 'firestore.rules'
+
+SKIPPED_DIRS = frozenset({'node_modules', 'lib', '__tests__'})
+
+# Tipo de cada gatilho do firebase-functions (v2)
+TRIGGER_LABELS = {
+    'onCall': 'Callable (HTTPS)',
+    'onRequest': 'HTTP',
+    'onSchedule': 'Agendada',
+    'onDocumentCreated': 'Firestore (criação)',
+    'onDocumentUpdated': 'Firestore (atualização)',
+    'onDocumentDeleted': 'Firestore (exclusão)',
+    'onDocumentWritten': 'Firestore (escrita)',
+    'onObjectFinalized': 'Storage (upload)',
+    'onObjectDeleted': 'Storage (exclusão)',
+    'beforeUserCreated': 'Auth (antes da criação)',
+    'beforeUserSignedIn': 'Auth (antes do login)',
+}
+
+RULES_ROOT = '/databases/{database}/documents'
+
+_EXPORT_FROM = re.compile(r'export\s*\{([^}]*)\}\s*from\s*[\'"]([^\'"]+)[\'"]')
+_TRIGGER = re.compile(r'^export const (\w+)\s*=\s*(\w+)\s*(?:<[^(]*>)?\(', re.M)
+_FUNCTION = re.compile(
+    r'^export (?:async )?function (\w+)'
+    r'|^export const (\w+)\s*=\s*(?:async\s*)?(?:\([^)]*\)|\w+)\s*(?::[^=;]+)?=>',
+    re.M,
+)
+_TYPE = re.compile(r'^export (?:interface|type) (\w+)', re.M)
+_STRING_CONST = re.compile(r'^const (\w+)\s*=\s*[\'"]([^\'"]*)[\'"]', re.M)
+_OPTION = re.compile(r'\b(region|memory|timeoutSeconds|document|schedule)\s*:\s*([\'"][^\'"]*[\'"]|[\w.]+)')
+_RULES_TOKEN = re.compile(
+    r'match\s+(\S+)\s*\{'
+    r'|allow\s+([\w\s,]+?)\s*(?::\s*if\s+(.*?))?;'
+    r'|function\s+(\w+)\s*\('
+    r'|(\{)|(\})',
+    re.S,
+)
+
+
+def _doc_comment(text, position):
+    # Bloco /** ... */ imediatamente antes de position, sem os '*' e sem as tags @
+    before = text[:position].rstrip()
+    if not before.endswith('*/'):
+        return []
+    start = before.rfind('/**')
+    if start < 0:
+        return []
+    lines = []
+    for line in before[start + 3:-2].splitlines():
+        line = line.strip().lstrip('*').strip()
+        if line.startswith('@'):
+            break
+        lines.append(line)
+    return lines
+
+
+def _summary(lines):
+    # Primeiro parágrafo do comentário em uma linha; a lista que o segue vira 'a, b, c'
+    paragraph = []
+    items = []
+    for line in lines:
+        if not line:
+            if paragraph or items:
+                break
+        elif line.startswith(('- ', '• ')):
+            items.append(line[2:].strip())
+        elif items:
+            break
+        else:
+            paragraph.append(line)
+    text = ' '.join(paragraph).rstrip(':')
+    if items:
+        text = f"{text}: {', '.join(items)}" if text else ', '.join(items)
+    return text
+
+
+def _file_summary(text):
+    # Comentário de abertura: 'BOTA LOVE APP - Título' seguido da descrição
+    match = re.match(r'\s*/\*\*', text)
+    if not match:
+        return ''
+    end = text.find('*/')
+    lines = _doc_comment(text[:end + 2], end + 2)
+    while lines and not lines[0]:
+        lines = lines[1:]
+    if lines and ' - ' in lines[0]:
+        # Sem descrição, fica o título (sem o prefixo do app)
+        return _summary(lines[1:]) or lines[0].split(' - ', 1)[1]
+    return _summary(lines)
+
+
+def _banner(text, position):
+    # Comentário de linha logo antes de position, sem as réguas (// ====)
+    lines = []
+    for line in reversed(text[:position].rstrip().splitlines()):
+        line = line.strip()
+        if not line.startswith('//'):
+            break
+        line = line[2:].strip()
+        if line.strip('=-─ '):
+            lines.append(line)
+    return ' '.join(reversed(lines))
+
+
+def _call_options(text, position):
+    # Objeto de opções literal no primeiro argumento da chamada em position
+    rest = text[position:].lstrip()
+    if rest.startswith('{'):
+        depth = 0
+        for index, char in enumerate(rest):
+            depth += char == '{'
+            depth -= char == '}'
+            if not depth:
+                return rest[:index + 1]
+    match = re.match(r'([\'"][^\'"]*[\'"])', rest)
+    return match.group(1) if match else ''
+
+
+def scan_functions_index(text):
+    """Exportações do index das Cloud Functions: [[nome exportado, módulo]]"""
+    exported = []
+    for names, module in _EXPORT_FROM.findall(text):
+        for name in names.split(','):
+            name = name.strip()
+            if name:
+                exported.append([name.split(' as ')[-1].strip(), module])
+    return exported
+
+
+def scan_functions_module(text):
+    """
+    Gatilhos exportados de um arquivo das Cloud Functions
+    {nome: {trigger, region, memory, timeout, target, summary, line}}
+    """
+    constants = dict(_STRING_CONST.findall(text))
+    file_summary = _file_summary(text)
+    matches = list(_TRIGGER.finditer(text))
+    found = {}
+    for match in matches:
+        name, trigger = match.groups()
+        if not trigger.startswith(('on', 'before')):
+            continue
+        options = {}
+        literal = _call_options(text, match.end())
+        if literal.startswith(('"', "'")):
+            # onSchedule('every 5 minutes', ...), onDocumentCreated('path', ...)
+            options['document' if trigger.startswith('onDocument') else 'schedule'] = literal
+        else:
+            options.update(_OPTION.findall(literal))
+        for key, value in options.items():
+            value = value.strip('\'"')
+            options[key] = constants.get(value, value)
+        summary = _summary(_doc_comment(text, match.start()))
+        if not summary and len(matches) == 1:
+            summary = file_summary
+        if not summary:
+            summary = _banner(text, match.start())
+        found[name] = {
+            'trigger': trigger,
+            'region': options.get('region'),
+            'memory': options.get('memory'),
+            'timeout': options.get('timeoutSeconds'),
+            'target': options.get('document') or options.get('schedule'),
+            'summary': summary,
+            'line': text.count('\n', 0, match.start()) + 1,
+        }
+    return found
+
+
+def scan_service(text):
+    """
+    Funções e tipos exportados de um serviço do app
+    {summary, functions: [[nome, resumo, linha]], types: [nomes]}
+    """
+    functions = []
+    for match in _FUNCTION.finditer(text):
+        name = match.group(1) or match.group(2)
+        summary = _summary(_doc_comment(text, match.start()))
+        functions.append([name, summary, text.count('\n', 0, match.start()) + 1])
+    return {
+        'summary': _file_summary(text),
+        'functions': functions,
+        'types': _TYPE.findall(text),
+    }
+
+
+def scan_indexes(text):
+    """Índices compostos do firestore.indexes.json: [[coleção, escopo, [campo, ordem]...]]"""
+    data = json.loads(text)
+    found = []
+    for index in data.get('indexes', []):
+        fields = [
+            [field['fieldPath'], field.get('order') or field.get('arrayConfig') or field.get('vectorConfig', '')]
+            for field in index.get('fields', [])
+        ]
+        found.append([index.get('collectionGroup', ''), index.get('queryScope', 'COLLECTION'), fields])
+    return found
+
+
+def scan_rules(text):
+    """
+    Regras do firestore.rules: {functions: [nomes], rules: [[caminho, operações, condição]]}
+    Caminhos relativos à raiz dos documentos; condição com espaços normalizados
+    """
+    text = re.sub(r'//[^\n]*', '', text)
+    stack = []
+    functions = []
+    rules = []
+    for match in _RULES_TOKEN.finditer(text):
+        path, operations, condition, function, opened, closed = match.groups()
+        if path is not None:
+            stack.append(path)
+        elif operations is not None:
+            full_path = ''.join(part for part in stack if part) or '/'
+            if full_path.startswith(RULES_ROOT):
+                full_path = full_path[len(RULES_ROOT):] or '/'
+            operations = ', '.join(op.strip() for op in operations.split(','))
+            rules.append([full_path, operations, ' '.join((condition or 'true').split())])
+        elif function is not None:
+            functions.append(function)
+        elif opened is not None:
+            stack.append(None)
+        elif closed is not None and stack:
+            stack.pop()
+    return {'functions': functions, 'rules': rules}
+
+
+class ScanCache:
+    """
+    Resultado da extração de cada arquivo, persistido em JSON
+    Válido enquanto mtime/tamanho não mudam; se mudarem com o mesmo conteúdo
+    (checkout, touch), só o stat é atualizado
+    """
+
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file
+        self.entries = {}
+        self.scanned = 0
+        self.hits = 0
+        self._dirty = False
+        if cache_file is None:
+            return
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == SCANNER_VERSION:
+                self.entries = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+
+    def scan(self, root, path, scanner):
+        """Resultado de scanner(texto) para o arquivo path (relativo a root)"""
+        full_path = os.path.join(root, path)
+        st = os.stat(full_path)
+        key = f'{scanner.__name__}:{path}'
+        entry = self.entries.get(key)
+        if entry is not None and (entry['mtime_ns'], entry['size']) == (st.st_mtime_ns, st.st_size):
+            self.hits += 1
+            return entry['result']
+
+        with open(full_path, 'rb') as f:
+            data = f.read()
+        digest = hash_bytes(data)
+        if entry is not None and entry['hash'] == digest:
+            self.hits += 1
+            result = entry['result']
+        else:
+            self.scanned += 1
+            result = scanner(data.decode('utf-8'))
+        self.entries[key] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'hash': digest, 'result': result}
+        self._dirty = True
+        return result
+
+    def prune(self, keys):
+        """Descarta arquivos que não existem mais"""
+        for key in set(self.entries) - set(keys):
+            del self.entries[key]
+            self._dirty = True
+
+    def save(self):
+        """Grava o cache em disco (somente se algo mudou)"""
+        if not self._dirty or self.cache_file is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+        tmp_file = self.cache_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': SCANNER_VERSION, 'files': self.entries}, f, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_file, self.cache_file)
+        self._dirty = False
+
+
+def _typescript_files(root, directory, suffix='.ts'):
+    # Arquivos do diretório (recursivo), sem testes nem dependências, em ordem
+    found = []
+    for current, dirs, files in os.walk(os.path.join(root, directory)):
+        dirs[:] = sorted(d for d in dirs if d not in SKIPPED_DIRS and not d.startswith('.'))
+        for name in sorted(files):
+            if name.endswith(suffix) and not name.endswith(('.test.ts', '.d.ts')):
+                found.append(os.path.relpath(os.path.join(current, name), root).replace(os.sep, '/'))
+    return found
+
+
+def _module_file(paths, module):
+    # './auth/resetPassword' ou './stripe' (index.ts) a partir de functions/src
+    base = os.path.normpath(os.path.join(FUNCTIONS_DIR, module)).replace(os.sep, '/')
+    for candidate in (base + '.ts', base + '/index.ts'):
+        if candidate in paths:
+            return candidate
+    return None
+
+
+def scan_inventory(root, cache=None):
+    """
+    Inventário do repositório em root
+    {functions: [...], services: [...], indexes: [...], rules: {...}}
+    """
+    if cache is None:
+        cache = ScanCache()
+    with stage('inventory'):
+        seen = []
+
+        def scan(path, scanner):
+            seen.append(f'{scanner.__name__}:{path}')
+            return cache.scan(root, path, scanner)
+
+        functions = []
+        function_files = set(_typescript_files(root, FUNCTIONS_DIR))
+        if FUNCTIONS_INDEX in function_files:
+            modules = {}
+            for name, module in scan(FUNCTIONS_INDEX, scan_functions_index):
+                path = _module_file(function_files, module)
+                if path is None:
+                    continue
+                if path not in modules:
+                    modules[path] = scan(path, scan_functions_module)
+                if name in modules[path]:
+                    functions.append(dict(modules[path][name], name=name, file=path))
+
+        services = []
+        services_dir = os.path.join(root, SERVICES_DIR)
+        if os.path.isdir(services_dir):
+            for name in sorted(os.listdir(services_dir)):
+                if name.endswith('Service.ts'):
+                    path = f'{SERVICES_DIR}/{name}'
+                    services.append(dict(scan(path, scan_service), name=name[:-len('.ts')], file=path))
+
+        indexes = []
+        if os.path.exists(os.path.join(root, INDEXES_FILE)):
+            indexes = scan(INDEXES_FILE, scan_indexes)
+
+        rules = {'functions': [], 'rules': []}
+        if os.path.exists(os.path.join(root, RULES_FILE)):
+            rules = scan(RULES_FILE, scan_rules)
+
+        cache.prune(seen)
+    count('inventory_files', len(seen))
+    count('inventory_scanned', cache.scanned)
+    return {'functions': functions, 'services': services, 'indexes': indexes, 'rules': rules}
+
+
+def _cell(text):
+    # Texto em célula de tabela: sem quebras de linha e com '|' escapado
+    return ' '.join(str(text).split()).replace('|', '\\|') or '—'
+
+
+def _code(text):
+    return f'`{text}`' if text else '—'
+
+
+def inventory_markdown(inventory, title='INVENTÁRIO DA API'):
+    """Documento markdown com as seções do inventário"""
+    out = [
+        f'# 📚 {title}',
+        '',
+        '> Gerado a partir do código por `scripts/generate_inventory.py` - não editar à mão.',
+        '',
+    ]
+
+    functions = inventory['functions']
+    out += ['## ☁️ CLOUD FUNCTIONS - ENDPOINTS', '']
+    if functions:
+        out += [f'{len(functions)} função(ões) exportada(s) em `{FUNCTIONS_INDEX}`.', '',
+                '| Função | Tipo | Configuração | Descrição | Arquivo |',
+                '|---|---|---|---|---|']
+        for function in functions:
+            kind = TRIGGER_LABELS.get(function['trigger'], function['trigger'])
+            if function['target']:
+                kind += f" - `{function['target']}`"
+            settings = [function['region'], function['memory']]
+            if function['timeout']:
+                settings.append(f"{function['timeout']}s")
+            out.append(
+                f"| `{function['name']}` | {_cell(kind)} | {_cell(' · '.join(filter(None, settings)))} | "
+                f"{_cell(function['summary'])} | `{function['file']}:{function['line']}` |"
+            )
+    else:
+        out.append('Nenhuma função encontrada.')
+    out.append('')
+
+    out += ['## 🧩 SERVIÇOS DO APP', '']
+    for service in inventory['services']:
+        out += [f"### {service['name']}", '']
+        if service['summary']:
+            out += [service['summary'], '']
+        out.append(f"Arquivo: `{service['file']}`")
+        out.append('')
+        if service['functions']:
+            out += ['| Função | Descrição |', '|---|---|']
+            out += [f'| `{name}` | {_cell(summary)} |' for name, summary, _ in service['functions']]
+            out.append('')
+        if service['types']:
+            out += ['Tipos exportados: ' + ', '.join(f'`{name}`' for name in service['types']), '']
+
+    out += ['## 🗄️ BANCO DE DADOS FIREBASE', '', '### Índices compostos', '']
+    if inventory['indexes']:
+        out += ['| Coleção | Campos | Escopo |', '|---|---|---|']
+        for collection, scope, fields in inventory['indexes']:
+            columns = ', '.join(f'{path} ({order.lower()})' if order else path for path, order in fields)
+            out.append(f'| `{collection}` | {_cell(columns)} | {_cell(scope)} |')
+    else:
+        out.append('Nenhum índice composto.')
+    out.append('')
+
+    rules = inventory['rules']
+    out += ['### Regras de segurança', '']
+    if rules['functions']:
+        out += ['Funções auxiliares: ' + ', '.join(f'`{name}()`' for name in rules['functions']), '']
+    if rules['rules']:
+        out += ['| Caminho | Operações | Condição |', '|---|---|---|']
+        for path, operations, condition in rules['rules']:
+            out.append(f'| `{path}` | {_cell(operations)} | {_cell(_code(condition))} |')
+    else:
+        out.append('Nenhuma regra encontrada.')
+    out.append('')
+    return '\n'.join(out)
+
+
+def write_inventory(root, markdown_file, cache_file=None):
+    """
+    Extrai o inventário de root e grava o markdown (somente se mudou)
+    Retorna (inventário, True se o arquivo foi reescrito)
+    """
+    cache = ScanCache(cache_file)
+    inventory = scan_inventory(root, cache)
+    cache.save()
+    text = inventory_markdown(inventory)
+    try:
+        with open(markdown_file, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                return inventory, False
+    except OSError:
+        pass
+    with open(markdown_file, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return inventory, True
@@ -0,0 +1,210 @@
+"""
+Grafo de links entre os docs e verificação offline de links quebrados
+Os links e imagens de cada seção saem da mesma tokenização dos back ends (e
+ficam no cache de seções); as âncoras vêm dos títulos coletados na divisão em
+seções. Os destinos dentro do repositório são conferidos contra uma única
+varredura de diretórios, sem um stat() por link; URLs externas não são
+acessadas
+"""
+
+import os
+import posixpath
+from collections import namedtuple
+from urllib.parse import unquote, urlsplit, urlunsplit
+from urllib.request import url2pathname
+
+from .inline import plain_text
+from .nodes import BulletList, Heading, Image, Link, Paragraph, Quote, Table
+from .profiling import stage
+from .sections import load_sections, render_sections, sections_toc
+
+LINKS_KIND = 'links'
+
+# Diretórios fora da varredura (dependências, caches, controle de versão)
+SKIPPED_DIRS = frozenset({'.git', 'node_modules', '__pycache__', '.docgen-cache', '.expo'})
+
+# Link encontrado no markdown: seção (âncora do título anterior), destino, texto, é imagem
+DocLink = namedtuple('DocLink', 'section href label image')
+
+# Resultado da verificação; status: ok, external, missing-file, missing-anchor
+# hint: destino provável quando o link parece só mal escrito (ou None)
+CheckedLink = namedtuple('CheckedLink', 'source section href label target status hint')
+
+BROKEN_STATUSES = ('missing-file', 'missing-anchor')
+
+
+def html_href(href):
+    """Links relativos para outros .md apontam para o .html gerado"""
+    parts = urlsplit(href)
+    if parts.scheme or parts.netloc or not parts.path.lower().endswith('.md'):
+        return href
+    return urlunsplit(parts._replace(path=parts.path[:-len('.md')] + '.html'))
+
+
+def _inline_links(nodes, section, found):
+    for node in nodes:
+        if isinstance(node, Link):
+            found.append(DocLink(section, node.href, plain_text(node.children), False))
+            _inline_links(node.children, section, found)
+        elif isinstance(node, Image):
+            found.append(DocLink(section, node.src, node.alt, True))
+        elif hasattr(node, 'children'):
+            _inline_links(node.children, section, found)
+
+
+def section_links(blocks):
+    """Links e imagens dos blocos de uma seção, em ordem (DocLink)"""
+    found = []
+    section = ''
+    for block in blocks:
+        if isinstance(block, Heading):
+            section = block.anchor
+            _inline_links(block.children, section, found)
+        elif isinstance(block, (Paragraph, Quote)):
+            _inline_links(block.children, section, found)
+        elif isinstance(block, BulletList):
+            for item in block.items:
+                _inline_links(item.children, section, found)
+        elif isinstance(block, Table):
+            for row in [block.header] + block.rows:
+                for cell in row:
+                    _inline_links(cell, section, found)
+    return found
+
+
+class LinkGraph:
+    """
+    Links e âncoras de cada doc, em memória
+    docs: {caminho relativo à raiz do repositório (posix): (âncoras, [DocLink])}
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.docs = {}
+
+    def add(self, name, anchors, links):
+        self.docs[name] = (frozenset(anchors), links)
+
+    def edges(self, checked):
+        """{doc: {docs linkados}} a partir do resultado de check_links"""
+        graph = {name: set() for name in self.docs}
+        for link in checked:
+            if link.status == 'ok' and link.target in self.docs and link.target != link.source:
+                graph[link.source].add(link.target)
+        return graph
+
+
+def build_link_graph(markdown_files, root, cache=None):
+    """
+    Grafo dos markdown (caminhos relativos a root, a raiz do repositório)
+    cache: SectionCache compartilhado com os back ends (links por seção)
+    """
+    graph = LinkGraph(root)
+    with stage('links'):
+        for markdown_file in markdown_files:
+            name = os.path.relpath(markdown_file, root).replace(os.sep, '/')
+            sections = load_sections(markdown_file)
+            anchors = [entry.anchor for entry in sections_toc(sections)]
+            links = [
+                link
+                for found in render_sections(sections, LINKS_KIND, '', section_links, cache)
+                for link in found
+            ]
+            graph.add(name, anchors, links)
+    return graph
+
+
+def scan_repository(root):
+    """Caminhos (posix, relativos a root) de todos os arquivos e diretórios, numa varredura só"""
+    paths = set()
+    for current, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in SKIPPED_DIRS]
+        base = os.path.relpath(current, root).replace(os.sep, '/')
+        prefix = '' if base == '.' else base + '/'
+        paths.update(prefix + name for name in dirs)
+        paths.update(prefix + name for name in files)
+    return paths
+
+
+def _resolve(source, path):
+    # Relativo ao diretório do doc (como no GitHub); '/x' é relativo à raiz
+    if path.startswith('/'):
+        target = path.lstrip('/')
+    else:
+        target = posixpath.join(posixpath.dirname(source), path)
+    target = posixpath.normpath(target)
+    return None if target.startswith('../') or target == '..' else target.rstrip('/')
+
+
+def _file_target(root, parts):
+    # file:///caminho → (caminho relativo à raiz ou None se estiver fora dela, caminho absoluto)
+    path = os.path.abspath(url2pathname(parts.path))
+    try:
+        relative = os.path.relpath(path, root)
+    except ValueError:
+        # Outra unidade (Windows)
+        return None, path
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        return None, path
+    return relative.replace(os.sep, '/'), path
+
+
+def _similar_anchor(fragment, anchors):
+    # Erro comum: título com emoji gera âncora com '-' inicial (#-instalação)
+    wanted = fragment.strip('-')
+    for anchor in sorted(anchors):
+        if anchor.strip('-') == wanted:
+            return '#' + anchor
+    return None
+
+
+def check_links(graph, paths=None):
+    """
+    Confere todos os links do grafo
+    paths: resultado de scan_repository (feita aqui se não for informado)
+    Retorna [CheckedLink] na ordem dos docs e dos links
+    """
+    if paths is None:
+        paths = scan_repository(graph.root)
+
+    checked = []
+    for source, (anchors, links) in graph.docs.items():
+        for link in links:
+            parts = urlsplit(link.href)
+            fragment = unquote(parts.fragment)
+            if parts.scheme == 'file' and parts.netloc in ('', 'localhost'):
+                # Arquivo local: dentro do repositório, conferido como os links relativos
+                target, path = _file_target(graph.root, parts)
+                if target is None:
+                    status = 'ok' if os.path.exists(path) else 'missing-file'
+                    checked.append(CheckedLink(source, link.section, link.href, link.label, path, status, None))
+                    continue
+            elif parts.scheme or parts.netloc:
+                checked.append(CheckedLink(source, link.section, link.href, link.label, None, 'external', None))
+                continue
+            elif not parts.path:
+                target = source
+            else:
+                target = _resolve(source, unquote(parts.path))
+
+            hint = None
+            if target is None or (target != '.' and target not in paths):
+                status = 'missing-file'
+                # Caminho escrito a partir da raiz do repositório, não do doc: sugere o relativo
+                from_root = posixpath.normpath(unquote(parts.path).lstrip('/'))
+                if not parts.scheme and from_root in paths:
+                    hint = posixpath.relpath(from_root, posixpath.dirname(source) or '.')
+                    if parts.fragment:
+                        hint += '#' + parts.fragment
+            elif fragment and target in graph.docs and fragment not in graph.docs[target][0]:
+                status = 'missing-anchor'
+                hint = _similar_anchor(fragment, graph.docs[target][0])
+            else:
+                status = 'ok'
+            checked.append(CheckedLink(source, link.section, link.href, link.label, target, status, hint))
+    return checked
+
+
+def broken_links(checked):
+    """Somente os links quebrados (arquivo ou âncora inexistente)"""
+    return [link for link in checked if link.status in BROKEN_STATUSES]
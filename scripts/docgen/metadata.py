@@ -0,0 +1,42 @@
+"""
+Metadados de build: versão do gerador e data injetável
+A data de build é fixa por execução para que a saída seja determinística
+"""
+
+import os
+from datetime import date, datetime, timezone
+
+# Incrementar quando a saída gerada mudar (invalida o cache de build)
+GENERATOR_VERSION = '1.9.3'
+
+MONTHS_PT = [
+    'Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
+    'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro',
+]
+
+
+def resolve_build_date(value=None):
+    """
+    Retorna a data de build como date
+    Prioridade: valor explícito (AAAA-MM-DD) > SOURCE_DATE_EPOCH > data atual
+    """
+    if isinstance(value, date):
+        return value
+    if value:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), tz=timezone.utc).date()
+
+    return date.today()
+
+
+def format_long_date(value):
+    """Formata a data por extenso em português (ex.: 01 de Fevereiro de 2026)"""
+    return f'{value.day:02d} de {MONTHS_PT[value.month - 1]} de {value.year}'
+
+
+def format_short_date(value):
+    """Formata a data como DD/MM/AAAA"""
+    return value.strftime('%d/%m/%Y')
@@ -0,0 +1,179 @@
+"""
+Tipos de nós da árvore Markdown compartilhada pelos geradores
+Blocos (títulos, parágrafos, listas, código...) e inline (negrito, itálico, links...)
+Os nós usam __slots__ (sem __dict__ por instância) e vão para o pickle como
+(classe, campos): com todos os docs juntos são dezenas de milhares de nós,
+copiados para os processos do modo batch. São classes simples (sem
+dataclasses), para não pesar no tempo de importação dos geradores
+"""
+
+
+class Node:
+    """
+    Base dos nós: os campos são os __slots__ de cada classe, na ordem do construtor
+    Comparação, repr e pickle seguem os campos
+    """
+
+    __slots__ = ()
+    __hash__ = None
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+    def __reduce__(self):
+        return type(self), tuple(getattr(self, name) for name in self.__slots__)
+
+
+# Nós inline
+
+class Text(Node):
+    """Texto simples"""
+
+    __slots__ = ('text',)
+
+    def __init__(self, text):
+        self.text = text
+
+
+class Strong(Node):
+    """Negrito (**texto**)"""
+
+    __slots__ = ('children',)
+
+    def __init__(self, children=None):
+        self.children = [] if children is None else children
+
+
+class Emphasis(Node):
+    """Itálico (*texto*)"""
+
+    __slots__ = ('children',)
+
+    def __init__(self, children=None):
+        self.children = [] if children is None else children
+
+
+class Code(Node):
+    """Código inline (`texto`)"""
+
+    __slots__ = ('text',)
+
+    def __init__(self, text):
+        self.text = text
+
+
+class Link(Node):
+    """Link ([texto](href "título"))"""
+
+    __slots__ = ('href', 'children', 'title')
+
+    def __init__(self, href, children=None, title=''):
+        self.href = href
+        self.children = [] if children is None else children
+        self.title = title
+
+
+class Image(Node):
+    """Imagem (![alt](src "título")); src é relativo ao arquivo markdown"""
+
+    __slots__ = ('src', 'alt', 'title')
+
+    def __init__(self, src, alt='', title=''):
+        self.src = src
+        self.alt = alt
+        self.title = title
+
+
+# Nós de bloco
+
+class Heading(Node):
+    """Título (# a ######); anchor é a âncora única no documento (ver docgen.toc)"""
+
+    __slots__ = ('level', 'text', 'children', 'anchor')
+
+    def __init__(self, level, text, children=None, anchor=''):
+        self.level = level
+        self.text = text
+        self.children = [] if children is None else children
+        self.anchor = anchor
+
+
+class Paragraph(Node):
+    """Parágrafo (uma linha de texto)"""
+
+    __slots__ = ('children',)
+
+    def __init__(self, children=None):
+        self.children = [] if children is None else children
+
+
+class ListItem(Node):
+    """Item de lista; marker é '-', '1.', '✅' ou '❌'"""
+
+    __slots__ = ('marker', 'depth', 'ordered', 'children')
+
+    def __init__(self, marker, depth=0, ordered=False, children=None):
+        self.marker = marker
+        self.depth = depth
+        self.ordered = ordered
+        self.children = [] if children is None else children
+
+
+class BulletList(Node):
+    """Sequência de itens de lista consecutivos"""
+
+    __slots__ = ('items',)
+
+    def __init__(self, items=None):
+        self.items = [] if items is None else items
+
+
+class CodeBlock(Node):
+    """Bloco de código cercado por ```"""
+
+    __slots__ = ('language', 'lines')
+
+    def __init__(self, language, lines=None):
+        self.language = language
+        self.lines = [] if lines is None else lines
+
+
+class Table(Node):
+    """Tabela GFM; cada célula é uma tupla de nós inline, aligns tem 'left'/'center'/'right'/None"""
+
+    __slots__ = ('aligns', 'header', 'rows')
+
+    def __init__(self, aligns, header, rows=None):
+        self.aligns = aligns
+        self.header = header
+        self.rows = [] if rows is None else rows
+
+
+class Quote(Node):
+    """Citação (> texto)"""
+
+    __slots__ = ('children',)
+
+    def __init__(self, children=None):
+        self.children = [] if children is None else children
+
+
+class Rule(Node):
+    """Linha horizontal (---)"""
+
+    __slots__ = ()
+
+
+class Document(Node):
+    """Documento completo: lista de blocos na ordem do arquivo"""
+
+    __slots__ = ('blocks',)
+
+    def __init__(self, blocks=None):
+        self.blocks = [] if blocks is None else blocks
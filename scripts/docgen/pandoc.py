@@ -0,0 +1,122 @@
+"""
+Back end pandoc + xelatex em etapas cronometradas
+O pandoc gera o LaTeX intermediário (cacheado pelo hash do markdown e dos
+argumentos) e o xelatex gera o PDF; os caches de fontes/formatos do TeX ficam
+em um diretório compartilhado entre execuções e processos
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+from .cache import hash_bytes
+from .metadata import GENERATOR_VERSION
+
+# Passadas do xelatex: índice (--toc) e referências precisam de pelo menos duas
+MAX_LATEX_RUNS = 3
+RERUN_MARKERS = (b'Rerun to get', b'Label(s) may have changed')
+
+
+def latex_args(args):
+    """Argumentos do pandoc para gerar LaTeX (sem os específicos de PDF)"""
+    return [arg for arg in args if not arg.startswith('--pdf-engine')]
+
+
+def tex_environment(texmf_dir):
+    """Ambiente do xelatex com caches (luaotfload/kpathsea e fontconfig) compartilhados"""
+    env = dict(os.environ)
+    if texmf_dir:
+        os.makedirs(texmf_dir, exist_ok=True)
+        env['TEXMFVAR'] = texmf_dir
+        env['TEXMFCACHE'] = texmf_dir
+        env['XDG_CACHE_HOME'] = texmf_dir
+    return env
+
+
+def _tail(output, lines=15):
+    text = output.decode('utf-8', 'replace') if isinstance(output, bytes) else output
+    return '\n'.join(text.strip().splitlines()[-lines:])
+
+
+def _run(stage, command, timings, **kwargs):
+    """Executa uma etapa e registra o tempo gasto; falhas viram RuntimeError"""
+    start = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, **kwargs)
+    timings[stage] = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f'{stage} falhou (código {result.returncode}):\n'
+                           f'{_tail(result.stderr or result.stdout)}')
+    return result
+
+
+def markdown_to_latex(markdown_file, args, cache_dir, timings):
+    """
+    LaTeX intermediário do markdown, gerado pelo pandoc ou reaproveitado do cache
+    Retorna o caminho do .tex (dentro de cache_dir)
+    """
+    with open(markdown_file, 'rb') as f:
+        source = f.read()
+    key = hash_bytes(b'\0'.join([
+        GENERATOR_VERSION.encode('utf-8'), '\0'.join(args).encode('utf-8'), source,
+    ]))
+    tex_file = os.path.join(cache_dir, key + '.tex')
+    if os.path.exists(tex_file):
+        timings['pandoc (cache)'] = 0.0
+        return tex_file
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_file = f'{tex_file}.{os.getpid()}.{threading.get_ident()}.tmp'
+    command = ['pandoc', markdown_file, '--standalone', '-t', 'latex', '-o', tmp_file] + latex_args(args)
+    try:
+        _run('pandoc', command, timings)
+        os.replace(tmp_file, tex_file)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    return tex_file
+
+
+def latex_to_pdf(tex_file, pdf_file, timings, texmf_dir=None, cwd=None, min_runs=1):
+    """Compila o LaTeX com o xelatex, repetindo enquanto o log pedir nova passada"""
+    env = tex_environment(texmf_dir)
+    name = os.path.splitext(os.path.basename(tex_file))[0]
+
+    with tempfile.TemporaryDirectory(prefix='docgen-xelatex-') as out_dir:
+        for run in range(1, MAX_LATEX_RUNS + 1):
+            _run(f'xelatex {run}', [
+                'xelatex', '-interaction=nonstopmode', '-halt-on-error',
+                f'-output-directory={out_dir}', tex_file,
+            ], timings, cwd=cwd, env=env)
+
+            if run < min_runs:
+                continue
+            with open(os.path.join(out_dir, name + '.log'), 'rb') as f:
+                log = f.read()
+            if not any(marker in log for marker in RERUN_MARKERS):
+                break
+
+        shutil.move(os.path.join(out_dir, name + '.pdf'), pdf_file)
+
+
+def convert(markdown_file, pdf_file, args, latex_cache_dir, texmf_dir=None):
+    """
+    markdown → LaTeX (pandoc, cacheado) → PDF (xelatex)
+    Retorna {etapa: segundos}, na ordem de execução
+    """
+    timings = {}
+    tex_file = markdown_to_latex(markdown_file, args, latex_cache_dir, timings)
+    latex_to_pdf(
+        tex_file, pdf_file, timings, texmf_dir,
+        # Caminhos relativos (imagens) são resolvidos a partir do markdown
+        cwd=os.path.dirname(os.path.abspath(markdown_file)),
+        min_runs=2 if '--toc' in args else 1,
+    )
+    return timings
+
+
+def format_timings(timings):
+    """Resumo das etapas (ex.: pandoc 0.42s | xelatex 1 1.90s | xelatex 2 1.10s)"""
+    return ' | '.join(f'{stage} {seconds:.2f}s' for stage, seconds in timings.items())
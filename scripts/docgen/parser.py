@@ -0,0 +1,199 @@
+"""
+Tokenizador de blocos markdown em passagem única
+Lê o documento linha a linha uma só vez e produz a árvore de nós
+"""
+
+import re
+import sys
+
+from .inline import parse_inline, plain_text
+from .nodes import (
+    BulletList, CodeBlock, Document, Heading, ListItem, Paragraph, Quote, Rule, Table,
+)
+from .toc import Slugger
+
+HEADING_PATTERN = re.compile(r'^(#{1,6}) +(.*)$')
+LIST_PATTERN = re.compile(r'^( *)([-*+]|\d+\.) +(.*)$')
+CHECK_MARKERS = ('✅ ', '❌ ')
+RULES = ('---', '***', '___')
+DELIMITER_CELL_PATTERN = re.compile(r'^:?-+:?$')
+
+
+def parse_list_item(line):
+    """Retorna um ListItem se a linha for item de lista, senão None"""
+    # Marcadores (e linguagens dos blocos de código) se repetem em milhares de nós: sys.intern
+    if line.startswith(CHECK_MARKERS):
+        return ListItem(sys.intern(line[0]), children=parse_inline(line[2:].strip()))
+
+    match = LIST_PATTERN.match(line)
+    if not match:
+        return None
+
+    indent, marker, text = match.groups()
+    return ListItem(
+        sys.intern(marker),
+        depth=len(indent) // 2,
+        ordered=marker[0].isdigit(),
+        children=parse_inline(text.strip()),
+    )
+
+
+def split_table_row(line):
+    """Divide uma linha de tabela em células, respeitando `código` e \\|"""
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|') and not line.endswith('\\|'):
+        line = line[:-1]
+
+    cells = []
+    current = []
+    in_code = False
+    escaped = False
+    for char in line:
+        if escaped:
+            current.append(char if char == '|' else '\\' + char)
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == '`':
+            in_code = not in_code
+            current.append(char)
+        elif char == '|' and not in_code:
+            cells.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    if escaped:
+        current.append('\\')
+    cells.append(''.join(current).strip())
+    return cells
+
+
+def parse_delimiter_row(line, columns):
+    """Alinhamentos da linha separadora (|---|:-:|) ou None se não for uma"""
+    cells = split_table_row(line)
+    if len(cells) != columns or not all(DELIMITER_CELL_PATTERN.match(cell) for cell in cells):
+        return None
+
+    aligns = []
+    for cell in cells:
+        if cell.startswith(':') and cell.endswith(':'):
+            aligns.append('center')
+        elif cell.endswith(':'):
+            aligns.append('right')
+        elif cell.startswith(':'):
+            aligns.append('left')
+        else:
+            aligns.append(None)
+    return aligns
+
+
+def parse_table_row(line, columns):
+    """Células de uma linha de dados, completadas/cortadas para o número de colunas"""
+    cells = split_table_row(line)[:columns]
+    cells.extend([''] * (columns - len(cells)))
+    return [parse_inline(cell) for cell in cells]
+
+
+def iter_blocks(lines, slugger=None):
+    """
+    Gera os blocos do documento à medida que as linhas são lidas
+    slugger: gera a âncora de cada título (padrão: âncoras únicas neste documento)
+    """
+    if slugger is None:
+        slugger = Slugger()
+    current_list = None
+    code_block = None
+    table = None
+    # Linha '|...' aguardando a linha separadora para virar cabeçalho de tabela
+    table_header = None
+
+    for line in lines:
+        line = line.rstrip('\r\n')
+
+        # Dentro de bloco de código tudo é literal até o fechamento
+        if code_block is not None:
+            if line.startswith('```'):
+                yield code_block
+                code_block = None
+            else:
+                code_block.lines.append(line)
+            continue
+
+        stripped = line.strip()
+
+        if table is not None:
+            if stripped.startswith('|'):
+                table.rows.append(parse_table_row(stripped, len(table.header)))
+                continue
+            yield table
+            table = None
+
+        if table_header is not None:
+            header_cells = split_table_row(table_header)
+            aligns = parse_delimiter_row(stripped, len(header_cells))
+            if aligns is not None:
+                table = Table(aligns, [parse_inline(cell) for cell in header_cells])
+                table_header = None
+                continue
+            yield Paragraph(parse_inline(table_header))
+            table_header = None
+
+        item = parse_list_item(line)
+        if item is not None:
+            if current_list is None:
+                current_list = BulletList()
+            current_list.items.append(item)
+            continue
+
+        if current_list is not None:
+            yield current_list
+            current_list = None
+
+        if line.startswith('```'):
+            code_block = CodeBlock(sys.intern(line[3:].strip()))
+
+        elif line.startswith('#'):
+            match = HEADING_PATTERN.match(line)
+            if match:
+                text = match.group(2).strip()
+                children = parse_inline(text)
+                yield Heading(len(match.group(1)), text, children, slugger(plain_text(children)))
+            else:
+                yield Paragraph(parse_inline(stripped))
+
+        elif stripped in RULES:
+            yield Rule()
+
+        # Possível cabeçalho de tabela: decidido pela próxima linha
+        elif stripped.startswith('|'):
+            table_header = stripped
+
+        elif line.startswith('>'):
+            yield Quote(parse_inline(line[1:].strip()))
+
+        elif stripped:
+            yield Paragraph(parse_inline(stripped))
+
+    if current_list is not None:
+        yield current_list
+    if table is not None:
+        yield table
+    if table_header is not None:
+        yield Paragraph(parse_inline(table_header))
+    if code_block is not None:
+        yield code_block
+
+
+def parse_markdown(source, slugger=None):
+    """Converte texto markdown (str ou iterável de linhas) em Document"""
+    if isinstance(source, str):
+        source = source.split('\n')
+    return Document(list(iter_blocks(source, slugger)))
+
+
+def load_document(markdown_file):
+    """Lê e converte um arquivo markdown em uma única passagem"""
+    with open(markdown_file, 'r', encoding='utf-8') as f:
+        return parse_markdown(f)
@@ -0,0 +1,202 @@
+"""
+Perfil por etapa do pipeline (--profile)
+Cada etapa (leitura, tokenização, inline, HTML, flowables, layout, escrita)
+acumula o tempo próprio (sem as etapas aninhadas), o número de chamadas e o
+pico de memória do heap Python (tracemalloc) enquanto esteve ativa; as
+contagens (linhas, blocos, flowables, páginas) vão no mesmo registro. Sem
+perfil ativo, stage() e count() não fazem nada. O tracemalloc deixa o código
+Python várias vezes mais lento: para comparar tempos, use trace_memory=False
+Os módulos usados só com perfil ativo (tracemalloc, platform) são importados
+sob demanda: este módulo é carregado por todos os geradores
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+from .metadata import GENERATOR_VERSION
+
+# Versão do formato do relatório JSON
+PROFILE_VERSION = 1
+
+_NULL_STAGE = nullcontext()
+_active = None
+
+
+class Profiler:
+    """
+    Tempos, picos de memória e contagens de uma execução
+    stages: {etapa: [segundos próprios, chamadas, pico em bytes]}, na ordem de uso
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.counts = {}
+        self.wall = 0.0
+        self.peak = 0
+        self._stack = []
+        self._start = None
+
+    def start(self):
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        self._start = time.perf_counter()
+
+    def stop(self):
+        self.wall = time.perf_counter() - self._start
+        if self.trace_memory:
+            import tracemalloc
+            self._fold_peak()
+            tracemalloc.stop()
+
+    def _fold_peak(self):
+        # O pico desde o último reset vale para todas as etapas abertas nesse intervalo
+        if not self.trace_memory:
+            return
+        import tracemalloc
+        peak = tracemalloc.get_traced_memory()[1]
+        for frame in self._stack:
+            frame[3] = max(frame[3], peak)
+        self.peak = max(self.peak, peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name):
+        """Mede o bloco como a etapa name (reentrante: chamadas recursivas contam uma vez)"""
+        if self._stack and self._stack[-1][0] == name:
+            yield
+            return
+
+        self._fold_peak()
+        # [etapa, início, tempo das etapas aninhadas, pico]
+        frame = [name, time.perf_counter(), 0.0, 0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - frame[1]
+            self._fold_peak()
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+            record = self.stages.setdefault(name, [0.0, 0, 0])
+            record[0] += elapsed - frame[2]
+            record[1] += 1
+            record[2] = max(record[2], frame[3])
+
+    def count(self, name, value=1):
+        """Soma value ao contador name (linhas, blocos, páginas...)"""
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def report(self):
+        """Registro da execução (formato do JSON gravado por write)"""
+        import platform
+        measured = sum(seconds for seconds, _, _ in self.stages.values())
+        return {
+            'version': PROFILE_VERSION,
+            'generator': GENERATOR_VERSION,
+            'python': platform.python_version(),
+            'command': sys.argv,
+            'wall_seconds': round(self.wall, 6),
+            'unattributed_seconds': round(max(self.wall - measured, 0.0), 6),
+            'peak_memory_bytes': self.peak if self.trace_memory else None,
+            'stages': {
+                name: {
+                    'seconds': round(seconds, 6),
+                    'calls': calls,
+                    'peak_memory_bytes': peak if self.trace_memory else None,
+                }
+                for name, (seconds, calls, peak) in self.stages.items()
+            },
+            'counts': dict(sorted(self.counts.items())),
+        }
+
+    def write(self, json_file):
+        """Grava o relatório em JSON"""
+        os.makedirs(os.path.dirname(os.path.abspath(json_file)), exist_ok=True)
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+            f.write('\n')
+
+    def summary(self):
+        """Linhas do resumo para o terminal, da etapa mais lenta para a mais rápida"""
+        lines = [f"⏱ Perfil: {self.wall:.3f}s"
+                 + (f", pico de memória {_megabytes(self.peak)}" if self.trace_memory else '')]
+        ranked = sorted(self.stages.items(), key=lambda item: -item[1][0])
+        width = max((len(name) for name in self.stages), default=0)
+        for name, (seconds, calls, peak) in ranked:
+            share = seconds / self.wall * 100 if self.wall else 0.0
+            memory = f"  pico {_megabytes(peak)}" if self.trace_memory else ''
+            lines.append(f"  {name:<{width}}  {seconds:8.3f}s {share:5.1f}%  {calls:6}x{memory}")
+        if self.counts:
+            lines.append('  ' + ', '.join(f'{name}={value}' for name, value in sorted(self.counts.items())))
+        return lines
+
+
+def _megabytes(value):
+    return f'{value / (1024 * 1024):.1f} MB'
+
+
+def stage(name):
+    """Context manager da etapa name no perfil ativo (sem perfil: não faz nada)"""
+    if _active is None:
+        return _NULL_STAGE
+    return _active.stage(name)
+
+
+def count(name, value=1):
+    """Soma value ao contador name do perfil ativo"""
+    if _active is not None:
+        _active.count(name, value)
+
+
+def active():
+    """True se há um perfil sendo coletado (o trabalho deve ficar neste processo)"""
+    return _active is not None
+
+
+@contextmanager
+def profiling(json_file=None, pstats_file=None, trace_memory=True):
+    """
+    Coleta o perfil do bloco; grava o JSON em json_file e, com pstats_file,
+    também o dump do cProfile (abrir com python -m pstats). Sem nenhum dos
+    dois, não faz nada. O resumo vai para stderr (a saída padrão pode ser o HTML)
+    """
+    global _active
+
+    if json_file is None and pstats_file is None:
+        yield None
+        return
+
+    profiler = Profiler(trace_memory)
+    python_profile = None
+    if pstats_file:
+        import cProfile
+        python_profile = cProfile.Profile()
+
+    _active = profiler
+    profiler.start()
+    if python_profile is not None:
+        python_profile.enable()
+    try:
+        yield profiler
+    finally:
+        if python_profile is not None:
+            python_profile.disable()
+        profiler.stop()
+        _active = None
+
+        for line in profiler.summary():
+            print(line, file=sys.stderr)
+        if json_file:
+            profiler.write(json_file)
+            print(f"✓ Perfil gravado: {json_file}", file=sys.stderr)
+        if python_profile is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(pstats_file)), exist_ok=True)
+            python_profile.dump_stats(pstats_file)
+            print(f"✓ Estatísticas do cProfile: {pstats_file}", file=sys.stderr)
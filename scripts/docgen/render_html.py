@@ -0,0 +1,199 @@
+"""
+Back end HTML: converte a árvore de nós em fragmentos HTML
+Os fragmentos são gerados bloco a bloco, então podem ser escritos direto no
+arquivo de saída sem montar o documento inteiro em memória
+"""
+
+from .highlight import highlight
+from .links import html_href
+from .nodes import (
+    BulletList, Code, CodeBlock, Emphasis, Heading, Image, Link, Paragraph, Quote, Rule,
+    Strong, Table, Text,
+)
+from .parser import iter_blocks
+from .toc import TOC_DEPTH
+
+
+def escape_html(text):
+    """Escapa caracteres HTML"""
+    return (text
+        .replace('&', '&amp;')
+        .replace('<', '&lt;')
+        .replace('>', '&gt;')
+        .replace('"', '&quot;')
+        .replace("'", '&#39;'))
+
+
+def render_code_block(block):
+    """<pre><code> do bloco, com <span class> por token quando a linguagem tem realce"""
+    lines = highlight(block.language, block.lines)
+    if lines is None:
+        code = escape_html('\n'.join(block.lines))
+    else:
+        code = '\n'.join(
+            ''.join(
+                f'<span class="{style[0]}">{escape_html(text)}</span>' if style else escape_html(text)
+                for style, text in line
+            )
+            for line in lines
+        )
+    language = f' class="language-{escape_html(block.language)}"' if block.language else ''
+    return f'<pre><code{language}>{code}</code></pre>'
+
+
+def render_image(node, images=None):
+    """<img> da rendição em cache (docgen.images) ou, sem ela, do src original"""
+    rendition = images.resolve(node.src) if images is not None else None
+    attrs = [f'alt="{escape_html(node.alt)}"']
+    if node.title:
+        attrs.append(f'title="{escape_html(node.title)}"')
+    if rendition is None:
+        return f'<img src="{escape_html(node.src)}" {" ".join(attrs)}>'
+    attrs.append(f'width="{round(rendition.width)}" height="{round(rendition.height)}"')
+    return f'<img src="{escape_html(rendition.url)}" {" ".join(attrs)} loading="lazy">'
+
+
+def render_inline(nodes, images=None):
+    """
+    Converte nós inline em HTML
+    images: ImageResolver do documento (docgen.images); sem ele, src original
+    """
+    parts = []
+    for node in nodes:
+        if isinstance(node, Text):
+            parts.append(escape_html(node.text))
+        elif isinstance(node, Strong):
+            parts.append(f'<strong>{render_inline(node.children, images)}</strong>')
+        elif isinstance(node, Emphasis):
+            parts.append(f'<em>{render_inline(node.children, images)}</em>')
+        elif isinstance(node, Code):
+            parts.append(f'<code>{escape_html(node.text)}</code>')
+        elif isinstance(node, Link):
+            # Links para outros docs .md apontam para o HTML gerado deles
+            href = escape_html(html_href(node.href))
+            title = f' title="{escape_html(node.title)}"' if node.title else ''
+            parts.append(f'<a href="{href}"{title}>{render_inline(node.children, images)}</a>')
+        elif isinstance(node, Image):
+            parts.append(render_image(node, images))
+    return ''.join(parts)
+
+
+def iter_list_html(block, images=None):
+    """Gera o HTML de uma lista, abrindo sublistas conforme a indentação"""
+    open_tags = []
+    for item in block.items:
+        tag = 'ol' if item.ordered else 'ul'
+        while len(open_tags) > item.depth + 1:
+            yield f'</li></{open_tags.pop()}>'
+        if len(open_tags) == item.depth + 1:
+            yield '</li>'
+        while len(open_tags) < item.depth + 1:
+            open_tags.append(tag)
+            # Listas numeradas separadas por linhas em branco continuam a contagem
+            start = item.marker[:-1] if item.ordered else '1'
+            yield f'<{tag}>' if start == '1' else f'<{tag} start="{start}">'
+
+        content = render_inline(item.children, images)
+        if item.marker in ('✅', '❌'):
+            content = f'{item.marker} {content}'
+        yield f'<li>{content}'
+
+    while open_tags:
+        yield f'</li></{open_tags.pop()}>'
+
+
+def render_table(block, images=None):
+    """HTML de uma tabela, usando os estilos table/th/td da página"""
+    def cell(tag, align, nodes):
+        style = f' style="text-align: {align}"' if align else ''
+        return f'<{tag}{style}>{render_inline(nodes, images)}</{tag}>'
+
+    parts = ['<table>', '<thead><tr>']
+    parts.extend(cell('th', align, nodes) for align, nodes in zip(block.aligns, block.header))
+    parts.append('</tr></thead>')
+    if block.rows:
+        parts.append('<tbody>')
+        for row in block.rows:
+            parts.append('<tr>')
+            parts.extend(cell('td', align, nodes) for align, nodes in zip(block.aligns, row))
+            parts.append('</tr>')
+        parts.append('</tbody>')
+    parts.append('</table>')
+    return ''.join(parts)
+
+
+def iter_html(blocks, images=None):
+    """
+    Gera o HTML de cada bloco do documento
+    images: ImageResolver do documento (docgen.images) para as imagens
+    """
+    for block in blocks:
+        if isinstance(block, Heading):
+            anchor = f' id="{escape_html(block.anchor)}"' if block.anchor else ''
+            yield f'<h{block.level}{anchor}>{render_inline(block.children, images)}</h{block.level}>'
+
+        elif isinstance(block, Paragraph):
+            yield f'<p>{render_inline(block.children, images)}</p>'
+
+        elif isinstance(block, BulletList):
+            yield ''.join(iter_list_html(block, images))
+
+        elif isinstance(block, CodeBlock):
+            yield render_code_block(block)
+
+        elif isinstance(block, Table):
+            yield render_table(block, images)
+
+        elif isinstance(block, Quote):
+            yield f'<blockquote>{render_inline(block.children, images)}</blockquote>'
+
+        elif isinstance(block, Rule):
+            yield '<hr>'
+
+
+def render_toc_html(entries, depth=TOC_DEPTH, title='Índice'):
+    """Índice com links para as âncoras dos títulos (até o nível depth), em listas aninhadas"""
+    entries = [entry for entry in entries if entry.level <= depth]
+    if not entries:
+        return ''
+
+    base = min(entry.level for entry in entries)
+    parts = ['<div class="toc">', f'<h2>{escape_html(title)}</h2>']
+    open_lists = 0
+    for entry in entries:
+        target = entry.level - base + 1
+        while open_lists > target:
+            parts.append('</li></ul>')
+            open_lists -= 1
+        if open_lists == target:
+            parts.append('</li>')
+        while open_lists < target:
+            parts.append('<ul>')
+            open_lists += 1
+        parts.append(f'<li><a href="#{escape_html(entry.anchor)}">{escape_html(entry.text)}</a>')
+    parts.append('</li></ul>' * open_lists)
+    parts.append('</div>')
+    return ''.join(parts)
+
+
+def render_html(document):
+    """Converte um Document em HTML (apenas o corpo)"""
+    return '\n'.join(iter_html(document.blocks))
+
+
+def stream_html(lines, slugger=None, images=None):
+    """Gera o HTML do corpo enquanto lê as linhas (memória limitada ao maior bloco)"""
+    return iter_html(iter_blocks(lines, slugger), images)
+
+
+def write_chunks(chunks, out):
+    """
+    Escreve fragmentos em um arquivo aberto sem juntá-los antes
+    O resultado é idêntico a out.write('\\n'.join(chunks))
+    """
+    write = out.write
+    separator = ''
+    for chunk in chunks:
+        write(separator)
+        write(chunk)
+        separator = '\n'
@@ -0,0 +1,36 @@
+"""
+Back end JSON: serializa a árvore de nós para consumo por outras ferramentas
+Cada nó vira {"type": "<Classe>", ...campos}; nós inline ficam em "children"
+"""
+
+from .metadata import GENERATOR_VERSION
+from .nodes import Node
+
+# Versão do formato JSON (incrementar se a estrutura mudar)
+JSON_FORMAT_VERSION = 1
+
+
+def node_to_dict(node):
+    """Converte um nó (e seus filhos) em estruturas JSON"""
+    data = {'type': type(node).__name__}
+    for name in node.__slots__:
+        data[name] = _value(getattr(node, name))
+    return data
+
+
+def _value(value):
+    if isinstance(value, (list, tuple)):
+        return [_value(item) for item in value]
+    if isinstance(value, Node):
+        return node_to_dict(value)
+    return value
+
+
+def document_to_dict(blocks, source=None):
+    """Documento completo (lista de blocos) com metadados do gerador"""
+    return {
+        'format': JSON_FORMAT_VERSION,
+        'generator': GENERATOR_VERSION,
+        'source': source,
+        'blocks': [node_to_dict(block) for block in blocks],
+    }
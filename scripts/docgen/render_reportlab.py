@@ -0,0 +1,389 @@
+"""
+Back end ReportLab: converte a árvore de nós em flowables
+Os títulos levam a sua TocEntry; o template do documento usa essas entradas
+para criar destinos, marcadores (outline) e o índice, sem reler o markdown;
+links '#âncora' do texto apontam para esses destinos.
+Caracteres que a fonte de cada trecho não tem passam pelo fallback do tema
+(docgen.fonts)
+"""
+
+from functools import lru_cache
+from urllib.parse import unquote
+
+from .highlight import highlight
+from .inline import plain_text
+from .nodes import (
+    BulletList, Code, CodeBlock, Emphasis, Heading, Image, Link, Paragraph, Quote, Rule,
+    Strong, Table, Text,
+)
+from .styles import aligned_style, code_chunk_style
+from .toc import TOC_DEPTH, TocEntry
+
+# Espaço horizontal de cada célula (padding esquerdo + direito do TableStyle)
+CELL_PADDING = 12
+
+# Níveis de título que entram nos marcadores (outline) do PDF
+OUTLINE_DEPTH = 3
+
+# Altura máxima (pontos) de imagens no meio do texto
+INLINE_IMAGE_HEIGHT = 24
+
+# Linhas por flowable de código: blocos longos viram vários trechos que o
+# layout encaixa nas páginas sem precisar dividir (e remedir) um bloco enorme
+CODE_CHUNK_LINES = 40
+
+
+def escape_markup(text):
+    """Escapa caracteres especiais da marcação de parágrafo do ReportLab"""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def with_fallback(markup, style, fonts):
+    """Marcação com os glifos ausentes na fonte do estilo trocados pelo fallback"""
+    if fonts is None:
+        return markup
+    return fonts.markup(markup, style.fontName)
+
+
+def render_inline_image(node, images=None):
+    """<img> da rendição em cache, reduzida à altura da linha; sem ela, o texto alternativo"""
+    rendition = images.resolve(node.src) if images is not None else None
+    if rendition is None:
+        return f'<i>{escape_markup(node.alt)}</i>' if node.alt else ''
+    scale = min(1.0, INLINE_IMAGE_HEIGHT / rendition.height)
+    src = escape_markup(rendition.path).replace('"', '&quot;')
+    return (f'<img src="{src}" width="{rendition.width * scale:.2f}" '
+            f'height="{rendition.height * scale:.2f}" valign="middle"/>')
+
+
+def render_inline(nodes, images=None, anchors=None):
+    """
+    Converte nós inline na marcação de parágrafo do ReportLab
+    images: ImageResolver do documento (docgen.images) para as imagens
+    anchors: âncoras dos títulos do documento; links '#âncora' para uma delas
+    apontam para o destino do título (os demais ficam só com o texto)
+    """
+    parts = []
+    for node in nodes:
+        if isinstance(node, Text):
+            parts.append(escape_markup(node.text))
+        elif isinstance(node, Strong):
+            parts.append(f'<b>{render_inline(node.children, images, anchors)}</b>')
+        elif isinstance(node, Emphasis):
+            parts.append(f'<i>{render_inline(node.children, images, anchors)}</i>')
+        elif isinstance(node, Code):
+            parts.append(f'<font name="Courier">{escape_markup(node.text)}</font>')
+        elif isinstance(node, Image):
+            parts.append(render_inline_image(node, images))
+        elif isinstance(node, Link):
+            label = render_inline(node.children, images, anchors)
+            if node.href.startswith('#'):
+                # Destino inexistente quebraria o PDF: só o texto
+                anchor = unquote(node.href[1:])
+                if anchors is None or anchor not in anchors:
+                    parts.append(label)
+                    continue
+                href = '#' + escape_markup(anchor).replace('"', '&quot;')
+            else:
+                href = escape_markup(node.href).replace('"', '&quot;')
+            parts.append(f'<a href="{href}" color="#F9A825">{label}</a>')
+    return ''.join(parts)
+
+
+@lru_cache(maxsize=16384)
+def text_width(text, font_name, font_size):
+    """Largura do texto em pontos (memorizada: as células se repetem muito)"""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    return stringWidth(text, font_name, font_size)
+
+
+@lru_cache(maxsize=1024)
+def table_column_widths(columns, font_name, bold_font_name, font_size, available):
+    """
+    Larguras das colunas calculadas uma vez a partir das métricas do texto
+    columns: tupla por coluna de tuplas (texto, negrito)
+    O ReportLab recebe as larguras prontas e não precisa medir as células
+    """
+    natural = []
+    minimum = []
+    for cells in columns:
+        widest = longest_word = 0
+        for text, bold in cells:
+            font = bold_font_name if bold else font_name
+            widest = max(widest, text_width(text, font, font_size))
+            for word in text.split():
+                longest_word = max(longest_word, text_width(word, font, font_size))
+        natural.append(widest + CELL_PADDING)
+        minimum.append(longest_word + CELL_PADDING)
+
+    # Tudo cabe em uma linha: distribui a largura total proporcionalmente
+    total = sum(natural)
+    if total <= available:
+        return tuple(width * available / total for width in natural)
+
+    # Garante a palavra mais longa de cada coluna e reparte o restante
+    floor = [min(width, available / len(columns)) for width in minimum]
+    remaining = available - sum(floor)
+    extra = [max(n - f, 0) for n, f in zip(natural, floor)]
+    if remaining <= 0 or not sum(extra):
+        return tuple(width * available / sum(floor) for width in floor)
+    return tuple(f + remaining * e / sum(extra) for f, e in zip(floor, extra))
+
+
+def code_line_markup(line):
+    """Marcação de uma linha realçada (cores da docgen.highlight, comentários em itálico)"""
+    parts = []
+    for style, text in line:
+        text = escape_markup(text)
+        if style is None:
+            parts.append(text)
+        else:
+            _, color, italic = style
+            if italic:
+                text = f'<i>{text}</i>'
+            parts.append(f'<font color="{color}">{text}</font>')
+    return ''.join(parts)
+
+
+def build_code(block, styles):
+    """
+    Flowables de um bloco de código, em trechos de até CODE_CHUNK_LINES linhas
+    Com realce ou glifos fora do Courier vira XPreformatted (marcação); senão, Preformatted
+    """
+    from reportlab.platypus import Preformatted, XPreformatted
+
+    style = styles['code']
+    fonts = styles.get('fonts')
+    highlighted = highlight(block.language, block.lines)
+    count = len(block.lines)
+    chunks = [(start, min(start + CODE_CHUNK_LINES, count)) for start in range(0, count, CODE_CHUNK_LINES)]
+
+    flowables = []
+    for index, (start, end) in enumerate(chunks):
+        if len(chunks) == 1:
+            chunk_style = style
+        else:
+            position = 'first' if index == 0 else 'last' if index == len(chunks) - 1 else 'middle'
+            chunk_style = code_chunk_style(style, position)
+
+        lines = block.lines[start:end]
+        plain = escape_markup('\n'.join(lines))
+        if highlighted is None:
+            markup = plain
+        else:
+            markup = '\n'.join(code_line_markup(line) for line in highlighted[start:end])
+        markup = with_fallback(markup, style, fonts)
+
+        if markup == plain:
+            flowables.append(Preformatted('\n'.join(lines), chunk_style))
+        else:
+            flowables.append(XPreformatted(markup, chunk_style))
+    return flowables
+
+
+def has_strong(nodes):
+    """True se a célula é (ou começa com) texto em negrito"""
+    return bool(nodes) and isinstance(nodes[0], Strong)
+
+
+def build_image(node, images):
+    """
+    Imagem sozinha no parágrafo vira flowable centralizado, no tamanho da rendição
+    O ReportLab grava cada arquivo uma única vez no PDF, mesmo referenciado várias vezes
+    """
+    from reportlab.platypus import Image as RLImage
+
+    rendition = images.resolve(node.src) if images is not None else None
+    if rendition is None:
+        return None
+    return RLImage(rendition.path, width=rendition.width, height=rendition.height, hAlign='CENTER')
+
+
+def build_table(block, styles, available, images=None, anchors=None):
+    """Converte uma tabela em Table do ReportLab com larguras pré-calculadas"""
+    from reportlab.platypus import Paragraph as RLParagraph, Table as RLTable
+
+    header_style = styles['table_header']
+    cell_style = styles['table_cell']
+    fonts = styles.get('fonts')
+
+    columns = tuple(
+        tuple((plain_text(row[index]), has_strong(row[index])) for row in [block.header] + block.rows)
+        for index in range(len(block.header))
+    )
+    widths = table_column_widths(
+        columns, cell_style.fontName, header_style.fontName, cell_style.fontSize, available
+    )
+
+    # Variantes alinhadas vêm do pool (criadas uma vez por estilo/alinhamento)
+    column_styles = [
+        (aligned_style(header_style, align), aligned_style(cell_style, align))
+        for align in block.aligns
+    ]
+
+    data = [[
+        RLParagraph(with_fallback(render_inline(nodes, images, anchors), header_style, fonts), column_styles[index][0])
+        for index, nodes in enumerate(block.header)
+    ]]
+    for row in block.rows:
+        data.append([
+            RLParagraph(with_fallback(render_inline(nodes, images, anchors), cell_style, fonts), column_styles[index][1])
+            for index, nodes in enumerate(row)
+        ])
+
+    table = RLTable(data, colWidths=widths, repeatRows=1, hAlign='LEFT')
+    table.setStyle(styles['table'])
+    return table
+
+
+def build_flowables(blocks, styles, width=None, images=None, anchors=None):
+    """
+    Converte blocos em flowables do ReportLab
+    styles: dict com 'title', 'heading', 'subheading', 'body', 'quote', 'code',
+    'table_header', 'table_cell', 'table' (TableStyle), 'primary_color' e
+    'fonts' (FontSet, opcional) (ver docgen.styles.get_styles)
+    width: largura útil da página (padrão: A4 com margens de 2cm)
+    images: ImageResolver do documento (docgen.images) para as imagens
+    anchors: âncoras do documento que os links internos podem alcançar (ver
+    render_inline); sem elas, links '#âncora' ficam só com o texto
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.platypus import PageBreak, Paragraph as RLParagraph, Spacer
+    from reportlab.platypus.flowables import HRFlowable
+
+    if width is None:
+        width = A4[0] - 4*cm
+    fonts = styles.get('fonts')
+
+    def paragraph(markup, style):
+        return RLParagraph(with_fallback(markup, style, fonts), style)
+
+    elements = []
+    first_section = True
+
+    for block in blocks:
+        if isinstance(block, Heading):
+            text = render_inline(block.children, images, anchors)
+            if block.level == 1:
+                if not first_section:
+                    elements.append(PageBreak())
+                first_section = False
+                heading = paragraph(text, styles['title'])
+                spacer = Spacer(1, 0.3*cm)
+            elif block.level == 2:
+                heading = paragraph(text, styles['heading'])
+                spacer = Spacer(1, 0.2*cm)
+            else:
+                heading = paragraph(f'<b>{text}</b>', styles['subheading'])
+                spacer = None
+            # Lido por TocDocTemplate.afterFlowable (sobrevive ao pickle do cache de seções)
+            heading.toc_entry = TocEntry(block.level, plain_text(block.children), block.anchor)
+            elements.append(heading)
+            if spacer is not None:
+                elements.append(spacer)
+
+        elif isinstance(block, Paragraph):
+            image = None
+            if len(block.children) == 1 and isinstance(block.children[0], Image):
+                image = build_image(block.children[0], images)
+            if image is not None:
+                elements.append(image)
+                elements.append(Spacer(1, 0.3*cm))
+            else:
+                elements.append(paragraph(render_inline(block.children, images, anchors), styles['body']))
+
+        elif isinstance(block, BulletList):
+            for item in block.items:
+                marker = '•' if item.marker in ('-', '*', '+') else item.marker
+                indent = '&nbsp;' * 4 * item.depth
+                elements.append(paragraph(
+                    f'{indent}{marker} {render_inline(item.children, images, anchors)}',
+                    styles['body']
+                ))
+
+        elif isinstance(block, CodeBlock):
+            elements.extend(build_code(block, styles))
+
+        elif isinstance(block, Table):
+            elements.append(build_table(block, styles, width, images, anchors))
+            elements.append(Spacer(1, 0.3*cm))
+
+        elif isinstance(block, Quote):
+            elements.append(paragraph(render_inline(block.children, images, anchors), styles['quote']))
+
+        elif isinstance(block, Rule):
+            elements.append(HRFlowable(width='100%', color=styles['primary_color']))
+
+    return elements
+
+
+def create_doc_template(pdf_file, toc_depth=TOC_DEPTH, fonts=None, **kwargs):
+    """
+    SimpleDocTemplate que registra os títulos marcados por build_flowables:
+    destino com a âncora, entrada nos marcadores do PDF e aviso 'TOCEntry'
+    para o TableOfContents (usar com multiBuild)
+    fonts: FontSet do tema, para o texto das entradas do índice
+    Depois do build, heading_pages tem (TocEntry, página) de cada título
+    """
+    from reportlab.platypus import SimpleDocTemplate
+
+    class TocDocTemplate(SimpleDocTemplate):
+        def beforeDocument(self):
+            # Chamado a cada passada do multiBuild
+            self._outline_level = -1
+            self.heading_pages = []
+
+        def afterFlowable(self, flowable):
+            entry = getattr(flowable, 'toc_entry', None)
+            if entry is None:
+                return
+
+            self.heading_pages.append((entry, self.page))
+            key = entry.anchor or 'titulo'
+            self.canv.bookmarkPage(key)
+            if entry.level <= OUTLINE_DEPTH:
+                # O outline não aceita pular níveis (ex.: doc que começa em '##')
+                level = min(entry.level - 1, self._outline_level + 1)
+                self.canv.addOutlineEntry(entry.text, key, level=level, closed=level > 0)
+                self._outline_level = level
+            if entry.level <= toc_depth:
+                self.notify('TOCEntry', (entry.level - 1, toc_markup(entry, fonts), self.page, key))
+
+    return TocDocTemplate(pdf_file, **kwargs)
+
+
+def toc_markup(entry, fonts=None):
+    """Texto da entrada do índice (níveis 1 em Helvetica-Bold, demais em Helvetica)"""
+    font_name = 'Helvetica-Bold' if entry.level == 1 else 'Helvetica'
+    text = escape_markup(entry.text)
+    return fonts.markup(text, font_name) if fonts is not None else text
+
+
+def create_toc(entries, styles, toc_depth=TOC_DEPTH, pages=None):
+    """
+    TableOfContents já preenchido com os títulos conhecidos do parse
+    Com a altura certa desde a primeira passada, o multiBuild converge em duas
+    pages: página final de cada entrada, quando já é conhecida (PDF montado por
+    partes); o índice sai pronto para um build simples, sem links
+    """
+    from reportlab.platypus.tableofcontents import TableOfContents
+
+    # Estilos do pool (docgen.styles); a lista é copiada porque o TableOfContents
+    # acrescenta nela os estilos de níveis mais profundos
+    toc = TableOfContents(levelStyles=list(styles['toc_levels']), dotsMinLevel=0)
+    if pages is None:
+        toc.addEntries(
+            (entry.level - 1, toc_markup(entry, styles.get('fonts')), 0, entry.anchor or 'titulo')
+            for entry in entries if entry.level <= toc_depth
+        )
+        return toc
+
+    # Os destinos ficam nas partes, outros PDFs: entradas sem chave (sem link)
+    toc.addEntries(
+        (entry.level - 1, toc_markup(entry, styles.get('fonts')), page, None)
+        for entry, page in zip(entries, pages) if entry.level <= toc_depth
+    )
+    # Publica as entradas como se fossem da passada anterior do multiBuild
+    toc.beforeBuild()
+    return toc
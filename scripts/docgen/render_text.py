@@ -0,0 +1,68 @@
+"""
+Back end texto puro: converte a árvore de nós em texto legível (busca, diff, e-mail)
+"""
+
+from .inline import plain_text
+from .nodes import BulletList, CodeBlock, Heading, Paragraph, Quote, Rule, Table
+
+# Sublinhado dos títulos de nível 1 e 2 (estilo setext)
+HEADING_UNDERLINES = {1: '=', 2: '-'}
+RULE_WIDTH = 72
+
+
+def render_table_text(block):
+    """Tabela com colunas alinhadas por espaços"""
+    rows = [[plain_text(cell) for cell in block.header]]
+    rows.extend([plain_text(cell) for cell in row] for row in block.rows)
+    widths = [max(len(row[index]) for row in rows) for index in range(len(block.header))]
+
+    def line(cells):
+        padded = []
+        for text, width, align in zip(cells, widths, block.aligns):
+            if align == 'right':
+                padded.append(text.rjust(width))
+            elif align == 'center':
+                padded.append(text.center(width))
+            else:
+                padded.append(text.ljust(width))
+        return ' | '.join(padded).rstrip()
+
+    lines = [line(rows[0]), '-+-'.join('-' * width for width in widths)]
+    lines.extend(line(row) for row in rows[1:])
+    return '\n'.join(lines)
+
+
+def iter_text(blocks):
+    """Gera o texto de cada bloco do documento"""
+    for block in blocks:
+        if isinstance(block, Heading):
+            text = plain_text(block.children)
+            underline = HEADING_UNDERLINES.get(block.level)
+            yield f'{text}\n{underline * len(text)}' if underline else text
+
+        elif isinstance(block, Paragraph):
+            yield plain_text(block.children)
+
+        elif isinstance(block, BulletList):
+            lines = []
+            for item in block.items:
+                marker = '•' if item.marker in ('-', '*', '+') else item.marker
+                lines.append(f"{'  ' * item.depth}{marker} {plain_text(item.children)}")
+            yield '\n'.join(lines)
+
+        elif isinstance(block, CodeBlock):
+            yield '\n'.join(f'    {line}' for line in block.lines)
+
+        elif isinstance(block, Table):
+            yield render_table_text(block)
+
+        elif isinstance(block, Quote):
+            yield f'> {plain_text(block.children)}'
+
+        elif isinstance(block, Rule):
+            yield '-' * RULE_WIDTH
+
+
+def render_text(blocks):
+    """Texto completo, com uma linha em branco entre blocos"""
+    return '\n\n'.join(iter_text(blocks)) + '\n'
@@ -0,0 +1,207 @@
+"""
+Índice de busca offline dos docs
+Índice invertido com posições, em que cada documento é o trecho sob um título
+(chaveado pela âncora); as postings de cada seção vêm da mesma tokenização
+dos back ends e ficam no cache de seções, então só seções alteradas são
+reprocessadas. A consulta usa apenas o índice, sem reler o markdown
+"""
+
+import json
+import math
+import os
+import re
+import unicodedata
+
+from .metadata import GENERATOR_VERSION
+from .nodes import Heading
+from .render_text import iter_text
+from .sections import load_sections, render_sections
+
+# Versão do formato do índice (incrementar se a estrutura mudar)
+INDEX_VERSION = 1
+SEARCH_KIND = 'search'
+
+TOKEN_PATTERN = re.compile(r'\w+')
+PHRASE_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+# Intervalo de posições entre blocos: frases não atravessam parágrafos/células
+BLOCK_GAP = 2
+
+
+def normalize(text):
+    """Minúsculas e sem acentos ('Validação' e 'validacao' viram o mesmo termo)"""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    """Termos normalizados de um texto, na ordem em que aparecem"""
+    return TOKEN_PATTERN.findall(normalize(text))
+
+
+def section_postings(blocks):
+    """
+    Postings dos blocos de uma seção, um item por título (o preâmbulo tem âncora '')
+    Retorna [(âncora, título, total de termos, {termo: [posições]}), ...]
+    """
+    entries = []
+    anchor, title, terms, position = '', '', {}, 0
+    has_heading = False
+
+    for block in blocks:
+        if isinstance(block, Heading):
+            if terms or has_heading:
+                entries.append((anchor, title, position, terms))
+            anchor, terms, position = block.anchor, {}, 0
+            title = None
+            has_heading = True
+
+        for text in iter_text([block]):
+            if title is None:
+                title = text.split('\n', 1)[0]
+            for term in tokenize(text):
+                terms.setdefault(term, []).append(position)
+                position += 1
+            position += BLOCK_GAP
+
+    if terms or has_heading:
+        entries.append((anchor, title, position, terms))
+    return entries
+
+
+def _encode(positions):
+    # Posições crescentes viram diferenças (números menores no JSON)
+    return [positions[0]] + [b - a for a, b in zip(positions, positions[1:])]
+
+
+def _decode(deltas):
+    positions = []
+    total = 0
+    for delta in deltas:
+        total += delta
+        positions.append(total)
+    return positions
+
+
+def build_index(markdown_files, root, cache=None):
+    """
+    Índice de todos os markdown (caminhos relativos a root)
+    cache: SectionCache compartilhado com os back ends (postings por seção)
+    """
+    docs = []
+    postings = {}
+    for markdown_file in markdown_files:
+        name = os.path.relpath(markdown_file, root).replace(os.sep, '/')
+        sections = load_sections(markdown_file)
+        for entries in render_sections(sections, SEARCH_KIND, '', section_postings, cache):
+            for anchor, title, length, terms in entries:
+                doc = len(docs)
+                docs.append([name, anchor, title, length])
+                for term, positions in terms.items():
+                    postings.setdefault(term, []).append([doc] + _encode(positions))
+
+    return {
+        'version': INDEX_VERSION,
+        'generator': GENERATOR_VERSION,
+        'docs': docs,
+        'terms': {term: postings[term] for term in sorted(postings)},
+    }
+
+
+def write_index(index, index_file):
+    """Grava o índice (JSON compacto); retorna False se o conteúdo não mudou"""
+    data = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    try:
+        with open(index_file, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+
+    os.makedirs(os.path.dirname(os.path.abspath(index_file)), exist_ok=True)
+    tmp_file = f'{index_file}.{os.getpid()}.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_file, index_file)
+    return True
+
+
+def load_index(index_file):
+    """Lê um índice gerado por write_index"""
+    with open(index_file, 'rb') as f:
+        index = json.loads(f.read())
+    if index.get('version') != INDEX_VERSION:
+        raise ValueError(f"Versão do índice incompatível: {index.get('version')} "
+                         f"(esperada {INDEX_VERSION}); gere o índice novamente")
+    return index
+
+
+def parse_query(query):
+    """
+    Cláusulas da consulta: palavras soltas e "frases entre aspas"
+    Cada cláusula é uma lista de termos (palavras como 'e-mail' viram frase)
+    """
+    clauses = []
+    for phrase, word in PHRASE_PATTERN.findall(query):
+        terms = tokenize(phrase or word)
+        if terms:
+            clauses.append(terms)
+    return clauses
+
+
+def _clause_matches(index, terms, decoded):
+    """{doc: ocorrências} dos documentos que contêm a cláusula"""
+    def positions(term):
+        if term not in decoded:
+            decoded[term] = {
+                posting[0]: _decode(posting[1:]) for posting in index['terms'].get(term, ())
+            }
+        return decoded[term]
+
+    first = positions(terms[0])
+    if len(terms) == 1:
+        return {doc: len(found) for doc, found in first.items()}
+
+    # Frase: cada termo seguinte precisa estar na posição seguinte
+    following = [positions(term) for term in terms[1:]]
+    matches = {}
+    for doc, starts in first.items():
+        if not all(doc in postings for postings in following):
+            continue
+        candidates = set(starts)
+        for offset, postings in enumerate(following, 1):
+            candidates &= {position - offset for position in postings[doc]}
+            if not candidates:
+                break
+        if candidates:
+            matches[doc] = len(candidates)
+    return matches
+
+
+def search(index, query, limit=10):
+    """
+    Documentos que contêm todas as cláusulas da consulta, do mais relevante
+    Retorna [(pontuação, [arquivo, âncora, título, total de termos]), ...]
+    """
+    clauses = parse_query(query)
+    if not clauses:
+        return []
+
+    docs = index['docs']
+    decoded = {}
+    scores = None
+    for terms in clauses:
+        matches = _clause_matches(index, terms, decoded)
+        idf = math.log(1 + len(docs) / (1 + len(matches)))
+        clause_scores = {
+            doc: idf * count / math.sqrt(docs[doc][3] or 1) for doc, count in matches.items()
+        }
+        if scores is None:
+            scores = clause_scores
+        else:
+            scores = {doc: score + clause_scores[doc] for doc, score in scores.items() if doc in clause_scores}
+        if not scores:
+            return []
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return [(score, docs[doc]) for doc, score in ranked[:limit]]
@@ -0,0 +1,192 @@
+"""
+Renderização incremental por seção
+O documento é dividido nos títulos '# ' (os mesmos pontos de PageBreak do PDF)
+e '## ' (docs com um único '# ' também ganham seções menores); cada seção é
+tokenizada e renderizada apenas quando seu conteúdo muda. Os títulos (índice e
+âncoras) são coletados na mesma leitura que divide as seções
+"""
+
+import os
+import pickle
+import re
+from urllib.parse import unquote
+
+from .cache import hash_bytes
+from .inline import DESTINATION, parse_inline, plain_text
+from .metadata import GENERATOR_VERSION
+from .parser import HEADING_PATTERN, parse_markdown
+from .profiling import count, stage
+from .toc import PresetSlugger, Slugger, TocEntry
+
+
+# Títulos que iniciam uma nova seção
+SECTION_PREFIXES = ('# ', '## ')
+
+# Links internos ('](#âncora)') de uma seção, para a chave do cache de seções
+INTERNAL_LINK_PATTERN = re.compile(rf'\]\(#({DESTINATION})')
+
+
+class Section:
+    """
+    Trecho do markdown que começa em um título '# '/'## ' (ou o preâmbulo)
+    headings: títulos da seção (TocEntry), com âncoras únicas no documento todo
+    """
+
+    def __init__(self, lines, headings=()):
+        self.source = '\n'.join(lines)
+        self.headings = list(headings)
+        # As âncoras dependem das seções anteriores (repetições): entram na chave
+        anchors = '\n'.join(entry.anchor for entry in self.headings)
+        self.key = hash_bytes(f'{self.source}\0{anchors}'.encode('utf-8'))
+        self.is_chapter = lines[0].startswith('# ')
+        self._blocks = None
+
+    @property
+    def blocks(self):
+        """Blocos da seção, tokenizados somente no primeiro acesso"""
+        if self._blocks is None:
+            with stage('tokenize'):
+                slugger = PresetSlugger(entry.anchor for entry in self.headings)
+                self._blocks = parse_markdown(self.source, slugger).blocks
+            count('blocks', len(self._blocks))
+        return self._blocks
+
+
+def split_sections(lines):
+    """
+    Divide as linhas em seções nos títulos '# '/'## ' fora de blocos de código
+    e coleta todos os títulos do documento (mesmas regras do tokenizador)
+    """
+    sections = []
+    current = []
+    headings = []
+    slugger = Slugger()
+    in_code = False
+
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line.startswith('```'):
+            in_code = not in_code
+        elif not in_code and line.startswith('#'):
+            if line.startswith(SECTION_PREFIXES) and current:
+                sections.append(Section(current, headings))
+                current = []
+                headings = []
+            match = HEADING_PATTERN.match(line)
+            if match:
+                text = plain_text(parse_inline(match.group(2).strip()))
+                headings.append(TocEntry(len(match.group(1)), text, slugger(text)))
+        current.append(line)
+
+    if current:
+        sections.append(Section(current, headings))
+    return sections
+
+
+def load_sections(markdown_file):
+    """Lê um arquivo markdown e o divide em seções"""
+    with stage('read'):
+        with open(markdown_file, 'r', encoding='utf-8') as f:
+            sections = split_sections(f)
+    count('lines', sum(section.source.count('\n') + 1 for section in sections))
+    count('sections', len(sections))
+    return sections
+
+
+def sections_blocks(sections):
+    """Todos os blocos das seções, em ordem"""
+    return [block for section in sections for block in section.blocks]
+
+
+def sections_toc(sections):
+    """Títulos do documento, em ordem (sem tokenizar as seções)"""
+    return [entry for section in sections for entry in section.headings]
+
+
+class SectionCache:
+    """
+    Cache de fragmentos renderizados por seção, em memória e opcionalmente em disco
+    kind identifica o back end ('html', 'flowables'); context, os estilos usados
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.memory = {}
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + '.pickle')
+
+    def get(self, key):
+        """Valor em cache (sempre uma cópia nova) ou None"""
+        data = self.memory.get(key)
+        if data is None and self.cache_dir:
+            try:
+                with open(self._path(key), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                return None
+            self.memory[key] = data
+        if data is None:
+            return None
+        try:
+            # Flowables são mutados no layout; cada build recebe objetos novos
+            return pickle.loads(data)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+    def put(self, key, value):
+        """Guarda o valor; valores não serializáveis simplesmente não são cacheados"""
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        self.memory[key] = data
+        if not self.cache_dir:
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_file = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, path)
+
+
+def render_sections(sections, kind, context, render, cache=None, images=None, anchors=None):
+    """
+    Renderiza cada seção com render(blocks), reaproveitando o cache
+    images: ImageResolver usado por render; as rendições das imagens da seção
+    entram na chave (imagem alterada invalida o fragmento)
+    anchors: âncoras do documento usadas por render nos links internos; as que
+    os links da seção alcançam entram na chave (título criado ou renomeado em
+    outra seção invalida o fragmento que aponta para ele)
+    Retorna a lista de resultados na ordem das seções
+    """
+    results = []
+    for section in sections:
+        if cache is None:
+            results.append(render(section.blocks))
+            continue
+
+        parts = [GENERATOR_VERSION, kind, context, section.key]
+        if images is not None and '![' in section.source:
+            parts.append(images.fingerprint(section.source))
+        if anchors is not None and '](#' in section.source:
+            targets = {unquote(target) for target in INTERNAL_LINK_PATTERN.findall(section.source)}
+            parts.append('#' + '\n'.join(sorted(targets & anchors)))
+        key = hash_bytes('\0'.join(parts).encode('utf-8'))
+        value = cache.get(key)
+        if value is None:
+            cache.misses += 1
+            count(f'{kind}_sections_rendered')
+            value = render(section.blocks)
+            cache.put(key, value)
+        else:
+            cache.hits += 1
+            count(f'{kind}_sections_cached')
+        results.append(value)
+    return results
@@ -0,0 +1,278 @@
+"""
+Servidor local de pré-visualização dos docs (--serve)
+Cada página (HTML, PDF) é renderizada no primeiro acesso e guardada em um
+cache LRU em memória; a cada pedido só o stat() do markdown é conferido, e o
+conteúdo só é relido (e re-hasheado) quando mtime/tamanho mudam. As respostas
+levam ETag (304 para quem já tem a versão) e gzip para texto. As renderizações
+são serializadas (ReportLab não é thread-safe); páginas em cache são servidas
+em paralelo pelas threads do servidor
+"""
+
+import gzip
+import os
+import posixpath
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from .cache import hash_bytes
+from .render_html import escape_html
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+
+# Páginas mantidas em memória (HTML e PDF de cada doc contam separadamente)
+CACHE_ENTRIES = 64
+
+# Tipos que vale a pena comprimir (o PDF do ReportLab já sai comprimido)
+COMPRESSIBLE_TYPES = ('text/', 'application/json')
+GZIP_LEVEL = 6
+
+STATIC_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.json': 'application/json',
+}
+
+# Renderizador de um formato: tipo MIME e função markdown_file -> bytes
+Renderer = namedtuple('Renderer', 'content_type render')
+
+# Página em cache: stat e hash da origem, corpo (e versão gzip) e ETag
+Page = namedtuple('Page', 'mtime size source_hash body gzip_body etag content_type')
+
+
+class PageCache:
+    """
+    Cache LRU de páginas renderizadas, por (markdown, formato)
+    Válido enquanto mtime/tamanho do markdown não mudam; se mudarem mas o
+    conteúdo (hash) for o mesmo, a página é reaproveitada sem renderizar
+    """
+
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.pages = OrderedDict()
+        self.lock = threading.Lock()
+        self.render_lock = threading.Lock()
+        self.hits = 0
+        self.renders = 0
+
+    def _lookup(self, key, st):
+        with self.lock:
+            page = self.pages.get(key)
+            if page is not None and (page.mtime, page.size) == (st.st_mtime_ns, st.st_size):
+                self.pages.move_to_end(key)
+                self.hits += 1
+                return page
+        return None
+
+    def _store(self, key, page):
+        with self.lock:
+            self.pages[key] = page
+            self.pages.move_to_end(key)
+            while len(self.pages) > self.max_entries:
+                self.pages.popitem(last=False)
+
+    def get(self, markdown_file, fmt, renderer):
+        """Página atual do markdown no formato pedido (renderizada se preciso)"""
+        key = (markdown_file, fmt)
+        page = self._lookup(key, os.stat(markdown_file))
+        if page is not None:
+            return page
+
+        # Uma renderização por vez; quem esperou pode encontrar a página pronta
+        with self.render_lock:
+            st = os.stat(markdown_file)
+            page = self._lookup(key, st)
+            if page is not None:
+                return page
+
+            with open(markdown_file, 'rb') as f:
+                source_hash = hash_bytes(f.read())
+            with self.lock:
+                previous = self.pages.get(key)
+            if previous is not None and previous.source_hash == source_hash:
+                # Só o mtime mudou (ex.: touch, checkout): mesmo conteúdo
+                page = previous._replace(mtime=st.st_mtime_ns, size=st.st_size)
+            else:
+                page = make_page(renderer.render(markdown_file), renderer.content_type,
+                                 st, source_hash)
+                self.renders += 1
+            self._store(key, page)
+            return page
+
+
+def make_page(body, content_type, st=None, source_hash=None):
+    """Page com ETag (hash do corpo) e versão gzip quando o tipo comprime"""
+    gzip_body = None
+    if content_type.startswith(COMPRESSIBLE_TYPES):
+        gzip_body = gzip.compress(body, GZIP_LEVEL, mtime=0)
+    return Page(
+        st.st_mtime_ns if st else 0, st.st_size if st else 0, source_hash,
+        body, gzip_body, f'"{hash_bytes(body)[:32]}"', content_type,
+    )
+
+
+def index_page(docs_dir, markdown_files, formats, title):
+    """Página inicial com os docs e os formatos disponíveis"""
+    items = []
+    for markdown_file in markdown_files:
+        name = os.path.relpath(markdown_file, docs_dir).replace(os.sep, '/')
+        base = escape_html(name[:-len('.md')])
+        links = ' · '.join(f'<a href="/{base}{fmt}">{fmt[1:].upper()}</a>' for fmt in formats)
+        items.append(f'<li><strong>{escape_html(name)}</strong> — {links}</li>')
+    return (
+        '<!DOCTYPE html>\n<html lang="pt-BR">\n<head>\n<meta charset="UTF-8">\n'
+        f'<title>{escape_html(title)}</title>\n'
+        '<style>body { font-family: sans-serif; max-width: 820px; margin: 40px auto; color: #1F130C; }'
+        ' a { color: #8E3B12; } li { margin: 6px 0; }</style>\n'
+        f'</head>\n<body>\n<h1>{escape_html(title)}</h1>\n<ul>\n' + '\n'.join(items) + '\n</ul>\n</body>\n</html>\n'
+    ).encode('utf-8')
+
+
+class DocsServer(ThreadingHTTPServer):
+    """
+    Servidor HTTP dos docs de docs_dir
+    renderers: {extensão ('.html', '.pdf'): Renderer}
+    static_root: diretório espelhado nas URLs para os arquivos em pastas static_names
+    (ex.: images/ exportadas ao lado dos HTML)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, docs_dir, renderers, static_root=None, static_names=('images',),
+                 title='Documentação'):
+        super().__init__(address, DocsRequestHandler)
+        self.docs_dir = os.path.abspath(docs_dir)
+        self.renderers = renderers
+        self.static_root = os.path.abspath(static_root) if static_root else None
+        self.static_names = frozenset(static_names)
+        self.title = title
+        self.cache = PageCache()
+        self.static = PageCache()
+
+    def markdown_for(self, path):
+        """(markdown, formato) de uma URL /nome.html, ou None"""
+        base, fmt = posixpath.splitext(path)
+        if fmt not in self.renderers:
+            return None
+        markdown_file = _inside(self.docs_dir, base + '.md')
+        if markdown_file is None or not os.path.isfile(markdown_file):
+            return None
+        return markdown_file, fmt
+
+    def static_for(self, path):
+        """Arquivo estático de uma URL .../images/arquivo, ou None"""
+        parts = path.strip('/').split('/')
+        if self.static_root is None or len(parts) < 2 or parts[-2] not in self.static_names:
+            return None
+        file_path = _inside(self.static_root, path)
+        return file_path if file_path is not None and os.path.isfile(file_path) else None
+
+
+def _inside(root, path):
+    # Caminho da URL dentro de root; None para ../, ocultos e afins
+    if any(part.startswith('.') for part in path.split('/') if part):
+        return None
+    file_path = os.path.normpath(os.path.join(root, path.lstrip('/')))
+    if os.path.commonpath([file_path, root]) != root:
+        return None
+    return file_path
+
+
+class DocsRequestHandler(BaseHTTPRequestHandler):
+    """GET/HEAD das páginas, com ETag/304 e gzip"""
+
+    server_version = 'docgen'
+    # Tempo até ter a página do pedido atual (ms), mostrado no log
+    elapsed = None
+
+    def do_HEAD(self):
+        self.handle_get(send_body=False)
+
+    def do_GET(self):
+        self.handle_get(send_body=True)
+
+    def handle_get(self, send_body):
+        start = time.perf_counter()
+        path = unquote(urlsplit(self.path).path)
+        try:
+            page = self.find_page(path)
+        except Exception as e:
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f'Erro ao renderizar: {e}')
+            print(f"✗ {path}: {e}", file=sys.stderr)
+            return
+        self.elapsed = (time.perf_counter() - start) * 1000
+        if page is None:
+            self.send_error(HTTPStatus.NOT_FOUND, 'Página não encontrada')
+            return
+
+        if page.etag in self.headers.get('If-None-Match', ''):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', page.etag)
+            self.end_headers()
+            return
+
+        body = page.body
+        accepts_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', page.content_type)
+        if page.gzip_body is not None:
+            self.send_header('Vary', 'Accept-Encoding')
+            if accepts_gzip:
+                body = page.gzip_body
+                self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', page.etag)
+        # Sempre revalida: o navegador pergunta e recebe 304 enquanto o doc não mudar
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def find_page(self, path):
+        server = self.server
+        if path in ('/', '/index.html'):
+            from .batch import find_markdown_files
+            return make_page(index_page(server.docs_dir, find_markdown_files(server.docs_dir),
+                                        list(server.renderers), server.title), 'text/html; charset=utf-8')
+
+        found = server.markdown_for(path)
+        if found is not None:
+            markdown_file, fmt = found
+            return server.cache.get(markdown_file, fmt, server.renderers[fmt])
+
+        file_path = server.static_for(path)
+        if file_path is not None:
+            content_type = STATIC_TYPES.get(os.path.splitext(file_path)[1].lower(), 'application/octet-stream')
+            return server.static.get(file_path, 'static', Renderer(content_type, _read_file))
+        return None
+
+    def log_message(self, format, *args):
+        suffix = f' ({self.elapsed:.1f} ms)' if self.elapsed is not None else ''
+        print(f"ℹ {self.address_string()} {format % args}{suffix}", file=sys.stderr)
+
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def serve(docs_dir, renderers, host=DEFAULT_HOST, port=DEFAULT_PORT, static_root=None, title='Documentação'):
+    """Serve os docs até Ctrl+C (ver DocsServer)"""
+    server = DocsServer((host, port), docs_dir, renderers, static_root, title=title)
+    formats = ', '.join(fmt[1:].upper() for fmt in renderers)
+    print(f"🌐 Servindo {docs_dir} ({formats}) em http://{host}:{server.server_address[1]}/ - Ctrl+C para sair")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+        print(f"ℹ Servidor encerrado ({server.cache.renders} renderização(ões), "
+              f"{server.cache.hits} acerto(s) no cache)")
+    finally:
+        server.server_close()
+    return True
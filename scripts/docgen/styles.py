@@ -0,0 +1,210 @@
+"""
+Pool de estilos do ReportLab, por tema
+Cada estilo da marca é criado uma única vez por processo e reutilizado por
+todos os documentos (batch, watch) em vez de ser recriado a cada build; as
+fontes do tema (docgen.fonts) são registradas junto com os estilos
+"""
+
+from functools import lru_cache
+
+from .fonts import load_fonts
+
+# Temas disponíveis (o tema faz parte da chave do cache de build)
+THEMES = {
+    'bota-love': {
+        'primary': '#F9A825',
+        'secondary': '#502914',
+        'text': '#1F130C',
+        'light_bg': '#FFF9E6',
+        'grid': '#E0E0E0',
+        'title_size': 24,
+        'heading_size': 14,
+        'subheading_size': 12,
+        'body_size': 11,
+        'code_size': 8,
+        'table_size': 9,
+        # Fontes da marca (assets/fonts); o corpo segue em Helvetica. Subtítulos e
+        # cabeçalhos de tabela ficam em Helvetica-Bold: o MontserratCondensed-SemiBold.ttf
+        # do repositório é uma página HTML, não um TTF
+        'title_font': 'Montserrat-ExtraBold',
+        'heading_font': 'Montserrat-ExtraBold',
+        'font_files': {
+            'Montserrat-ExtraBold': 'Montserrat-ExtraBold.ttf',
+        },
+    },
+}
+
+DEFAULT_THEME = 'bota-love'
+
+_STYLE_POOL = {}
+
+
+def get_theme(name=DEFAULT_THEME):
+    """Configuração do tema pelo nome"""
+    try:
+        return THEMES[name]
+    except KeyError:
+        raise ValueError(f"Tema desconhecido: {name} (disponíveis: {', '.join(THEMES)})")
+
+
+def get_styles(name=DEFAULT_THEME, font_cache_dir=None):
+    """
+    Estilos do tema (dict no formato esperado por build_flowables)
+    Criados no primeiro uso e compartilhados pelo resto do processo
+    font_cache_dir: cache das tabelas/subconjuntos das fontes (docgen.fonts)
+    """
+    styles = _STYLE_POOL.get(name)
+    if styles is None:
+        styles = _STYLE_POOL[name] = _create_styles(get_theme(name), font_cache_dir)
+    return styles
+
+
+@lru_cache(maxsize=None)
+def aligned_style(style, align):
+    """Variante de um estilo do pool com outro alinhamento ('center'/'right')"""
+    from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+    from reportlab.lib.styles import ParagraphStyle
+
+    alignments = {'center': TA_CENTER, 'right': TA_RIGHT}
+    if align not in alignments:
+        return style
+    return ParagraphStyle(f'{style.name}-{align}', parent=style, alignment=alignments[align])
+
+
+@lru_cache(maxsize=None)
+def code_chunk_style(style, position):
+    """
+    Variante do estilo de código para um trecho de bloco dividido ('first',
+    'middle', 'last'): sem espaço nem padding nas emendas, o fundo fica contínuo
+    """
+    from reportlab.lib.styles import ParagraphStyle
+
+    padding = style.borderPadding
+    top = padding if position == 'first' else 0
+    bottom = padding if position == 'last' else 0
+    return ParagraphStyle(
+        f'{style.name}-{position}', parent=style,
+        spaceBefore=style.spaceBefore if position == 'first' else 0,
+        spaceAfter=style.spaceAfter if position == 'last' else 0,
+        borderPadding=(top, padding, bottom, padding),
+    )
+
+
+def _create_styles(theme, font_cache_dir=None):
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_JUSTIFY
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.platypus import TableStyle
+
+    # Cores da marca
+    primary_color = colors.HexColor(theme['primary'])
+    secondary_color = colors.HexColor(theme['secondary'])
+    text_color = colors.HexColor(theme['text'])
+    light_bg = colors.HexColor(theme['light_bg'])
+
+    sample = getSampleStyleSheet()
+    fonts = load_fonts(theme, font_cache_dir)
+
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=sample['Heading1'],
+        fontSize=theme['title_size'],
+        textColor=secondary_color,
+        spaceAfter=12,
+        fontName=fonts.names['title']
+    )
+
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=sample['Heading2'],
+        fontSize=theme['heading_size'],
+        textColor=secondary_color,
+        spaceAfter=10,
+        spaceBefore=10,
+        fontName=fonts.names['heading']
+    )
+
+    subheading_style = ParagraphStyle(
+        'SubHeading',
+        parent=sample['Normal'],
+        fontSize=theme['subheading_size'],
+        textColor=secondary_color,
+        spaceAfter=6,
+        fontName=fonts.names['subheading']
+    )
+
+    body_style = ParagraphStyle(
+        'CustomBody',
+        parent=sample['BodyText'],
+        fontSize=theme['body_size'],
+        textColor=text_color,
+        alignment=TA_JUSTIFY,
+        spaceAfter=10
+    )
+
+    quote_style = ParagraphStyle(
+        'CustomQuote',
+        parent=body_style,
+        fontName='Helvetica-Oblique',
+        textColor=colors.HexColor('#663C23'),
+        leftIndent=12
+    )
+
+    code_style = ParagraphStyle(
+        'CustomCode',
+        parent=sample['Code'],
+        fontSize=theme['code_size'],
+        leading=theme['code_size'] + 2,
+        textColor=text_color,
+        backColor=light_bg,
+        borderPadding=6,
+        spaceBefore=6,
+        spaceAfter=10
+    )
+
+    table_cell_style = ParagraphStyle(
+        'TableCell',
+        parent=sample['BodyText'],
+        fontSize=theme['table_size'],
+        leading=theme['table_size'] + 3,
+        textColor=text_color
+    )
+
+    table_header_style = ParagraphStyle(
+        'TableHeader',
+        parent=table_cell_style,
+        fontName=fonts.names['table_header'],
+        textColor=colors.white
+    )
+
+    # Níveis do índice (TableOfContents): capítulos em negrito, seções recuadas
+    toc_level_styles = (
+        ParagraphStyle('TOCLevel0', parent=body_style, fontName='Helvetica-Bold', leftIndent=0,
+                       firstLineIndent=0, spaceBefore=4, spaceAfter=0, alignment=0),
+        ParagraphStyle('TOCLevel1', parent=body_style, leftIndent=16, firstLineIndent=0,
+                       spaceBefore=0, spaceAfter=0, alignment=0),
+    )
+
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), primary_color),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, light_bg]),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor(theme['grid'])),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 6),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+    ])
+
+    return {
+        'title': title_style,
+        'heading': heading_style,
+        'subheading': subheading_style,
+        'body': body_style,
+        'quote': quote_style,
+        'code': code_style,
+        'table_header': table_header_style,
+        'table_cell': table_cell_style,
+        'table': table_style,
+        'toc_levels': toc_level_styles,
+        'primary_color': primary_color,
+        'fonts': fonts,
+    }
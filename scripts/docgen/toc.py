@@ -0,0 +1,64 @@
+"""
+Índice (TOC) e âncoras dos títulos
+As âncoras seguem o formato do GitHub (os docs já linkam #1-visão-geral) e são
+únicas no documento inteiro; os títulos são coletados na mesma leitura que
+divide o documento em seções, sem reler nem tokenizar o arquivo de novo
+"""
+
+import unicodedata
+from collections import namedtuple
+
+from .inline import plain_text
+from .nodes import Heading
+
+# Níveis incluídos no índice (como --toc-depth=2 do pandoc)
+TOC_DEPTH = 2
+
+
+# Título coletado para o índice: nível, texto puro e âncora
+TocEntry = namedtuple('TocEntry', 'level text anchor')
+
+
+def slugify(text):
+    """Âncora no formato do GitHub: minúsculas, sem pontuação/emoji, espaços viram '-'"""
+    chars = []
+    for char in text.strip().lower():
+        if char == ' ':
+            chars.append('-')
+        elif char in '-_' or unicodedata.category(char)[0] in 'LMN':
+            chars.append(char)
+    return ''.join(chars)
+
+
+class Slugger:
+    """Gera âncoras únicas no documento; repetições ganham sufixo -1, -2... (como no GitHub)"""
+
+    def __init__(self):
+        self.occurrences = {}
+
+    def __call__(self, text):
+        original = slug = slugify(text)
+        while slug in self.occurrences:
+            self.occurrences[original] += 1
+            slug = f'{original}-{self.occurrences[original]}'
+        self.occurrences[slug] = 0
+        return slug
+
+
+class PresetSlugger:
+    """Reaplica âncoras já calculadas para o documento (seções tokenizadas isoladamente)"""
+
+    def __init__(self, anchors):
+        self._anchors = iter(anchors)
+
+    def __call__(self, text):
+        anchor = next(self._anchors, None)
+        return slugify(text) if anchor is None else anchor
+
+
+def toc_entries(blocks):
+    """Títulos de uma lista de blocos já tokenizada"""
+    return [
+        TocEntry(block.level, plain_text(block.children), block.anchor)
+        for block in blocks if isinstance(block, Heading)
+    ]
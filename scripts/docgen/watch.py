@@ -0,0 +1,178 @@
+"""
+Modo watch: observa arquivos markdown (ou diretórios inteiros) e avisa quando mudam
+Usa inotify no Linux (via ctypes, sem dependências) e cai para polling de
+stat() nos demais sistemas; rajadas de eventos (salvar várias vezes, editores
+que gravam em arquivo temporário e renomeiam) viram uma única notificação
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# Intervalo sem eventos antes de considerar a rajada encerrada (segundos)
+DEFAULT_DEBOUNCE = 0.15
+DEFAULT_POLL_INTERVAL = 0.5
+
+# Eventos do inotify que indicam conteúdo novo (ver inotify(7))
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+EVENT_HEADER = struct.Struct('iIII')
+
+# Arquivos observados nos diretórios inteiros
+WATCHED_SUFFIX = '.md'
+
+
+class WatchedPaths:
+    """
+    Arquivos que interessam: os informados e, nos diretórios observados,
+    qualquer *.md (inclusive os criados depois do início)
+    """
+
+    def __init__(self, files=(), directories=(), suffix=WATCHED_SUFFIX):
+        self.files = {os.path.abspath(f) for f in files}
+        self.directories = {os.path.abspath(d) for d in directories}
+        self.suffix = suffix
+
+    def __contains__(self, path):
+        return path in self.files or (
+            path.endswith(self.suffix) and os.path.dirname(path) in self.directories
+        )
+
+    def watched_dirs(self):
+        """Diretórios a observar (os dos arquivos e os inteiros)"""
+        return sorted({os.path.dirname(f) for f in self.files} | self.directories)
+
+
+class InotifyWatcher:
+    """Observa com inotify os diretórios dos arquivos (e os diretórios inteiros pedidos)"""
+
+    name = 'inotify'
+
+    def __init__(self, files=(), directories=()):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.watched = WatchedPaths(files, directories)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 falhou')
+
+        self.dirs = {}
+        for directory in self.watched.watched_dirs():
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f'inotify_add_watch falhou: {directory}')
+            self.dirs[wd] = directory
+
+    def wait(self, timeout=None):
+        """Arquivos observados que mudaram, esperando no máximo timeout segundos"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        data = os.read(self.fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            path = os.path.join(self.dirs.get(wd, ''), name)
+            if path in self.watched:
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """
+    Alternativa portátil: compara mtime/tamanho dos arquivos periodicamente
+    Os diretórios inteiros são relistados a cada verificação (arquivos novos)
+    """
+
+    name = 'polling'
+
+    def __init__(self, files=(), directories=(), interval=DEFAULT_POLL_INTERVAL):
+        self.watched = WatchedPaths(files, directories)
+        self.interval = interval
+        self.stats = {path: self._stat(path) for path in self._paths()}
+
+    def _paths(self):
+        paths = set(self.watched.files)
+        for directory in self.watched.directories:
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            paths.update(os.path.join(directory, name) for name in names if name.endswith(self.watched.suffix))
+        return paths
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def wait(self, timeout=None):
+        """Arquivos que mudaram desde a última verificação"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            # Também os que sumiram da listagem (removidos ou renomeados)
+            for path in sorted(self._paths() | set(self.stats)):
+                current = self._stat(path)
+                if current != self.stats.get(path):
+                    self.stats[path] = current
+                    changed.add(path)
+            if changed:
+                return changed
+
+            if deadline is None:
+                time.sleep(self.interval)
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+def create_watcher(files=(), polling=False, directories=()):
+    """
+    inotify quando disponível; senão (ou com polling=True) verificação periódica
+    directories: observados por inteiro (todos os *.md, não recursivo)
+    """
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(files, directories)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(files, directories)
+
+
+def watch_changes(watcher, debounce=DEFAULT_DEBOUNCE):
+    """
+    Gera conjuntos de arquivos alterados, um por rajada de eventos
+    A rajada termina quando passam `debounce` segundos sem evento novo
+    """
+    while True:
+        changed = watcher.wait()
+        while True:
+            more = watcher.wait(debounce)
+            if not more:
+                break
+            changed |= more
+        yield changed
@@ -4,54 +4,45 @@ Gerador de PDF para Documentação Técnica do Bota Love App
 Cria um documento profissional com estrutura completa
 """
 
+import argparse
+import io
 import os
 import sys
-from datetime import datetime
+import time
 
-def generate_pdf():
-    """Gera PDF da documentação técnica"""
-    
-    # Caminhos
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    docs_dir = os.path.join(os.path.dirname(script_dir), 'docs')
-    markdown_file = os.path.join(docs_dir, 'VALIDACAO_TECNICA.md')
-    html_file = os.path.join(docs_dir, 'DOCUMENTACAO_VALIDACAO_BOTA_LOVE_APP.html')
-    
-    if not os.path.exists(markdown_file):
-        print(f"✗ Arquivo não encontrado: {markdown_file}")
-        return False
-    
-    print("📄 Convertendo Markdown para HTML...")
-    
-    # Ler arquivo markdown
-    with open(markdown_file, 'r', encoding='utf-8') as f:
-        md_content = f.read()
-    
-    # Converter markdown para HTML
-    html_content = markdown_to_html(md_content)
-    
-    # Salvar HTML
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    print(f"✓ HTML gerado: {html_file}")
-    print()
-    print("Para converter para PDF, abra o arquivo HTML em um navegador e use:")
-    print("  • Google Chrome: Ctrl+P > Salvar como PDF")
-    print("  • Firefox: Ctrl+P > Salvar como PDF")
-    print("  • Safari: Ctrl+P > Salvar como PDF")
-    print()
-    
-    return True
+from docgen import parse_markdown, stream_html, write_chunks
+from docgen.backends import module_available
+from docgen.cache import BuildCache, build_context
+from docgen.highlight import highlight_css
+from docgen.images import HTML_DPI, SCREEN_DPI, ImageResolver, get_image_cache
+from docgen.metadata import format_long_date, format_short_date, resolve_build_date
+from docgen.profiling import profiling, stage
+from docgen.render_html import iter_html, render_toc_html
+from docgen.sections import SectionCache, load_sections, render_sections, sections_toc
+from docgen.toc import Slugger, toc_entries
 
-def markdown_to_html(md_content):
-    """Converte conteúdo markdown para HTML formatado"""
-    
-    lines = md_content.split('\n')
-    html_lines = []
-    
-    # Cabeçalho HTML
-    html_lines.append('''<!DOCTYPE html>
+# Caminhos padrão
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DOCS_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), 'docs')
+DEFAULT_MARKDOWN = os.path.join(DOCS_DIR, 'VALIDACAO_TECNICA.md')
+DEFAULT_HTML = os.path.join(DOCS_DIR, 'DOCUMENTACAO_VALIDACAO_BOTA_LOVE_APP.html')
+MANIFEST_FILE = os.path.join(DOCS_DIR, '.docgen-manifest.json')
+SECTION_CACHE_DIR = os.path.join(DOCS_DIR, '.docgen-cache', 'sections')
+IMAGE_CACHE_DIR = os.path.join(DOCS_DIR, '.docgen-cache', 'images')
+PROFILE_FILE = os.path.join(DOCS_DIR, 'build', 'profile.json')
+BUILD_DIR = os.path.join(DOCS_DIR, 'build')
+# Pasta espelhada pelo servidor --serve (as imagens das páginas são exportadas nela)
+SERVE_DIR = BUILD_DIR
+# Endereço padrão do --serve (docgen.serve só é importado nesse modo)
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+
+# Largura útil da página (max-width do body menos o padding) e pasta das imagens
+HTML_CONTENT_WIDTH = 820
+HTML_IMAGE_DIR = 'images'
+
+# Cabeçalho e estilos do documento (parte da chave do cache de build)
+HTML_HEAD = '''<!DOCTYPE html>
 <html lang="pt-BR">
 <head>
     <meta charset="UTF-8">
@@ -194,7 +185,6 @@ def markdown_to_html(md_content):
             margin: 15px 0;
             font-size: 11px;
             line-height: 1.4;
-            page-break-inside: avoid;
         }
         
         pre code {
@@ -203,6 +193,8 @@ def markdown_to_html(md_content):
             color: #1F130C;
         }
         
+        /* Realce de sintaxe (docgen.highlight) */
+''' + highlight_css(indent=' ' * 8) + '''        
         /* Blockquote */
         blockquote {
             border-left: 4px solid #F9A825;
@@ -238,6 +230,13 @@ def markdown_to_html(md_content):
             background: #FFF9E6;
         }
         
+        /* Imagens */
+        img {
+            max-width: 100%;
+            height: auto;
+            vertical-align: middle;
+        }
+        
         /* Linha horizontal */
         hr {
             border: none;
@@ -264,6 +263,15 @@ def markdown_to_html(md_content):
             margin: 0;
         }
         
+        .toc ul ul {
+            margin-left: 20px;
+        }
+        
+        .toc a {
+            color: #502914;
+            border-bottom: none;
+        }
+        
         .toc li {
             margin: 8px 0;
             color: #502914;
@@ -323,132 +331,420 @@ def markdown_to_html(md_content):
                 page-break-after: avoid;
             }
             
-            table, ul, ol, pre {
+            table, ul, ol {
                 page-break-inside: avoid;
             }
+            
+            /* Blocos longos continuam na página seguinte, sem linhas soltas */
+            pre {
+                orphans: 3;
+                widows: 3;
+            }
         }
     </style>
 </head>
 <body>
-''')
+'''
+
+def html_context(build_date):
+    """Contexto de cache da saída HTML"""
+    return build_context('html', HTML_HEAD, resolve_build_date(build_date))
+
+def html_images(markdown_file, html_file=None):
+    """
+    Imagens do markdown redimensionadas para a página (rendições em cache)
+    Com html_file, são copiadas para images/ ao lado dele e linkadas por caminho relativo
+    """
+    export_dir = None
+    if html_file is not None:
+        export_dir = os.path.join(os.path.dirname(os.path.abspath(html_file)), HTML_IMAGE_DIR)
+    return ImageResolver(
+        get_image_cache(IMAGE_CACHE_DIR), os.path.dirname(os.path.abspath(markdown_file)),
+        HTML_CONTENT_WIDTH, dpi=HTML_DPI, unit_dpi=SCREEN_DPI, export_dir=export_dir,
+    )
+
+def html_pdf_context(build_date):
+    """Contexto de cache do PDF gerado a partir do HTML (mesmo do back end weasyprint)"""
+    return build_context('weasyprint', HTML_HEAD, resolve_build_date(build_date))
+
+def generate_pdf(markdown_file=DEFAULT_MARKDOWN, html_file=DEFAULT_HTML, build_date=None, cache=None,
+                 section_cache=None, verbose=True, pdf_file=None):
+    """
+    Gera o HTML da documentação técnica e, com pdf_file, também o PDF
+    (verbose=False: só erros, usado no modo watch)
+    """
+    
+    if not os.path.exists(markdown_file):
+        print(f"✗ Arquivo não encontrado: {markdown_file}")
+        return False
+    
+    build_date = resolve_build_date(build_date)
+    context = html_context(build_date)
+    pdf_context = html_pdf_context(build_date)
+    
+    html_fresh = cache is not None and cache.is_fresh(markdown_file, html_file, context)
+    pdf_fresh = pdf_file is None or (cache is not None and cache.is_fresh(markdown_file, pdf_file, pdf_context))
+    
+    if html_fresh and pdf_fresh:
+        if verbose:
+            print(f"✓ HTML já atualizado (cache): {html_file}")
+        return True
+    
+    if not html_fresh:
+        if verbose:
+            print("📄 Convertendo Markdown para HTML...")
+        
+        # Ler e converter markdown para HTML (apenas as seções alteradas são renderizadas)
+        sections = load_sections(markdown_file)
+        
+        # Salvar HTML (os fragmentos são escritos à medida que são gerados)
+        with open(html_file, 'w', encoding='utf-8') as f:
+            write_sections_html(f, sections, build_date, section_cache, html_images(markdown_file, html_file))
+        
+        if cache is not None:
+            cache.record(markdown_file, html_file, context)
+        
+        if verbose:
+            print(f"✓ HTML gerado: {html_file}")
+    elif verbose:
+        print(f"✓ HTML já atualizado (cache): {html_file}")
+    
+    if not pdf_fresh:
+        if not module_available('weasyprint'):
+            print("⚠ WeasyPrint não instalado: PDF não gerado (pip install weasyprint)")
+            pdf_file = None
+        else:
+            from docgen.html_pdf import html_file_to_pdf
+            
+            if verbose:
+                print("📕 Convertendo HTML para PDF (CSS de impressão)...")
+            try:
+                with stage('layout'):
+                    html_file_to_pdf(html_file, pdf_file)
+            except Exception as e:
+                # Ex.: WeasyPrint instalado sem as bibliotecas do sistema (Pango)
+                print(f"⚠ Erro com WeasyPrint: {e}")
+                pdf_file = None
+            else:
+                if cache is not None:
+                    cache.record(markdown_file, pdf_file, pdf_context)
+                if verbose:
+                    print(f"✓ PDF gerado: {pdf_file}")
+    
+    if cache is not None:
+        cache.save()
+    
+    if not verbose or pdf_file:
+        return True
+    
+    print()
+    print("Para converter para PDF, abra o arquivo HTML em um navegador e use:")
+    print("  • Google Chrome: Ctrl+P > Salvar como PDF")
+    print("  • Firefox: Ctrl+P > Salvar como PDF")
+    print("  • Safari: Ctrl+P > Salvar como PDF")
+    print("  (ou gere direto com --pdf, usando o WeasyPrint)")
+    print()
+    
+    return True
+
+def markdown_to_html(md_content, build_date=None):
+    """Converte conteúdo markdown para HTML formatado"""
+    return document_to_html(parse_markdown(md_content), build_date)
+
+def document_to_html(document, build_date=None):
+    """Converte um documento já tokenizado para HTML formatado"""
+    return render_page(iter_html(document.blocks), build_date, toc_entries(document.blocks))
+
+def sections_to_html(sections, build_date=None, section_cache=None, images=None):
+    """Converte as seções em HTML formatado, renderizando só as que mudaram"""
+    fragments = render_sections(sections, 'html', '', lambda blocks: render_html_blocks(blocks, images),
+                                section_cache, images)
+    return render_page(fragments, build_date, sections_toc(sections))
+
+def write_sections_html(out, sections, build_date=None, section_cache=None, images=None):
+    """
+    Escreve a página das seções no arquivo aberto, sem montar a string completa
+    images: ImageResolver das imagens do documento (ver html_images)
+    """
+    with stage('html'):
+        fragments = render_sections(sections, 'html', '', lambda blocks: render_html_blocks(blocks, images),
+                                    section_cache, images)
+    with stage('write'):
+        write_chunks(iter_page(fragments, build_date, sections_toc(sections)), out)
+
+def stream_markdown(markdown_files, out, build_date=None, html_file=None):
+    """
+    Converte um ou mais arquivos markdown em uma única página HTML escrita em out
+    As linhas são lidas e os blocos escritos um a um: a memória usada não depende
+    do tamanho da entrada (usado para o manual completo com todos os docs)
+    Sem índice: ele viria antes do corpo e exigiria uma segunda leitura
+    """
+    # Âncoras únicas no manual inteiro, não só em cada arquivo
+    slugger = Slugger()
+    
+    def body():
+        for markdown_file in markdown_files:
+            with open(markdown_file, 'r', encoding='utf-8') as f:
+                yield from stream_html(f, slugger, html_images(markdown_file, html_file))
+    
+    # Leitura, tokenização, HTML e escrita se intercalam: uma única etapa no perfil
+    with stage('stream'):
+        write_chunks(iter_page(body(), build_date), out)
+
+def render_html_blocks(blocks, images=None):
+    """Fragmento HTML de uma lista de blocos"""
+    return '\n'.join(iter_html(blocks, images))
+
+def render_page(body_parts, build_date=None, toc=None):
+    """Monta a página completa (cabeçalho, capa, índice, corpo e rodapé)"""
+    return '\n'.join(iter_page(body_parts, build_date, toc))
+
+def iter_page(body_parts, build_date=None, toc=None):
+    """
+    Gera a página em fragmentos (cabeçalho, capa, índice, corpo e rodapé), na ordem
+    toc: títulos do documento (TocEntry); sem ele, a página não tem índice
+    """
+    
+    build_date = resolve_build_date(build_date)
+    
+    # Cabeçalho HTML
+    yield HTML_HEAD
     
     # Capa
-    html_lines.append('''
+    yield ('''
     <div class="cover">
         <h1>DOCUMENTAÇÃO TÉCNICA</h1>
         <div class="subtitle">Validação do Aplicativo Mobile Bota Love</div>
         <div class="meta">
             <p><strong>Versão:</strong> 1.0.0</p>
-            <p><strong>Data:</strong> ''' + datetime.now().strftime("%d de %B de %Y").replace("January", "Janeiro").replace("February", "Fevereiro").replace("March", "Março").replace("April", "Abril").replace("May", "Maio").replace("June", "Junho").replace("July", "Julho").replace("August", "Agosto").replace("September", "Setembro").replace("October", "Outubro").replace("November", "Novembro").replace("December", "Dezembro") + '''</p>
+            <p><strong>Data:</strong> ''' + format_long_date(build_date) + '''</p>
             <p><strong>Status:</strong> Produção</p>
             <p><strong>Classificação:</strong> Documentação Técnica - Validação Contratual</p>
         </div>
     </div>
     ''')
     
-    # Processar linhas de markdown
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        
-        # Headers
-        if line.startswith('# '):
-            html_lines.append(f'<h1>{escape_html(line[2:].strip())}</h1>')
-        
-        elif line.startswith('## '):
-            html_lines.append(f'<h2>{escape_html(line[3:].strip())}</h2>')
-        
-        elif line.startswith('### '):
-            html_lines.append(f'<h3>{escape_html(line[4:].strip())}</h3>')
-        
-        elif line.startswith('#### '):
-            html_lines.append(f'<h4>{escape_html(line[5:].strip())}</h4>')
-        
-        # Linhas horizontais
-        elif line.strip() == '---':
-            html_lines.append('<hr>')
-        
-        # Listas
-        elif line.startswith('- '):
-            if not html_lines[-1].startswith('<ul>'):
-                html_lines.append('<ul>')
-            html_lines.append(f'<li>{convert_inline_markdown(line[2:].strip())}</li>')
-            if i == len(lines) - 1 or not lines[i+1].startswith('- '):
-                html_lines.append('</ul>')
-        
-        elif line.startswith('✅ ') or line.startswith('❌ '):
-            if not html_lines[-1].startswith('<ul>'):
-                html_lines.append('<ul>')
-            html_lines.append(f'<li>{escape_html(line.strip())}</li>')
-            if i == len(lines) - 1 or (not lines[i+1].startswith('✅ ') and not lines[i+1].startswith('❌ ')):
-                html_lines.append('</ul>')
-        
-        # Código multi-linha
-        elif line.startswith('```'):
-            html_lines.append('<pre><code>')
-            i += 1
-            while i < len(lines) and not lines[i].startswith('```'):
-                html_lines.append(escape_html(lines[i]))
-                i += 1
-            html_lines.append('</code></pre>')
-        
-        # Tabelas (simplificado)
-        elif line.startswith('|'):
-            # Pular tabelas complexas por enquanto
-            pass
-        
-        # Blockquotes
-        elif line.startswith('> '):
-            html_lines.append(f'<blockquote>{convert_inline_markdown(line[2:].strip())}</blockquote>')
-        
-        # Parágrafos normais
-        elif line.strip():
-            html_lines.append(f'<p>{convert_inline_markdown(line.strip())}</p>')
-        
-        i += 1
+    # Índice com links para as âncoras dos títulos
+    if toc:
+        yield render_toc_html(toc)
+    
+    # Corpo do documento
+    yield from body_parts
     
     # Footer
-    html_lines.append('''
+    yield ('''
     <div class="footer">
         <p><strong>Bota Love App</strong> - Documentação Técnica de Validação</p>
         <p>Versão 1.0.0 | Status: Produção</p>
-        <p>Data: ''' + datetime.now().strftime("%d/%m/%Y") + '''</p>
+        <p>Data: ''' + format_short_date(build_date) + '''</p>
     </div>
     
 </body>
 </html>
     ''')
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera HTML da documentação técnica do Bota Love App')
+    parser.add_argument('markdown_files', nargs='*', metavar='markdown_file',
+                        help='Arquivo(s) markdown de entrada (padrão: docs/VALIDACAO_TECNICA.md; com --watch, '
+                             'todo o docs/); vários arquivos são concatenados em uma única página (padrão: stdout)')
+    parser.add_argument('-o', '--output', help='Arquivo HTML de saída ("-" para a saída padrão)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Escreve o HTML enquanto lê a entrada, com memória constante (sem cache)')
+    parser.add_argument('--build-date', help='Data impressa na capa e no rodapé (AAAA-MM-DD; padrão: SOURCE_DATE_EPOCH ou hoje)')
+    parser.add_argument('--force', action='store_true', help='Ignora o cache de build e regenera')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Não lê nem grava o cache de build (ex.: saídas temporárias, benchmarks)')
+    parser.add_argument('--pdf', nargs='?', const='', metavar='ARQUIVO',
+                        help='Gera também o PDF a partir do HTML, sem navegador (WeasyPrint; '
+                             'padrão: mesmo nome do HTML com .pdf)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Observa os arquivos e regenera o HTML a cada alteração (um HTML por arquivo); '
+                             'sem arquivos, observa todos os docs/*.md, inclusive novos, com os HTML em docs/build')
+    parser.add_argument('--poll', action='store_true',
+                        help='No modo --watch, verifica os arquivos periodicamente em vez de usar inotify')
+    parser.add_argument('--serve', action='store_true',
+                        help='Servidor local de pré-visualização dos docs/*.md (renderiza sob demanda, com cache)')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Endereço do --serve (padrão: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Porta do --serve (padrão: {DEFAULT_PORT})')
+    parser.add_argument('--profile', nargs='?', const=PROFILE_FILE, metavar='ARQUIVO',
+                        help='Grava tempo, pico de memória e contagens de cada etapa em JSON '
+                             '(padrão: docs/build/profile.json)')
+    parser.add_argument('--pstats', metavar='ARQUIVO',
+                        help='Grava também o dump do cProfile (python -m pstats ARQUIVO)')
+    parser.add_argument('--profile-no-memory', action='store_true',
+                        help='No perfil, mede só tempos (o tracemalloc deixa o build várias vezes mais lento)')
+    args = parser.parse_args()
     
-    return '\n'.join(html_lines)
+    markdown_files = args.markdown_files
+    if args.watch:
+        if args.output and len(markdown_files) != 1:
+            parser.error('-o só pode ser usado com --watch para um único arquivo')
+        if args.profile is not None or args.pstats:
+            parser.error('--profile/--pstats não podem ser usados com --watch')
+        if not markdown_files:
+            return watch_markdown([], build_date=args.build_date, force=args.force, polling=args.poll,
+                                  docs_dir=DOCS_DIR)
+        return watch_markdown(markdown_files, args.output, args.build_date, args.force, args.poll)
+    args.markdown_files = markdown_files or [DEFAULT_MARKDOWN]
+    if args.serve:
+        if args.profile is not None or args.pstats:
+            parser.error('--profile/--pstats não podem ser usados com --serve')
+        return serve_docs(args.host, args.port, args.build_date, args.force or args.no_cache)
+    
+    with profiling(args.profile, args.pstats, trace_memory=not args.profile_no_memory):
+        return build(args)
 
-def escape_html(text):
-    """Escapa caracteres HTML"""
-    return (text
-        .replace('&', '&amp;')
-        .replace('<', '&lt;')
-        .replace('>', '&gt;')
-        .replace('"', '&quot;')
-        .replace("'", '&#39;'))
+def build(args):
+    """Gera o HTML (e o PDF) pedido na linha de comando (ver main)"""
+    markdown_files = args.markdown_files
+    if args.stream or len(markdown_files) > 1 or args.output == '-':
+        return stream_to_output(markdown_files, args.output, args.build_date)
+    
+    markdown_file = markdown_files[0]
+    html_file = args.output or default_html_file(markdown_file)
+    
+    pdf_file = None
+    if args.pdf is not None:
+        pdf_file = args.pdf or os.path.splitext(html_file)[0] + '.pdf'
+    
+    cache = None if args.no_cache else BuildCache(MANIFEST_FILE, force=args.force)
+    section_cache = None if args.force or args.no_cache else SectionCache(SECTION_CACHE_DIR)
+    return generate_pdf(markdown_file, html_file, args.build_date, cache, section_cache, pdf_file=pdf_file)
 
-def convert_inline_markdown(text):
-    """Converte markdown inline para HTML"""
-    # Bold
-    text = text.replace('**', '<strong>', 1)
-    text = text.replace('**', '</strong>', 1)
+def watch_markdown(markdown_files, output=None, build_date=None, force=False, polling=False, docs_dir=None):
+    """
+    Modo watch: gera os HTML e os regenera a cada alteração até Ctrl+C
+    O processo fica aberto com cache de build e de seções em memória: só os
+    arquivos com conteúdo novo são refeitos, e neles só as seções alteradas
+    docs_dir: observa o diretório inteiro (todos os *.md, inclusive os criados
+    depois), com os HTML em docs/build; sem ele, só markdown_files
+    """
+    from docgen.watch import create_watcher, watch_changes
     
-    # Italic
-    text = text.replace('*', '<em>', 1)
-    text = text.replace('*', '</em>', 1)
+    directories = ()
+    if docs_dir is not None:
+        from docgen.batch import find_markdown_files
+        markdown_files = find_markdown_files(docs_dir)
+        directories = sorted({docs_dir} | {os.path.dirname(f) for f in markdown_files})
     
-    # Code inline
-    import re
-    text = re.sub(r'`([^`]+)`', r'<code>\1</code>', text)
+    def html_for(markdown_file):
+        if docs_dir is None:
+            return output or default_html_file(markdown_file)
+        name = os.path.splitext(os.path.relpath(markdown_file, docs_dir))[0]
+        return os.path.join(BUILD_DIR, name + '.html')
     
-    # Links
-    text = re.sub(r'\[([^\]]+)\]\(([^\)]+)\)', r'<a href="\2">\1</a>', text)
+    missing = [f for f in markdown_files if not os.path.exists(f)]
+    if missing:
+        for markdown_file in missing:
+            print(f"✗ Arquivo não encontrado: {markdown_file}")
+        return False
+    
+    build_date = resolve_build_date(build_date)
+    targets = {os.path.abspath(markdown_file): html_for(markdown_file) for markdown_file in markdown_files}
+    cache = BuildCache(MANIFEST_FILE, force=force)
+    section_cache = SectionCache(SECTION_CACHE_DIR)
+    
+    # O watcher começa antes do primeiro build para não perder edições feitas durante ele
+    watcher = create_watcher(() if docs_dir else targets, polling, directories)
+    for markdown_file, html_file in targets.items():
+        rebuild_html(markdown_file, html_file, build_date, cache, section_cache)
+    cache.force = False
+    
+    if docs_dir is not None:
+        print(f"👀 Observando {docs_dir} ({len(targets)} arquivo(s), {watcher.name}) - Ctrl+C para sair")
+    else:
+        print(f"👀 Observando {len(targets)} arquivo(s) ({watcher.name}) - Ctrl+C para sair")
+    try:
+        for changed in watch_changes(watcher):
+            for markdown_file in sorted(changed):
+                # Markdown novo no diretório observado
+                if markdown_file not in targets:
+                    targets[markdown_file] = html_for(markdown_file)
+                rebuild_html(markdown_file, targets[markdown_file], build_date, cache, section_cache)
+    except KeyboardInterrupt:
+        print()
+        print("ℹ Modo watch encerrado")
+    finally:
+        watcher.close()
+    return True
+
+def rebuild_html(markdown_file, html_file, build_date, cache, section_cache):
+    """Regenera um HTML no modo watch e informa a latência do rebuild"""
+    name = os.path.basename(markdown_file)
+    if not os.path.exists(markdown_file):
+        print(f"⚠ {name} removido; aguardando o arquivo voltar")
+        return
     
-    return text
+    start = time.perf_counter()
+    if cache.is_fresh(markdown_file, html_file, html_context(build_date)):
+        cache.save()
+        print(f"ℹ {name}: conteúdo sem alterações")
+        return
+    
+    misses = section_cache.misses
+    hits = section_cache.hits
+    generate_pdf(markdown_file, html_file, build_date, cache, section_cache, verbose=False)
+    rendered = section_cache.misses - misses
+    total = rendered + section_cache.hits - hits
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"✓ {name} → {os.path.basename(html_file)} em {elapsed:.0f} ms "
+          f"({rendered}/{total} seções renderizadas)")
+
+def serve_docs(host=DEFAULT_HOST, port=DEFAULT_PORT, build_date=None, no_cache=False, renderers=None):
+    """
+    Modo serve: páginas dos docs/*.md renderizadas no primeiro acesso e
+    mantidas em memória até o markdown mudar
+    renderers: formatos extras ({'.pdf': Renderer}), além do HTML
+    """
+    from docgen.serve import serve
+    
+    build_date = resolve_build_date(build_date)
+    section_cache = None if no_cache else SectionCache(SECTION_CACHE_DIR)
+    renderers = {'.html': html_renderer(build_date, section_cache), **(renderers or {})}
+    return serve(DOCS_DIR, renderers, host, port, SERVE_DIR, 'Documentação Técnica - Bota Love App')
+
+def html_renderer(build_date=None, section_cache=None):
+    """Renderer do --serve: a página HTML completa do markdown, em memória"""
+    from docgen.serve import Renderer
+    
+    def render(markdown_file):
+        # Mesmo caminho relativo do HTML em SERVE_DIR: as imagens ficam em images/ ao lado
+        name = os.path.splitext(os.path.relpath(markdown_file, DOCS_DIR))[0]
+        images = html_images(markdown_file, os.path.join(SERVE_DIR, name + '.html'))
+        out = io.StringIO()
+        write_sections_html(out, load_sections(markdown_file), build_date, section_cache, images)
+        return out.getvalue().encode('utf-8')
+    return Renderer('text/html; charset=utf-8', render)
+
+def default_html_file(markdown_file):
+    """HTML de saída padrão para um markdown"""
+    if os.path.abspath(markdown_file) == DEFAULT_MARKDOWN:
+        return DEFAULT_HTML
+    return os.path.splitext(markdown_file)[0] + '.html'
+
+def stream_to_output(markdown_files, output, build_date=None):
+    """Modo streaming: escreve a página em output (arquivo ou "-" para stdout)"""
+    
+    missing = [f for f in markdown_files if not os.path.exists(f)]
+    if missing:
+        for markdown_file in missing:
+            print(f"✗ Arquivo não encontrado: {markdown_file}", file=sys.stderr)
+        return False
+    
+    # Vários arquivos sem -o vão para a saída padrão
+    if output is None and len(markdown_files) == 1:
+        output = default_html_file(markdown_files[0])
+    if output in (None, '-'):
+        stream_markdown(markdown_files, sys.stdout, build_date)
+        return True
+    
+    print(f"📄 Convertendo {len(markdown_files)} arquivo(s) markdown para HTML (streaming)...", file=sys.stderr)
+    with open(output, 'w', encoding='utf-8') as f:
+        stream_markdown(markdown_files, f, build_date, output)
+    print(f"✓ HTML gerado: {output}", file=sys.stderr)
+    return True
 
 if __name__ == '__main__':
-    success = generate_pdf()
+    success = main()
     sys.exit(0 if success else 1)
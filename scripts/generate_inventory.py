@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Inventário da API do Bota Love App gerado a partir do código
+Lê as Cloud Functions exportadas em functions/src/index.ts, os serviços
+firebase/*Service.ts, o firestore.indexes.json e o firestore.rules e grava
+docs/INVENTARIO_API.md, incluído pelos geradores como os demais docs. Só os
+arquivos alterados desde a última execução são relidos
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from docgen.inventory import ScanCache, inventory_markdown, scan_inventory, write_inventory
+
+# Caminhos padrão
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SCRIPT_DIR)
+DOCS_DIR = os.path.join(REPO_DIR, 'docs')
+INVENTORY_FILE = os.path.join(DOCS_DIR, 'INVENTARIO_API.md')
+INVENTORY_CACHE_FILE = os.path.join(DOCS_DIR, '.docgen-cache', 'inventory.json')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera o inventário da API do Bota Love App a partir do código')
+    parser.add_argument('-o', '--output', default=INVENTORY_FILE,
+                        help='Arquivo markdown de saída ("-" para a saída padrão; padrão: docs/INVENTARIO_API.md)')
+    parser.add_argument('--check', action='store_true',
+                        help='Não grava nada (nem o cache): sai com erro se o markdown estiver desatualizado '
+                             'em relação ao código')
+    parser.add_argument('--no-cache', action='store_true', help='Relê todos os arquivos')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    cache_file = None if args.no_cache else INVENTORY_CACHE_FILE
+
+    if args.output == '-' or args.check:
+        cache = ScanCache(cache_file)
+        inventory = scan_inventory(REPO_DIR, cache)
+        text = inventory_markdown(inventory)
+        if args.output == '-':
+            cache.save()
+            sys.stdout.write(text)
+            return
+        # --check só lê: nem o cache é gravado (a árvore fica intacta, ex.: no CI)
+        try:
+            with open(args.output, 'r', encoding='utf-8') as f:
+                current = f.read()
+        except OSError:
+            current = None
+        if current != text:
+            print(f"✗ Inventário desatualizado: {args.output} (rode scripts/generate_inventory.py)")
+            sys.exit(1)
+        print(f"✓ Inventário em dia: {args.output}")
+        return
+
+    inventory, changed = write_inventory(REPO_DIR, args.output, cache_file)
+    elapsed = (time.perf_counter() - start) * 1000
+    status = 'atualizado' if changed else 'sem alterações'
+    rules = inventory['rules']['rules']
+    print(f"✓ Inventário {status}: {args.output} "
+          f"({len(inventory['functions'])} funções, {len(inventory['services'])} serviços, "
+          f"{len(inventory['indexes'])} índices, {len(rules)} regras, {elapsed:.0f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,81 +4,99 @@ Script para gerar PDF de Validação Técnica do Bota Love App
 Utiliza markdown2pdf para converter documentação
 """
 
+import argparse
+import io
+import json
 import os
 import sys
-from datetime import datetime
+import time
+
+# Só o necessário para qualquer execução; cada modo (--all, --assemble, --serve,
+# formatos, back ends) importa seus módulos ao ser usado
+from docgen.assemble import CHUNK_LINES
+from docgen.backends import (
+    backend_names, candidate_backends, command_available, get_backend, module_available,
+    register_backend,
+)
+from docgen.cache import BuildCache, build_context
+from docgen.metadata import format_long_date, format_short_date, resolve_build_date
+from docgen.profiling import active as profiling_active, count, profiling, stage
+from docgen.sections import SectionCache, load_sections, render_sections, sections_blocks, sections_toc
+from docgen.styles import DEFAULT_THEME, get_styles, get_theme
+
+
+# Argumentos do pandoc (parte da chave do cache de build)
+PANDOC_ARGS = [
+    '--pdf-engine=xelatex',
+    '-V', 'geometry:margin=2cm',
+    '-V', 'fontsize=11pt',
+    '--toc',
+    '--toc-depth=2'
+]
 
-# Markdown para HTML simples (sem dependências externas)
 def markdown_to_html(md_text):
-    """Converte markdown básico para HTML"""
-    html = md_text
-    
-    # Headers
-    html = html.replace('# ', '<h1 style="font-size: 28pt; margin-top: 30px; margin-bottom: 10px; font-weight: bold; color: #1F130C;">')
-    html = html.replace('\n</h1>', '</h1>\n')
-    
-    html = html.replace('## ', '<h2 style="font-size: 20pt; margin-top: 20px; margin-bottom: 8px; font-weight: bold; color: #502914;">')
-    html = html.replace('\n</h2>', '</h2>\n')
+    """Converte markdown para HTML usando o tokenizador compartilhado"""
+    from docgen import parse_markdown, render_html
+    return render_html(parse_markdown(md_text))
+
+def create_pdf_with_reportlab(sections, pdf_file, build_date=None, section_cache=None, theme=DEFAULT_THEME,
+                              base_dir=None):
+    """
+    Cria PDF usando reportlab a partir das seções do documento
+    base_dir: diretório do markdown, de onde as imagens são resolvidas
+    """
+    data = reportlab_pdf_bytes(sections, build_date, section_cache, theme, base_dir)
+    with stage('write'):
+        with open(pdf_file, 'wb') as f:
+            f.write(data)
+    print(f"✓ PDF gerado: {pdf_file}")
+
+def reportlab_pdf_bytes(sections, build_date=None, section_cache=None, theme=DEFAULT_THEME, base_dir=None):
+    """PDF do reportlab montado em memória (usado também pelo servidor --serve)"""
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Paragraph, Spacer, PageBreak
+    from docgen.render_reportlab import create_toc
     
-    html = html.replace('### ', '<h3 style="font-size: 16pt; margin-top: 15px; margin-bottom: 6px; font-weight: bold; color: #663C23;">')
-    html = html.replace('\n</h3>', '</h3>\n')
+    build_date = resolve_build_date(build_date)
     
-    # Bold
-    html = html.replace('**', '<b>')
+    # Estilos e fontes do tema (compartilhados entre documentos do mesmo processo)
+    styles = get_styles(theme, FONT_CACHE_DIR)
     
-    # Links
-    html = html.replace('[', '<a href="')
-    html = html.replace(']', '"></a>')
+    # Criar documento (montado em memória; quem chama escreve o arquivo de uma vez)
+    buffer = io.BytesIO()
+    doc = reportlab_template(buffer, styles)
     
-    # Listas
-    html = html.replace('- ', '<li>')
-    html = html.replace('✅ ', '<li>✅ ')
-    html = html.replace('❌ ', '<li>❌ ')
+    # Capa
+    elements = cover_elements(styles, build_date)
+    elements.append(PageBreak())
     
-    # Código
-    html = html.replace('```', '<pre style="background-color: #f5f5f5; padding: 10px; border-radius: 5px;"><code>')
+    # Índice gerado a partir dos títulos coletados na leitura das seções
+    elements.append(Paragraph('<b>ÍNDICE</b>', styles['title']))
+    elements.append(Spacer(1, 0.5*cm))
+    elements.append(create_toc(sections_toc(sections), styles))
+    elements.append(PageBreak())
     
-    # Quebras de linha
-    html = html.replace('\n\n', '</p><p style="margin: 10px 0;">')
+    elements.extend(section_elements(sections, doc, styles, section_cache, theme, base_dir))
     
-    return html
+    # Footer automático
+    def add_footer(canvas, doc):
+        draw_footer(canvas, build_date, doc.page)
+    
+    # Build PDF (o índice precisa das páginas finais: multiBuild, em geral duas passadas)
+    count('flowables', len(elements))
+    with stage('layout'):
+        passes = doc.multiBuild(elements, onFirstPage=add_footer, onLaterPages=add_footer)
+    count('layout_passes', passes)
+    count('pages', doc.page)
+    return buffer.getvalue()
 
-# Tentar usar reportlab, caso contrário usar markdown2pdf
-try:
-    from reportlab.lib.pagesizes import A4, letter
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch, cm
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
-    from reportlab.lib import colors
-    from reportlab.pdfgen import canvas
-    from datetime import datetime
-    import subprocess
-    
-    print("✓ reportlab encontrado")
-    USE_REPORTLAB = True
-except ImportError:
-    print("⚠ reportlab não disponível, tentando pandoc...")
-    USE_REPORTLAB = False
-
-def create_pdf_with_reportlab(markdown_file, pdf_file):
-    """Cria PDF usando reportlab"""
+def reportlab_template(output, styles, **kwargs):
+    """Documento A4 com as margens e os metadados da documentação"""
     from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.units import cm
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle, Image
-    from reportlab.lib import colors
-    from reportlab.lib.enums import TA_JUSTIFY, TA_CENTER, TA_LEFT
-    from datetime import datetime
-    
-    # Cores da marca
-    PRIMARY_COLOR = colors.HexColor('#F9A825')
-    SECONDARY_COLOR = colors.HexColor('#502914')
-    TEXT_COLOR = colors.HexColor('#1F130C')
-    LIGHT_BG = colors.HexColor('#FFF9E6')
-    
-    # Criar documento
-    doc = SimpleDocTemplate(
-        pdf_file,
+    from docgen.render_reportlab import create_doc_template
+    
+    options = dict(
         pagesize=A4,
         rightMargin=2*cm,
         leftMargin=2*cm,
@@ -86,219 +104,125 @@ def create_pdf_with_reportlab(markdown_file, pdf_file):
         bottomMargin=2*cm,
         title='Documentação Técnica - Bota Love App',
         author='Bota Love Team',
-        subject='Validação Técnica do Aplicativo Mobile'
+        subject='Validação Técnica do Aplicativo Mobile',
+        invariant=True
     )
-    
-    # Estilos
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=SECONDARY_COLOR,
-        spaceAfter=12,
-        fontName='Helvetica-Bold'
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=SECONDARY_COLOR,
-        spaceAfter=10,
-        spaceBefore=10,
-        fontName='Helvetica-Bold'
-    )
-    
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['BodyText'],
-        fontSize=11,
-        textColor=TEXT_COLOR,
-        alignment=TA_JUSTIFY,
-        spaceAfter=10
-    )
-    
-    # Ler markdown
-    with open(markdown_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Elementos do documento
-    elements = []
-    
-    # Capa
-    elements.append(Spacer(1, 2*cm))
-    elements.append(Paragraph(
-        '<b>DOCUMENTAÇÃO TÉCNICA</b>',
-        title_style
-    ))
-    elements.append(Spacer(1, 0.5*cm))
-    elements.append(Paragraph(
-        '<b>Validação do Aplicativo Mobile Bota Love</b>',
-        heading_style
-    ))
-    elements.append(Spacer(1, 1*cm))
-    elements.append(Paragraph(
-        f'<b>Data:</b> {datetime.now().strftime("%d de %B de %Y")}<br/>'
-        '<b>Versão:</b> 1.0.0<br/>'
-        '<b>Status:</b> Produção<br/>'
-        '<b>Classificação:</b> Documentação Técnica - Validação Contratual',
-        body_style
-    ))
-    elements.append(PageBreak())
-    
-    # Índice
-    elements.append(Paragraph('<b>ÍNDICE</b>', title_style))
-    elements.append(Spacer(1, 0.5*cm))
-    
-    index_items = [
-        '1. Resumo Executivo',
-        '2. Lista Completa de Funcionalidades',
-        '3. Arquitetura do Sistema',
-        '4. Descrição Detalhada das Funcionalidades',
-        '5. Banco de Dados Firebase',
-        '6. Cloud Functions - Endpoints',
-        '7. Fluxos e Telas do Aplicativo',
-        '8. Componentes e Ativos Técnicos',
-        '9. Stack Tecnológico',
-        '10. Segurança e Regras Firestore',
+    options.update(kwargs)
+    return create_doc_template(output, fonts=styles['fonts'], **options)
+
+def cover_elements(styles, build_date, subtitle='Validação do Aplicativo Mobile Bota Love'):
+    """Flowables da capa"""
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Paragraph, Spacer
+    
+    return [
+        Spacer(1, 2*cm),
+        Paragraph('<b>DOCUMENTAÇÃO TÉCNICA</b>', styles['title']),
+        Spacer(1, 0.5*cm),
+        Paragraph(f'<b>{subtitle}</b>', styles['heading']),
+        Spacer(1, 1*cm),
+        Paragraph(
+            f'<b>Data:</b> {format_long_date(build_date)}<br/>'
+            '<b>Versão:</b> 1.0.0<br/>'
+            '<b>Status:</b> Produção<br/>'
+            '<b>Classificação:</b> Documentação Técnica - Validação Contratual',
+            styles['body']
+        ),
     ]
-    
-    for item in index_items:
-        elements.append(Paragraph(f'• {item}', body_style))
-    
-    elements.append(PageBreak())
-    
-    # Processar conteúdo markdown
-    lines = content.split('\n')
-    current_section = ''
-    
-    for line in lines:
-        if line.startswith('# '):
-            if current_section:
+
+def section_elements(sections, doc, styles, section_cache=None, theme=DEFAULT_THEME, base_dir=None,
+                     internal_links=True):
+    """
+    Flowables do conteúdo das seções (somente as seções alteradas são reconstruídas)
+    base_dir: diretório do markdown, de onde as imagens são resolvidas
+    internal_links: links '#âncora' apontam para os títulos das seções (desligado
+    nas partes do --assemble, cujos destinos ficam em outros PDFs)
+    """
+    from reportlab.lib.units import cm
+    from reportlab.platypus import PageBreak
+    from docgen.images import ImageResolver, get_image_cache
+    from docgen.render_reportlab import build_flowables
+    
+    # Imagens reduzidas à área útil do frame (6pt de padding em cada lado), em JPEG, em cache
+    images = None
+    if base_dir is not None:
+        images = ImageResolver(get_image_cache(IMAGE_CACHE_DIR), base_dir, doc.width - 12, doc.height - 1*cm,
+                               opaque=True)
+    
+    anchors = None
+    if internal_links:
+        anchors = frozenset(entry.anchor for entry in sections_toc(sections) if entry.anchor)
+    
+    # As fontes resolvidas na máquina (marca e fallbacks) também mudam os flowables
+    settings = dict(get_theme(theme), **styles['fonts'].settings())
+    with stage('flowables'):
+        section_flowables = render_sections(
+            sections, 'flowables', build_context('reportlab', settings, ''),
+            lambda blocks: build_flowables(blocks, styles, doc.width, images, anchors), section_cache, images,
+            anchors
+        )
+    
+    # Cada seção '# ' começa em nova página
+    elements = []
+    first_chapter = True
+    for section, flowables in zip(sections, section_flowables):
+        if section.is_chapter:
+            if not first_chapter:
                 elements.append(PageBreak())
-            current_section = line[2:].strip()
-            elements.append(Paragraph(current_section, title_style))
-            elements.append(Spacer(1, 0.3*cm))
-        
-        elif line.startswith('## '):
-            elements.append(Paragraph(line[3:].strip(), heading_style))
-            elements.append(Spacer(1, 0.2*cm))
-        
-        elif line.startswith('### '):
-            elements.append(Paragraph(
-                f'<b>{line[4:].strip()}</b>',
-                ParagraphStyle(
-                    'SubHeading',
-                    parent=styles['Normal'],
-                    fontSize=12,
-                    textColor=SECONDARY_COLOR,
-                    spaceAfter=6,
-                    fontName='Helvetica-Bold'
-                )
-            ))
-        
-        elif line.startswith('- '):
-            elements.append(Paragraph(f'• {line[2:].strip()}', body_style))
-        
-        elif line.startswith('✅ '):
-            elements.append(Paragraph(f'✅ {line[3:].strip()}', body_style))
-        
-        elif line.startswith('❌ '):
-            elements.append(Paragraph(f'❌ {line[3:].strip()}', body_style))
-        
-        elif line.startswith('```'):
-            # Ignora blocos de código
-            continue
-        
-        elif line.strip() and not line.startswith('```'):
-            if line.startswith('|'):
-                # Ignora tabelas por enquanto
-                continue
-            elif line.startswith('> '):
-                elements.append(Paragraph(
-                    f'<i>{line[2:].strip()}</i>',
-                    body_style
-                ))
-            elif line.strip():
-                elements.append(Paragraph(line.strip(), body_style))
+            first_chapter = False
+        elements.extend(flowables)
+    return elements
+
+def draw_footer(canvas, build_date, page):
+    """Rodapé da página: versão, data e número da página"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
     
-    # Footer automático
-    def add_footer(canvas, doc):
-        canvas.saveState()
-        canvas.setFont("Helvetica", 8)
-        canvas.setFillColor(colors.grey)
-        canvas.drawString(2*cm, 1*cm, f"Bota Love App - Documentação Técnica v1.0.0 - {datetime.now().strftime('%d/%m/%Y')}")
-        canvas.drawRightString(A4[0] - 2*cm, 1*cm, f"Página {doc.page}")
-        canvas.restoreState()
-    
-    # Build PDF
-    doc.build(elements, onFirstPage=add_footer, onLaterPages=add_footer)
-    print(f"✓ PDF gerado: {pdf_file}")
+    canvas.saveState()
+    canvas.setFont("Helvetica", 8)
+    canvas.setFillColor(colors.grey)
+    canvas.drawString(2*cm, 1*cm, f"Bota Love App - Documentação Técnica v1.0.0 - {format_short_date(build_date)}")
+    canvas.drawRightString(A4[0] - 2*cm, 1*cm, f"Página {page}")
+    canvas.restoreState()
 
 def create_pdf_with_pandoc(markdown_file, pdf_file):
-    """Cria PDF usando pandoc (alternativa)"""
-    try:
-        cmd = [
-            'pandoc',
-            markdown_file,
-            '-o', pdf_file,
-            '--pdf-engine=xelatex',
-            '-V', 'geometry:margin=2cm',
-            '-V', 'fontsize=11pt',
-            '--toc',
-            '--toc-depth=2'
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            print(f"✓ PDF gerado com pandoc: {pdf_file}")
-            return True
-        else:
-            print(f"✗ Erro com pandoc: {result.stderr}")
-            return False
+    """Cria PDF usando pandoc + xelatex (alternativa), com o LaTeX intermediário em cache"""
+    from docgen.pandoc import convert, format_timings
     
-    except FileNotFoundError:
-        print("⚠ pandoc não encontrado")
+    try:
+        timings = convert(markdown_file, pdf_file, PANDOC_ARGS, LATEX_CACHE_DIR, TEXMF_CACHE_DIR)
+    except FileNotFoundError as e:
+        print(f"⚠ {e.filename or 'pandoc'} não encontrado")
+        return False
+    except RuntimeError as e:
+        print(f"✗ Erro com pandoc: {e}")
         return False
-
-def main():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    markdown_file = os.path.join(script_dir, 'docs', 'VALIDACAO_TECNICA.md')
-    pdf_file = os.path.join(script_dir, 'docs', 'DOCUMENTACAO_VALIDACAO_BOTA_LOVE_APP.pdf')
-    
-    if not os.path.exists(markdown_file):
-        print(f"✗ Arquivo não encontrado: {markdown_file}")
-        sys.exit(1)
-    
-    print(f"📄 Processando: {markdown_file}")
-    print(f"📕 Gerando PDF: {pdf_file}")
-    print()
-    
-    # Tentar reportlab primeiro
-    if USE_REPORTLAB:
-        try:
-            create_pdf_with_reportlab(markdown_file, pdf_file)
-            return
-        except Exception as e:
-            print(f"⚠ Erro com reportlab: {e}")
-            print("Tentando alternativa com pandoc...")
     
-    # Alternativa: pandoc
-    if create_pdf_with_pandoc(markdown_file, pdf_file):
-        return
+    print(f"✓ PDF gerado com pandoc: {pdf_file}")
+    print(f"  ⏱ {format_timings(timings)}")
+    return True
+
+def create_pdf_with_weasyprint(sections, markdown_file, pdf_file, build_date=None, section_cache=None):
+    """Cria PDF a partir da página HTML estilizada (CSS de impressão), em processo"""
+    from docgen.html_pdf import html_to_pdf
+    from generate_html_pdf import html_images, sections_to_html
+    
+    html = sections_to_html(sections, build_date, section_cache, html_images(markdown_file))
+    html_to_pdf(html, pdf_file, base_url=os.path.dirname(os.path.abspath(markdown_file)))
+    print(f"✓ PDF gerado com WeasyPrint: {pdf_file}")
+
+def create_html_fallback(sections, pdf_file, build_date=None, markdown_file=None):
+    """Salva um HTML simples para impressão no navegador (última alternativa)"""
+    from docgen import write_chunks
+    from docgen.highlight import highlight_css
+    from docgen.render_html import iter_html
     
-    # Última alternativa: simple text to HTML to PDF
-    print("ℹ Criando PDF simples...")
-    with open(markdown_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    build_date = resolve_build_date(build_date)
     
     # Salvar como HTML para abrir em navegador
     html_file = pdf_file.replace('.pdf', '.html')
-    html_content = f"""
+    html_head = f"""
     <!DOCTYPE html>
     <html lang="pt-BR">
     <head>
@@ -336,6 +260,7 @@ def main():
                 border-radius: 5px;
                 overflow-x: auto;
             }}
+{highlight_css(indent=' ' * 12)}
             table {{
                 border-collapse: collapse;
                 width: 100%;
@@ -350,6 +275,10 @@ def main():
                 background-color: #F9A825;
                 color: white;
             }}
+            img {{
+                max-width: 100%;
+                height: auto;
+            }}
             .footer {{
                 margin-top: 50px;
                 padding-top: 20px;
@@ -361,21 +290,610 @@ def main():
         </style>
     </head>
     <body>
-        {markdown_to_html(content)}
+    """
+    html_footer = f"""
         <div class="footer">
             <p>Bota Love App - Documentação Técnica de Validação v1.0.0</p>
-            <p>Data: {datetime.now().strftime("%d de %B de %Y")}</p>
+            <p>Data: {format_long_date(build_date)}</p>
             <p>Status: Produção</p>
         </div>
     </body>
     </html>
     """
     
+    # O corpo é escrito bloco a bloco, sem montar o documento inteiro em memória
     with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        f.write(html_head)
+        images = None
+        if markdown_file is not None:
+            from generate_html_pdf import html_images
+            images = html_images(markdown_file, html_file)
+        write_chunks(iter_html(sections_blocks(sections), images), f)
+        f.write(html_footer)
     
     print(f"✓ Documento HTML gerado: {html_file}")
     print(f"  Abra em um navegador e use Ctrl+P para salvar como PDF")
 
+# Back ends registrados em ordem de preferência; cada um importa suas
+# dependências apenas quando é usado
+
+@register_backend('reportlab', probe=lambda: module_available('reportlab'), output='pdf')
+def render_with_reportlab(sections, markdown_file, pdf_file, build_date, section_cache):
+    create_pdf_with_reportlab(sections, pdf_file, build_date, section_cache,
+                              base_dir=os.path.dirname(os.path.abspath(markdown_file)))
+    return True
+
+@register_backend('weasyprint', probe=lambda: module_available('weasyprint'), output='pdf')
+def render_with_weasyprint(sections, markdown_file, pdf_file, build_date, section_cache):
+    create_pdf_with_weasyprint(sections, markdown_file, pdf_file, build_date, section_cache)
+    return True
+
+@register_backend('pandoc', probe=lambda: command_available('pandoc') and command_available('xelatex'), output='pdf')
+def render_with_pandoc(sections, markdown_file, pdf_file, build_date, section_cache):
+    return create_pdf_with_pandoc(markdown_file, pdf_file)
+
+@register_backend('html', output='html')
+def render_with_html(sections, markdown_file, pdf_file, build_date, section_cache):
+    print("ℹ Criando PDF simples...")
+    create_html_fallback(sections, pdf_file, build_date, markdown_file)
+    return True
+
+# Formatos de saída do --formats (todos a partir do mesmo parse)
+FORMATS = ('html', 'pdf', 'txt', 'json')
+
+# Caminhos padrão
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SCRIPT_DIR)
+DOCS_DIR = os.path.join(REPO_DIR, 'docs')
+BUILD_DIR = os.path.join(DOCS_DIR, 'build')
+DEFAULT_MARKDOWN = os.path.join(DOCS_DIR, 'VALIDACAO_TECNICA.md')
+DEFAULT_PDF = os.path.join(DOCS_DIR, 'DOCUMENTACAO_VALIDACAO_BOTA_LOVE_APP.pdf')
+MANIFEST_FILE = os.path.join(DOCS_DIR, '.docgen-manifest.json')
+SECTION_CACHE_DIR = os.path.join(DOCS_DIR, '.docgen-cache', 'sections')
+LATEX_CACHE_DIR = os.path.join(DOCS_DIR, '.docgen-cache', 'latex')
+TEXMF_CACHE_DIR = os.path.join(DOCS_DIR, '.docgen-cache', 'texmf')
+IMAGE_CACHE_DIR = os.path.join(DOCS_DIR, '.docgen-cache', 'images')
+FONT_CACHE_DIR = os.path.join(DOCS_DIR, '.docgen-cache', 'fonts')
+SEARCH_INDEX_NAME = 'search-index.json'
+PROFILE_FILE = os.path.join(BUILD_DIR, 'profile.json')
+MANUAL_PDF = os.path.join(BUILD_DIR, 'MANUAL_COMPLETO_BOTA_LOVE_APP.pdf')
+INVENTORY_FILE = os.path.join(DOCS_DIR, 'INVENTARIO_API.md')
+INVENTORY_CACHE_FILE = os.path.join(DOCS_DIR, '.docgen-cache', 'inventory.json')
+# Endereço padrão do --serve (o mesmo de generate_html_pdf)
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+
+def pdf_backends(name=None):
+    """Back ends que geram PDF, em ordem (com nome explícito, sem testar disponibilidade)"""
+    return [backend for backend in candidate_backends(name) if backend.output == 'pdf']
+
+def pdf_context(backend, build_date):
+    """Contexto de cache da saída PDF para o back end informado"""
+    if backend == 'reportlab':
+        # Consertar, incluir ou remover um arquivo de fonte muda o PDF
+        settings = dict(get_theme(), **get_styles(DEFAULT_THEME, FONT_CACHE_DIR)['fonts'].settings())
+    elif backend == 'weasyprint':
+        from generate_html_pdf import HTML_HEAD
+        settings = HTML_HEAD
+    else:
+        settings = PANDOC_ARGS
+    return build_context(backend, settings, resolve_build_date(build_date))
+
+def create_pdf(sections, markdown_file, pdf_file, build_date=None, section_cache=None, backends=None):
+    """Tenta os back ends em ordem; retorna o nome do que funcionou ou None"""
+    if backends is None:
+        backends = candidate_backends()
+    
+    for index, backend in enumerate(backends):
+        try:
+            if backend.render(sections, markdown_file, pdf_file, build_date, section_cache):
+                return backend.name
+        except Exception as e:
+            print(f"⚠ Erro com {backend.name}: {e}")
+        
+        if index + 1 < len(backends):
+            print(f"Tentando alternativa com {backends[index + 1].name}...")
+    
+    return None
+
+def parse_formats(value):
+    """Lista de formatos do --formats (ex.: 'html,pdf'), sem repetições e na ordem dada"""
+    formats = []
+    for name in value.split(','):
+        name = name.strip().lower()
+        if name not in FORMATS:
+            raise argparse.ArgumentTypeError(
+                f"formato desconhecido: {name} (disponíveis: {', '.join(FORMATS)})")
+        if name not in formats:
+            formats.append(name)
+    return formats
+
+def format_context(fmt, backend, build_date):
+    """Contexto de cache de cada formato de saída"""
+    if fmt == 'html':
+        from generate_html_pdf import html_context
+        return html_context(build_date)
+    if fmt == 'pdf':
+        return pdf_context(backend, build_date)
+    # txt e json não dependem de estilos nem da data
+    return build_context(fmt, {}, '')
+
+def output_files(markdown_file, output_dir, formats=('html', 'pdf'), docs_dir=None):
+    """
+    Caminhos gerados para um markdown no modo batch ({formato: caminho})
+    docs_dir: a saída repete o caminho relativo a ele (docs/a/README.md →
+    a/README.html), então arquivos de mesmo nome em subpastas não colidem
+    """
+    if docs_dir is None:
+        name = os.path.splitext(os.path.basename(markdown_file))[0]
+    else:
+        name = os.path.splitext(os.path.relpath(markdown_file, docs_dir))[0]
+    return {fmt: os.path.join(output_dir, name + '.' + fmt) for fmt in formats}
+
+def render_format(fmt, sections, markdown_file, output, build_date=None, section_cache_dir=None,
+                  backend_names=(), section_cache=None):
+    """
+    Escreve um formato a partir das seções já tokenizadas
+    Retorna o nome de quem gerou a saída (o back end, no caso do PDF) ou None
+    """
+    if section_cache is None and section_cache_dir:
+        section_cache = SectionCache(section_cache_dir)
+    
+    if fmt == 'pdf':
+        backends = [get_backend(name) for name in backend_names]
+        return create_pdf(sections, markdown_file, output, build_date, section_cache, backends)
+    
+    if fmt == 'html':
+        from generate_html_pdf import html_images, write_sections_html
+        with open(output, 'w', encoding='utf-8') as f:
+            write_sections_html(f, sections, build_date, section_cache, html_images(markdown_file, output))
+        return fmt
+    
+    blocks = sections_blocks(sections)
+    with stage(fmt):
+        if fmt == 'txt':
+            from docgen.render_text import render_text
+            data = render_text(blocks)
+        else:
+            from docgen.render_json import document_to_dict
+            data = json.dumps(document_to_dict(blocks, os.path.basename(markdown_file)),
+                              ensure_ascii=False, indent=2) + '\n'
+    with stage('write'):
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(data)
+    return fmt
+
+def render_formats(sections, markdown_file, outputs, build_date=None, section_cache_dir=None,
+                   backend_names=(), jobs=None):
+    """
+    Gera todos os formatos pedidos a partir de um único parse
+    Com núcleos sobrando, cada formato roda em um processo (o PDF é o mais lento)
+    Retorna {formato: resultado de render_format}
+    """
+    jobs = min(jobs or os.cpu_count() or 1, len(outputs))
+    
+    if jobs <= 1:
+        section_cache = SectionCache(section_cache_dir) if section_cache_dir else None
+        results = {}
+        for fmt, output in outputs.items():
+            try:
+                results[fmt] = render_format(fmt, sections, markdown_file, output, build_date,
+                                             backend_names=backend_names, section_cache=section_cache)
+            except Exception as e:
+                print(f"✗ Erro ao gerar {fmt}: {e}")
+                results[fmt] = None
+        return results
+    
+    from concurrent.futures import ProcessPoolExecutor
+    
+    # Tokeniza antes de enviar: os processos recebem a árvore pronta
+    sections_blocks(sections)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            fmt: executor.submit(render_format, fmt, sections, markdown_file, output, build_date,
+                                 section_cache_dir, backend_names)
+            for fmt, output in outputs.items()
+        }
+        results = {}
+        for fmt, future in futures.items():
+            try:
+                results[fmt] = future.result()
+            except Exception as e:
+                print(f"✗ Erro ao gerar {fmt}: {e}")
+                results[fmt] = None
+        return results
+
+def render_markdown_file(markdown_file, output_dir, build_date=None, section_cache_dir=None, backend=None,
+                         formats=('html', 'pdf'), docs_dir=None):
+    """Renderiza um arquivo markdown nos formatos pedidos (worker do modo batch)"""
+    outputs = output_files(markdown_file, output_dir, formats, docs_dir)
+    for output in outputs.values():
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    sections = load_sections(markdown_file)
+    
+    backends = pdf_backends(backend) if 'pdf' in formats else []
+    # Os documentos já rodam em paralelo: os formatos de cada um ficam no mesmo processo
+    results = render_formats(sections, markdown_file, outputs, build_date, section_cache_dir,
+                             [b.name for b in backends], jobs=1)
+    
+    # Postings da busca e links saem da mesma tokenização; o índice e o grafo
+    # de links gerais só juntam as seções
+    if 'html' in formats and section_cache_dir:
+        from docgen.links import LINKS_KIND, section_links
+        from docgen.search import SEARCH_KIND, section_postings
+        
+        section_cache = SectionCache(section_cache_dir)
+        with stage('search'):
+            render_sections(sections, SEARCH_KIND, '', section_postings, section_cache)
+        with stage('links'):
+            render_sections(sections, LINKS_KIND, '', section_links, section_cache)
+    
+    ok = all(results.values())
+    if 'pdf' in formats:
+        ok = ok and bool(backends) and results['pdf'] == backends[0].name
+    return 0 if ok else 1
+
+def update_search_index(markdown_files, docs_dir, output_dir, section_cache_dir=None):
+    """Índice de busca offline de todos os docs, ao lado do HTML gerado"""
+    from docgen.search import build_index, write_index
+    
+    section_cache = SectionCache(section_cache_dir) if section_cache_dir else None
+    index_file = os.path.join(output_dir, SEARCH_INDEX_NAME)
+    with stage('search'):
+        index = build_index(markdown_files, docs_dir, section_cache)
+    with stage('write'):
+        changed = write_index(index, index_file)
+    if changed:
+        print(f"🔎 Índice de busca atualizado: {index_file} ({len(index['docs'])} trechos)")
+
+def update_inventory():
+    """Atualiza o inventário da API (docs/INVENTARIO_API.md) a partir do código, antes dos docs"""
+    from docgen.inventory import write_inventory
+    
+    _, changed = write_inventory(REPO_DIR, INVENTORY_FILE, INVENTORY_CACHE_FILE)
+    if changed:
+        print(f"📋 Inventário da API atualizado: {INVENTORY_FILE}")
+
+def report_broken_links(markdown_files, section_cache_dir=None):
+    """Confere os links de todos os docs de uma vez e resume os quebrados"""
+    from docgen.links import broken_links, build_link_graph, check_links
+    
+    section_cache = SectionCache(section_cache_dir) if section_cache_dir else None
+    checked = check_links(build_link_graph(markdown_files, REPO_DIR, section_cache))
+    broken = broken_links(checked)
+    if broken:
+        print(f"⚠ {len(broken)} de {len(checked)} link(s) quebrado(s) (detalhes: scripts/check_links.py)")
+
+def render_all(docs_dir, output_dir, jobs=None, build_date=None, cache=None, section_cache_dir=None,
+               backend=None, formats=('html', 'pdf')):
+    """Renderiza em paralelo os markdown de docs_dir que mudaram desde o último build"""
+    from docgen.batch import find_markdown_files, run_batch
+    
+    markdown_files = find_markdown_files(docs_dir)
+    if not markdown_files:
+        print(f"✗ Nenhum markdown encontrado em: {docs_dir}")
+        return 1
+    
+    backends = pdf_backends(backend) if 'pdf' in formats else []
+    if 'pdf' in formats and not backends:
+        print("✗ Nenhum back end de PDF disponível (instale reportlab, weasyprint ou pandoc)")
+        return 1
+    backend_name = backends[0].name if backends else None
+    
+    os.makedirs(output_dir, exist_ok=True)
+    print(f"📁 Saída: {output_dir}")
+    
+    build_date = resolve_build_date(build_date)
+    contexts = {fmt: format_context(fmt, backend_name, build_date) for fmt in formats}
+    
+    pending = []
+    for markdown_file in markdown_files:
+        outputs = output_files(markdown_file, output_dir, formats, docs_dir)
+        if cache is not None and all(
+            cache.is_fresh(markdown_file, output, contexts[fmt])
+            for fmt, output in outputs.items()
+        ):
+            continue
+        pending.append(markdown_file)
+    
+    skipped = len(markdown_files) - len(pending)
+    if skipped:
+        print(f"✓ {skipped} arquivo(s) sem alterações (cache)")
+    
+    results = {}
+    if pending:
+        # pandoc/xelatex rodam em subprocessos: threads bastam para limitar a concorrência
+        results = run_batch(pending, render_markdown_file, output_dir, build_date, section_cache_dir,
+                            backend_name, tuple(formats), docs_dir, jobs=jobs, threads=backend_name == 'pandoc',
+                            in_process=profiling_active())
+    
+    if cache is not None:
+        for markdown_file, code in results.items():
+            if code == 0:
+                for fmt, output in output_files(markdown_file, output_dir, formats, docs_dir).items():
+                    cache.record(markdown_file, output, contexts[fmt])
+        cache.save()
+    
+    if 'html' in formats:
+        update_search_index(markdown_files, docs_dir, output_dir, section_cache_dir)
+        report_broken_links(markdown_files, section_cache_dir)
+    
+    return max(results.values(), default=0)
+
+def render_chunk(chunk, index, chunk_dir, build_date=None, section_cache_dir=None):
+    """Diagrama uma parte do manual, sem capa nem rodapé (worker do --assemble)"""
+    from docgen.assemble import ChunkResult
+    
+    sections = load_sections(chunk.markdown_file)[chunk.start:chunk.end]
+    styles = get_styles(DEFAULT_THEME, FONT_CACHE_DIR)
+    section_cache = SectionCache(section_cache_dir) if section_cache_dir else None
+    pdf_file = os.path.join(chunk_dir, f'parte-{index + 1:03d}.pdf')
+    
+    doc = reportlab_template(pdf_file, styles)
+    elements = section_elements(sections, doc, styles, section_cache,
+                                base_dir=os.path.dirname(os.path.abspath(chunk.markdown_file)),
+                                internal_links=False)
+    count('flowables', len(elements))
+    # Sem índice na parte: uma passada basta
+    with stage('layout'):
+        doc.build(elements)
+    count('pages', doc.page)
+    return ChunkResult(pdf_file, doc.page, doc.heading_pages)
+
+def manual_front_matter(results, offsets, build_date):
+    """Capa e índice do manual, com as páginas finais; retorna (PDF em bytes, páginas)"""
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Paragraph, Spacer, PageBreak
+    from docgen.render_reportlab import create_toc
+    
+    styles = get_styles(DEFAULT_THEME, FONT_CACHE_DIR)
+    entries = [entry for result in results for entry, _ in result.headings]
+    local_pages = [page for result in results for _, page in result.headings]
+    first_pages = [offset for result, offset in zip(results, offsets) for _ in result.headings]
+    
+    def add_footer(canvas, doc):
+        draw_footer(canvas, build_date, doc.page)
+    
+    # As páginas do índice deslocam todo o resto: repete até o número de páginas se firmar
+    front_pages = 2
+    while True:
+        pages = [front_pages + first + page - 1 for first, page in zip(first_pages, local_pages)]
+        buffer = io.BytesIO()
+        doc = reportlab_template(buffer, styles, title='Manual Completo - Bota Love App')
+        elements = cover_elements(styles, build_date, 'Manual Completo do Aplicativo Bota Love')
+        elements.append(PageBreak())
+        elements.append(Paragraph('<b>ÍNDICE</b>', styles['title']))
+        elements.append(Spacer(1, 0.5*cm))
+        elements.append(create_toc(entries, styles, pages=pages))
+        with stage('layout'):
+            doc.build(elements, onFirstPage=add_footer, onLaterPages=add_footer)
+        if doc.page == front_pages:
+            return buffer.getvalue(), front_pages
+        front_pages = doc.page
+
+def footer_overlay(build_date, first_page, pages):
+    """PDF com só o rodapé de cada página, numeradas a partir de first_page"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen.canvas import Canvas
+    
+    buffer = io.BytesIO()
+    canvas = Canvas(buffer, pagesize=A4, invariant=True)
+    for page in range(first_page, first_page + pages):
+        draw_footer(canvas, build_date, page)
+        canvas.showPage()
+    canvas.save()
+    return buffer.getvalue()
+
+def assemble_manual(docs_dir, output, jobs=None, build_date=None, section_cache_dir=None, max_lines=CHUNK_LINES):
+    """
+    Gera o manual completo de docs_dir em um único PDF, diagramado por partes
+    (ver docgen.assemble); retorna o código de saída
+    """
+    import tempfile
+    from docgen.assemble import merge_pdfs, page_offsets, plan_chunks, run_chunks
+    from docgen.batch import find_markdown_files
+    
+    missing = [name for name in ('reportlab', 'pypdf') if not module_available(name)]
+    if missing:
+        print(f"✗ Necessário para --assemble: {', '.join(missing)} (pip install {' '.join(missing)})")
+        return 1
+    
+    markdown_files = find_markdown_files(docs_dir)
+    if not markdown_files:
+        print(f"✗ Nenhum markdown encontrado em: {docs_dir}")
+        return 1
+    
+    start = time.perf_counter()
+    build_date = resolve_build_date(build_date)
+    chunks = plan_chunks(markdown_files, max_lines)
+    print(f"📕 Manual completo: {len(markdown_files)} doc(s), "
+          f"{sum(chunk.lines for chunk in chunks)} linhas em {len(chunks)} parte(s)")
+    
+    output_dir = os.path.dirname(os.path.abspath(output))
+    os.makedirs(output_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix='.manual-', dir=output_dir) as chunk_dir:
+        try:
+            results = run_chunks(chunks, render_chunk, chunk_dir, build_date, section_cache_dir,
+                                 jobs=jobs, in_process=profiling_active())
+        except Exception as e:
+            print(f"✗ Erro ao diagramar: {e}")
+            return 1
+        
+        offsets = page_offsets(1, results)
+        front, front_pages = manual_front_matter(results, offsets, build_date)
+        content_pages = sum(result.pages for result in results)
+        front_file = os.path.join(chunk_dir, 'capa.pdf')
+        with open(front_file, 'wb') as f:
+            f.write(front)
+        
+        total = merge_pdfs(
+            [front_file] + [result.pdf_file for result in results], output,
+            overlay=footer_overlay(build_date, front_pages + 1, content_pages), overlay_start=front_pages,
+            metadata={'/Title': 'Manual Completo - Bota Love App', '/Author': 'Bota Love Team'},
+        )
+    
+    count('chunks', len(chunks))
+    print(f"✓ Manual gerado: {output} ({total} páginas, {time.perf_counter() - start:.2f}s)")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera PDF da documentação técnica do Bota Love App')
+    parser.add_argument('markdown_file', nargs='?', default=DEFAULT_MARKDOWN,
+                        help='Arquivo markdown de entrada (padrão: docs/VALIDACAO_TECNICA.md)')
+    parser.add_argument('-o', '--output',
+                        help='Arquivo PDF de saída (os demais formatos usam o mesmo nome, com sua extensão)')
+    parser.add_argument('--formats', type=parse_formats, default=None,
+                        help=f"Formatos gerados a partir de um único parse: {','.join(FORMATS)} "
+                             "(padrão: pdf; html,pdf no modo --all)")
+    parser.add_argument('--backend', choices=['auto'] + backend_names(), default='auto',
+                        help='Back end de saída; explícito pula a detecção (padrão: auto)')
+    parser.add_argument('--all', action='store_true',
+                        help='Renderiza todos os docs/*.md em HTML e PDF, em paralelo '
+                             '(com HTML, gera também o índice de busca usado por search_docs.py)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Número de processos (documentos no modo --all, formatos no modo arquivo único; '
+                             'padrão: núcleos da máquina)')
+    parser.add_argument('--output-dir', default=BUILD_DIR,
+                        help='Diretório de saída do modo --all (padrão: docs/build)')
+    parser.add_argument('--assemble', nargs='?', const=MANUAL_PDF, metavar='ARQUIVO',
+                        help='Gera o manual completo com todos os docs/*.md em um único PDF, diagramado por '
+                             'partes em paralelo (requer pypdf; padrão: docs/build/MANUAL_COMPLETO_BOTA_LOVE_APP.pdf)')
+    parser.add_argument('--chunk-lines', type=int, default=CHUNK_LINES,
+                        help=f'No modo --assemble, tamanho máximo de cada parte em linhas (padrão: {CHUNK_LINES})')
+    parser.add_argument('--build-date', help='Data impressa na capa e no rodapé (AAAA-MM-DD; padrão: SOURCE_DATE_EPOCH ou hoje)')
+    parser.add_argument('--force', action='store_true', help='Ignora o cache de build e regenera')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Não lê nem grava o cache de build (ex.: saídas temporárias, benchmarks)')
+    parser.add_argument('--serve', action='store_true',
+                        help='Servidor local de pré-visualização dos docs/*.md em HTML e PDF (reportlab), '
+                             'renderizados sob demanda e mantidos em cache')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Endereço do --serve (padrão: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Porta do --serve (padrão: {DEFAULT_PORT})')
+    parser.add_argument('--profile', nargs='?', const=PROFILE_FILE, metavar='ARQUIVO',
+                        help='Grava tempo, pico de memória e contagens de cada etapa em JSON '
+                             '(padrão: docs/build/profile.json); roda tudo em um único processo')
+    parser.add_argument('--pstats', metavar='ARQUIVO',
+                        help='Grava também o dump do cProfile (python -m pstats ARQUIVO)')
+    parser.add_argument('--profile-no-memory', action='store_true',
+                        help='No perfil, mede só tempos (o tracemalloc deixa o build várias vezes mais lento)')
+    args = parser.parse_args()
+    
+    if args.serve:
+        if args.profile is not None or args.pstats:
+            parser.error('--profile/--pstats não podem ser usados com --serve')
+        sys.exit(0 if serve_docs(args) else 1)
+    
+    with profiling(args.profile, args.pstats, trace_memory=not args.profile_no_memory):
+        build(args)
+
+def serve_docs(args):
+    """Modo serve: HTML e PDF dos docs sob demanda (ver generate_html_pdf.serve_docs)"""
+    from generate_html_pdf import serve_docs as serve_html_docs
+    
+    build_date = resolve_build_date(args.build_date)
+    section_cache = None if args.force or args.no_cache else SectionCache(SECTION_CACHE_DIR)
+    renderers = {}
+    if module_available('reportlab'):
+        renderers['.pdf'] = pdf_renderer(build_date, section_cache)
+    else:
+        print("⚠ ReportLab não instalado: servindo só HTML (pip install reportlab)")
+    return serve_html_docs(args.host, args.port, build_date, args.force or args.no_cache, renderers)
+
+def pdf_renderer(build_date=None, section_cache=None):
+    """Renderer do --serve: o PDF do reportlab, em memória"""
+    from docgen.serve import Renderer
+    
+    def render(markdown_file):
+        return reportlab_pdf_bytes(load_sections(markdown_file), build_date, section_cache,
+                                   base_dir=os.path.dirname(os.path.abspath(markdown_file)))
+    return Renderer('application/pdf', render)
+
+def build(args):
+    """Executa o build pedido na linha de comando (ver main)"""
+    build_date = resolve_build_date(args.build_date)
+    cache = None if args.no_cache else BuildCache(MANIFEST_FILE, force=args.force)
+    section_cache_dir = None if args.force or args.no_cache else SECTION_CACHE_DIR
+    
+    # Os modos de todos os docs incluem o inventário extraído do código
+    if args.assemble is not None or args.all:
+        update_inventory()
+    
+    if args.assemble is not None:
+        sys.exit(assemble_manual(DOCS_DIR, args.assemble, args.jobs, build_date, section_cache_dir,
+                                 args.chunk_lines))
+    
+    if args.all:
+        sys.exit(render_all(DOCS_DIR, args.output_dir, args.jobs, build_date, cache, section_cache_dir,
+                            args.backend, args.formats or ['html', 'pdf']))
+    
+    markdown_file = args.markdown_file
+    formats = args.formats or ['pdf']
+    if args.output:
+        pdf_file = args.output
+    elif os.path.abspath(markdown_file) == DEFAULT_MARKDOWN:
+        pdf_file = DEFAULT_PDF
+    else:
+        pdf_file = os.path.splitext(markdown_file)[0] + '.pdf'
+    base = os.path.splitext(pdf_file)[0]
+    outputs = {fmt: pdf_file if fmt == 'pdf' else f'{base}.{fmt}' for fmt in formats}
+    
+    if not os.path.exists(markdown_file):
+        print(f"✗ Arquivo não encontrado: {markdown_file}")
+        sys.exit(1)
+    
+    backends = []
+    if 'pdf' in formats:
+        backends = candidate_backends(args.backend)
+        # O fallback HTML escreveria por cima do HTML pedido em --formats
+        if 'html' in formats:
+            backends = [backend for backend in backends if backend.output == 'pdf']
+        if not backends:
+            print("✗ Nenhum back end disponível para gerar o PDF")
+            sys.exit(1)
+    primary = backends[0].name if backends else None
+    
+    contexts = {fmt: format_context(fmt, primary, build_date) for fmt in formats}
+    if cache is not None:
+        for fmt in list(outputs):
+            # Saídas do fallback HTML não entram no cache
+            if fmt == 'pdf' and backends[0].output != 'pdf':
+                continue
+            if cache.is_fresh(markdown_file, outputs[fmt], contexts[fmt]):
+                print(f"✓ {fmt.upper()} já atualizado (cache): {outputs[fmt]}")
+                del outputs[fmt]
+        if not outputs:
+            cache.save()
+            return
+    
+    print(f"📄 Processando: {markdown_file}")
+    for fmt, output in outputs.items():
+        print(f"📕 Gerando {fmt.upper()}: {output}")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    print()
+    
+    # Ler o markdown uma única vez; seções inalteradas vêm do cache
+    sections = load_sections(markdown_file)
+    # Com --profile, os formatos rodam neste processo (onde o perfil é coletado)
+    jobs = 1 if profiling_active() else args.jobs
+    results = render_formats(sections, markdown_file, outputs, build_date, section_cache_dir,
+                             [backend.name for backend in backends], jobs)
+    
+    failed = [fmt for fmt, result in results.items() if result is None]
+    for fmt, result in results.items():
+        if result is not None and fmt != 'pdf':
+            print(f"✓ {fmt.upper()} gerado: {outputs[fmt]}")
+    
+    if cache is not None:
+        for fmt, result in results.items():
+            if result is None or (fmt == 'pdf' and get_backend(result).output != 'pdf'):
+                continue
+            context = contexts[fmt] if fmt != 'pdf' else pdf_context(result, build_date)
+            cache.record(markdown_file, outputs[fmt], context)
+        cache.save()
+    
+    if failed:
+        print(f"✗ Não foi possível gerar: {', '.join(failed)}")
+        sys.exit(1)
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Busca offline na documentação do Bota Love App
+Consulta o índice gerado com os docs (generate_pdf.py --all) sem reler o
+markdown; palavras soltas precisam aparecer todas no trecho e "frases entre
+aspas" precisam aparecer em sequência
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from docgen.search import build_index, load_index, search, write_index
+
+# Caminhos padrão
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DOCS_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), 'docs')
+INDEX_FILE = os.path.join(DOCS_DIR, 'build', 'search-index.json')
+SECTION_CACHE_DIR = os.path.join(DOCS_DIR, '.docgen-cache', 'sections')
+
+
+def rebuild_index(docs_dir, index_file, section_cache_dir=None):
+    """Gera o índice de docs_dir (somente seções alteradas são tokenizadas)"""
+    from docgen.batch import find_markdown_files
+    from docgen.sections import SectionCache
+
+    start = time.perf_counter()
+    cache = SectionCache(section_cache_dir) if section_cache_dir else None
+    index = build_index(find_markdown_files(docs_dir), docs_dir, cache)
+    changed = write_index(index, index_file)
+
+    elapsed = (time.perf_counter() - start) * 1000
+    status = 'atualizado' if changed else 'sem alterações'
+    print(f"✓ Índice {status}: {index_file} "
+          f"({len(index['docs'])} trechos, {len(index['terms'])} termos, {elapsed:.0f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Busca na documentação técnica do Bota Love App')
+    parser.add_argument('query', nargs='*', help='Termos e "frases entre aspas"')
+    parser.add_argument('--index', default=INDEX_FILE,
+                        help='Arquivo de índice (padrão: docs/build/search-index.json)')
+    parser.add_argument('-n', '--limit', type=int, default=10, help='Máximo de resultados (padrão: 10)')
+    parser.add_argument('--json', action='store_true', help='Resultados em JSON')
+    parser.add_argument('--build', action='store_true',
+                        help='Gera/atualiza o índice a partir de docs/ antes de consultar')
+    args = parser.parse_args()
+
+    if args.build:
+        rebuild_index(DOCS_DIR, args.index, SECTION_CACHE_DIR)
+    if not args.query:
+        if not args.build:
+            parser.error('informe uma consulta (ou --build para gerar o índice)')
+        return
+
+    query = ' '.join(args.query)
+    start = time.perf_counter()
+    try:
+        index = load_index(args.index)
+    except OSError:
+        print(f"✗ Índice não encontrado: {args.index} (gere com --build ou generate_pdf.py --all)")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    loaded = time.perf_counter()
+    results = search(index, query, args.limit)
+    end = time.perf_counter()
+
+    if args.json:
+        json.dump([
+            {'file': name, 'anchor': anchor, 'title': title, 'score': round(score, 4)}
+            for score, (name, anchor, title, _) in results
+        ], sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+
+    for position, (score, (name, anchor, title, _)) in enumerate(results, 1):
+        target = f'{name}#{anchor}' if anchor else name
+        print(f"{position:2}. {title or name}")
+        print(f"    {target}  ({score:.3f})")
+
+    if not results:
+        print(f"ℹ Nenhum resultado para: {query}")
+    print(f"⏱ {len(results)} resultado(s) em {(end - loaded) * 1000:.1f} ms "
+          f"(índice carregado em {(loaded - start) * 1000:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
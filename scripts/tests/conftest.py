@@ -0,0 +1,12 @@
+"""
+Configuração dos testes do pipeline de documentação (scripts/docgen)
+Os scripts rodam de dentro de scripts/ e importam o pacote docgen direto
+"""
+
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
@@ -0,0 +1,24 @@
+"""Arquivos do modo --all (docgen.batch e saídas do generate_pdf)"""
+
+import os
+
+from docgen.batch import find_markdown_files
+from generate_pdf import output_files
+
+
+def test_same_name_in_subfolder_gets_its_own_outputs(tmp_path):
+    docs = tmp_path / 'docs'
+    (docs / 'a').mkdir(parents=True)
+    (docs / '.oculto').mkdir()
+    for path in ('README.md', 'a/README.md', '.oculto/X.md', 'a/nota.txt'):
+        (docs / path).write_text('# Doc\n', encoding='utf-8')
+
+    found = find_markdown_files(str(docs))
+    assert found == [str(docs / 'README.md'), str(docs / 'a' / 'README.md')]
+
+    out = str(tmp_path / 'build')
+    outputs = [output_files(path, out, ('html', 'pdf'), str(docs)) for path in found]
+    assert outputs == [
+        {'html': os.path.join(out, 'README.html'), 'pdf': os.path.join(out, 'README.pdf')},
+        {'html': os.path.join(out, 'a', 'README.html'), 'pdf': os.path.join(out, 'a', 'README.pdf')},
+    ]
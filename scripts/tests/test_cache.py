@@ -0,0 +1,89 @@
+"""Cache de build por hash de conteúdo (docgen.cache)"""
+
+import os
+
+import pytest
+
+from docgen.cache import BuildCache, build_context
+
+
+@pytest.fixture
+def built(tmp_path):
+    markdown_file = tmp_path / 'DOC.md'
+    markdown_file.write_text('# Doc\n\nTexto\n', encoding='utf-8')
+    output_file = tmp_path / 'DOC.html'
+    output_file.write_text('<html></html>', encoding='utf-8')
+    context = build_context('html', {'css': 'body {}'}, '2026-01-01')
+
+    cache = BuildCache(str(tmp_path / 'manifest.json'))
+    cache.record(str(markdown_file), str(output_file), context)
+    cache.save()
+    return markdown_file, output_file, context
+
+
+def fresh(tmp_path, markdown_file, output_file, context):
+    return BuildCache(str(tmp_path / 'manifest.json')).is_fresh(str(markdown_file), str(output_file), context)
+
+
+def touch(path, delta=10):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + delta * 10**9))
+
+
+def test_unchanged_source_is_fresh(tmp_path, built):
+    assert fresh(tmp_path, *built)
+
+
+def test_mtime_change_with_same_content_is_fresh(tmp_path, built):
+    markdown_file, output_file, context = built
+    touch(markdown_file)
+
+    cache = BuildCache(str(tmp_path / 'manifest.json'))
+    assert cache.is_fresh(str(markdown_file), str(output_file), context)
+    # O novo mtime é gravado: o próximo build nem precisa re-hashear
+    cache.save()
+    entry = BuildCache(str(tmp_path / 'manifest.json')).entries['DOC.html']
+    assert entry['mtime_ns'] == os.stat(markdown_file).st_mtime_ns
+
+
+def test_content_change_is_stale(tmp_path, built):
+    markdown_file, output_file, context = built
+    markdown_file.write_text('# Doc\n\nTexto novo\n', encoding='utf-8')
+    touch(markdown_file)
+    assert not fresh(tmp_path, *built)
+
+
+def test_same_size_content_change_is_stale(tmp_path, built):
+    markdown_file, output_file, context = built
+    markdown_file.write_text('# Doc\n\nTEXTO\n', encoding='utf-8')
+    touch(markdown_file)
+    assert not fresh(tmp_path, *built)
+
+
+def test_context_change_is_stale(tmp_path, built):
+    markdown_file, output_file, _ = built
+    other = build_context('html', {'css': 'body {}'}, '2026-01-02')
+    assert not fresh(tmp_path, markdown_file, output_file, other)
+
+
+def test_missing_output_is_stale(tmp_path, built):
+    built[1].unlink()
+    assert not fresh(tmp_path, *built)
+
+
+def test_force_ignores_manifest(tmp_path, built):
+    markdown_file, output_file, context = built
+    cache = BuildCache(str(tmp_path / 'manifest.json'), force=True)
+    assert not cache.is_fresh(str(markdown_file), str(output_file), context)
+
+
+def test_watch_process_sees_edits(tmp_path, built):
+    # Mesmo objeto de cache aberto (como no --watch): o hash em memória não pode mascarar a edição
+    markdown_file, output_file, context = built
+    cache = BuildCache(str(tmp_path / 'manifest.json'))
+    touch(markdown_file)
+    assert cache.is_fresh(str(markdown_file), str(output_file), context)
+
+    markdown_file.write_text('# Doc\n\nOutro texto\n', encoding='utf-8')
+    touch(markdown_file, 20)
+    assert not cache.is_fresh(str(markdown_file), str(output_file), context)
@@ -0,0 +1,56 @@
+"""TTFont com tabelas em cache (docgen.fonts)"""
+
+import pytest
+
+from docgen import fonts
+from docgen.fonts import FontCache, create_ttfont, find_font_file
+
+ttfonts = pytest.importorskip('reportlab.pdfbase.ttfonts')
+
+FONT_FILE = find_font_file('DejaVuSans.ttf')
+
+pytestmark = pytest.mark.skipif(FONT_FILE is None, reason='DejaVuSans.ttf não instalada')
+
+
+@pytest.fixture
+def version(monkeypatch):
+    """Troca a versão do ReportLab vista pelo cache de fontes"""
+    def set_version(value):
+        monkeypatch.setattr('reportlab.Version', value)
+        fonts.font_cache_supported.cache_clear()
+    yield set_version
+    fonts.font_cache_supported.cache_clear()
+
+
+@pytest.mark.skipif(not fonts.font_cache_supported(), reason='ReportLab fora de CACHED_FONT_VERSIONS')
+def test_cached_font_matches_public_constructor(tmp_path):
+    plain = ttfonts.TTFont('Plain', FONT_FILE)
+    cache = FontCache(str(tmp_path))
+    for _ in range(2):  # leitura do TTF e depois das tabelas em cache
+        cached = create_ttfont('Plain', FONT_FILE, cache)
+        assert type(cached.face) is not ttfonts.TTFontFace
+        assert set(vars(cached)) == set(vars(plain))
+        assert set(vars(cached.face)) - {'cache', 'key'} == set(vars(plain.face))
+        assert cached.face.charToGlyph == plain.face.charToGlyph
+        assert cached.stringWidth('Olá ✓', 10) == plain.stringWidth('Olá ✓', 10)
+
+
+def test_unknown_reportlab_version_uses_public_constructor(tmp_path, version):
+    version('99.1.0')
+    font = create_ttfont('Plain', FONT_FILE, FontCache(str(tmp_path)))
+    assert type(font.face) is ttfonts.TTFontFace
+    assert not list(tmp_path.glob('*.pickle'))
+
+
+def test_pdf_context_follows_resolved_fonts(monkeypatch):
+    # Uma fonte de fallback a menos na máquina invalida os PDFs em cache
+    from docgen import styles
+    from generate_pdf import pdf_context
+
+    monkeypatch.setattr(styles, '_STYLE_POOL', {})
+    before = pdf_context('reportlab', '2026-01-01')
+    monkeypatch.setattr(styles, '_STYLE_POOL', {})
+    monkeypatch.setattr(fonts, 'FALLBACK_FONTS', tuple(
+        entry for entry in fonts.FALLBACK_FONTS if entry[1] != 'DejaVuSans.ttf'
+    ))
+    assert pdf_context('reportlab', '2026-01-01') != before
@@ -0,0 +1,61 @@
+"""Cache de imagens de origem e rendições (docgen.images)"""
+
+import pytest
+
+from docgen.images import ImageCache, ImageResolver
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def image(path, size, color='red'):
+    Image.new('RGB', size, color).save(path)
+    return str(path)
+
+
+def test_parallel_caches_keep_each_others_sources(tmp_path):
+    # Dois workers do --all com o mesmo diretório: nenhum perde a entrada do outro
+    first = image(tmp_path / 'a.png', (40, 20))
+    second = image(tmp_path / 'b.png', (10, 30))
+    cache_dir = str(tmp_path / 'cache')
+    ImageCache(cache_dir).source_info(first)
+    ImageCache(cache_dir).source_info(second)
+
+    fresh = ImageCache(cache_dir)
+    assert fresh.source_info(first)[1:3] == (40, 20)
+    assert fresh.source_info(second)[1:3] == (10, 30)
+    # Lidas do índice, sem reabrir as imagens
+    assert fresh._load_entry(first) is not None and fresh._load_entry(second) is not None
+
+
+def test_changed_source_is_read_again(tmp_path):
+    path = image(tmp_path / 'a.png', (40, 20))
+    cache_dir = str(tmp_path / 'cache')
+    before = ImageCache(cache_dir).source_info(path)
+
+    image(tmp_path / 'a.png', (80, 60), 'blue')
+    after = ImageCache(cache_dir).source_info(path)
+    assert after.hash != before.hash and after[1:3] == (80, 60)
+
+
+def test_corrupt_entry_is_ignored(tmp_path):
+    path = image(tmp_path / 'a.png', (40, 20))
+    cache = ImageCache(str(tmp_path / 'cache'))
+    cache.source_info(path)
+    with open(cache._entry_path(path), 'w', encoding='utf-8') as f:
+        f.write('{corrompido')
+
+    assert ImageCache(str(tmp_path / 'cache')).source_info(path)[1:3] == (40, 20)
+
+
+def test_fingerprint_follows_parenthesised_image_path(tmp_path):
+    # Destinos com parênteses (como no tokenizador inline) entram na chave do cache de seções
+    (tmp_path / 'app' / '(tabs)').mkdir(parents=True)
+    path = image(tmp_path / 'app' / '(tabs)' / 'a.png', (40, 20))
+    text = '![tela](app/(tabs)/a.png "Tela")'
+    resolver = ImageResolver(ImageCache(str(tmp_path / 'cache')), str(tmp_path), 300)
+    before = resolver.fingerprint(text)
+    assert before.startswith('app/(tabs)/a.png=')
+
+    image(path, (80, 60), 'blue')
+    resolver = ImageResolver(ImageCache(str(tmp_path / 'cache')), str(tmp_path), 300)
+    assert resolver.fingerprint(text) != before
@@ -0,0 +1,51 @@
+"""Tokenizador inline (docgen.inline)"""
+
+from docgen.inline import parse_inline
+from docgen.nodes import Code, Emphasis, Image, Link, Strong, Text
+from docgen.render_html import render_inline
+
+
+def test_link_target_with_parentheses():
+    nodes = parse_inline('[app/(tabs)/index.tsx](app/(tabs)/index.tsx) - Tela feed')
+    assert nodes == (
+        Link('app/(tabs)/index.tsx', (Text('app/(tabs)/index.tsx'),)),
+        Text(' - Tela feed'),
+    )
+
+
+def test_link_inside_parentheses_keeps_closing_paren():
+    nodes = parse_inline('(ver [guia](docs/guia.md))')
+    assert nodes == (Text('(ver '), Link('docs/guia.md', (Text('guia'),)), Text(')'))
+
+
+def test_link_with_title():
+    assert parse_inline('[a](b "Título")') == (Link('b', (Text('a'),), 'Título'),)
+    assert render_inline(parse_inline('[a](b "x")')) == '<a href="b" title="x">a</a>'
+
+
+def test_image_with_parentheses_and_title():
+    assert parse_inline('![logo](img/(1).png "Logo")') == (Image('img/(1).png', 'logo', 'Logo'),)
+
+
+def test_escapes_are_merged_into_text():
+    assert parse_inline(r'\*não\* é \[link\](x)') == (Text('*não* é [link](x)'),)
+
+
+def test_nested_emphasis():
+    assert parse_inline('*a **b** c*') == (
+        Emphasis((Text('a '), Strong((Text('b'),)), Text(' c'))),
+    )
+    assert parse_inline('**a *b* c**') == (
+        Strong((Text('a '), Emphasis((Text('b'),)), Text(' c'))),
+    )
+    assert parse_inline('***ambos***') == (Strong((Emphasis((Text('ambos'),)),)),)
+
+
+def test_lone_asterisks_stay_text():
+    assert parse_inline('2 * 3 * 4') == (Text('2 * 3 * 4'),)
+
+
+def test_code_is_not_parsed():
+    assert parse_inline('use `**x**` e `` a`b ``') == (
+        Text('use '), Code('**x**'), Text(' e '), Code('a`b'),
+    )
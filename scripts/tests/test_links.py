@@ -0,0 +1,67 @@
+"""Grafo de links e verificação offline (docgen.links)"""
+
+from docgen.links import broken_links, build_link_graph, check_links
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def check(root, markdown):
+    doc = write(root / 'docs' / 'GUIA.md', markdown)
+    return check_links(build_link_graph([doc], str(root)))
+
+
+def test_parenthesised_relative_path_resolves(tmp_path):
+    write(tmp_path / 'app' / '(tabs)' / 'index.tsx', 'export {};\n')
+    checked = check(tmp_path, '# Guia\n\n- [feed](../app/(tabs)/index.tsx) - Tela feed\n')
+
+    assert [(link.href, link.target, link.status) for link in checked] == [
+        ('../app/(tabs)/index.tsx', 'app/(tabs)/index.tsx', 'ok'),
+    ]
+
+
+def test_root_relative_path_gets_hint(tmp_path):
+    write(tmp_path / 'app' / '(tabs)' / 'index.tsx', 'export {};\n')
+    checked = check(tmp_path, '# Guia\n\n[feed](app/(tabs)/index.tsx)\n')
+
+    [link] = broken_links(checked)
+    assert link.target == 'docs/app/(tabs)/index.tsx'
+    assert link.status == 'missing-file'
+    assert link.hint == '../app/(tabs)/index.tsx'
+
+
+def test_anchors(tmp_path):
+    checked = check(tmp_path, '# Guia\n\n## 1. Visão Geral\n\n[a](#1-visão-geral) [b](#1-visao-geral)\n')
+
+    assert [(link.href, link.status) for link in checked] == [
+        ('#1-visão-geral', 'ok'),
+        ('#1-visao-geral', 'missing-anchor'),
+    ]
+
+
+def test_file_links_are_checked_on_disk(tmp_path):
+    write(tmp_path / 'app' / 'index.tsx', 'export {};\n')
+    outside = tmp_path.parent / f'{tmp_path.name}-fora.txt'
+    outside.write_text('fora\n', encoding='utf-8')
+    try:
+        app = (tmp_path / 'app' / 'index.tsx').as_uri()
+        guide = (tmp_path / 'docs' / 'GUIA.md').as_uri()
+        checked = check(tmp_path, (
+            f'# Guia\n\n[a]({app}) [b]({app}x) [c]({guide}#guia) [d]({guide}#outra) '
+            f'[e]({outside.as_uri()}) [f]({outside.as_uri()}x) [g](file://servidor/x.md)\n'
+        ))
+    finally:
+        outside.unlink()
+
+    assert [(link.label, link.target, link.status) for link in checked] == [
+        ('a', 'app/index.tsx', 'ok'),
+        ('b', 'app/index.tsxx', 'missing-file'),
+        ('c', 'docs/GUIA.md', 'ok'),
+        ('d', 'docs/GUIA.md', 'missing-anchor'),
+        ('e', str(outside), 'ok'),
+        ('f', str(outside) + 'x', 'missing-file'),
+        ('g', None, 'external'),
+    ]
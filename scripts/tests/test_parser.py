@@ -0,0 +1,79 @@
+"""Tokenizador de blocos (docgen.parser)"""
+
+from docgen.nodes import (
+    BulletList, Code, CodeBlock, Heading, ListItem, Paragraph, Quote, Rule, Strong, Table, Text,
+)
+from docgen.parser import iter_blocks, parse_markdown
+
+
+def blocks(source):
+    return list(iter_blocks(source.split('\n')))
+
+
+def test_fenced_code_is_literal():
+    [block] = blocks('```ts\n# não é título\n- nem lista\n\n| nem | tabela |\n```')
+    assert block == CodeBlock('ts', ['# não é título', '- nem lista', '', '| nem | tabela |'])
+
+
+def test_unclosed_fence_keeps_lines():
+    assert blocks('```\nconst a = 1;') == [CodeBlock('', ['const a = 1;'])]
+
+
+def test_headings_and_anchors():
+    result = blocks('# 1. Visão Geral\n## **Stack** `ts`\n### Visão Geral\n#### Visão Geral\n#sem espaço')
+    assert [(block.level, block.anchor) for block in result if isinstance(block, Heading)] == [
+        (1, '1-visão-geral'),
+        (2, 'stack-ts'),
+        (3, 'visão-geral'),
+        (4, 'visão-geral-1'),
+    ]
+    assert result[1].children == (Strong((Text('Stack'),)), Text(' '), Code('ts'))
+    assert result[-1] == Paragraph((Text('#sem espaço'),))
+
+
+def test_lists():
+    [block] = blocks('- um\n  - dois\n1. três\n10. quatro\n✅ feito\n❌ pendente')
+    assert isinstance(block, BulletList)
+    assert [(item.marker, item.depth, item.ordered) for item in block.items] == [
+        ('-', 0, False),
+        ('-', 1, False),
+        ('1.', 0, True),
+        ('10.', 0, True),
+        ('✅', 0, False),
+        ('❌', 0, False),
+    ]
+    assert block.items[0] == ListItem('-', 0, False, (Text('um'),))
+
+
+def test_list_ends_at_other_block():
+    result = blocks('- a\n- b\ntexto\n- c')
+    assert [type(block) for block in result] == [BulletList, Paragraph, BulletList]
+    assert len(result[0].items) == 2
+
+
+def test_table():
+    [block] = blocks('| Nome | Qtd | Obs |\n|:-----|----:|:---:|\n| `a|b` | 2 |\n| x \\| y | 3 | 4 | 5 |')
+    assert isinstance(block, Table)
+    assert block.aligns == ['left', 'right', 'center']
+    assert block.header == [(Text('Nome'),), (Text('Qtd'),), (Text('Obs'),)]
+    # Células faltando são completadas e as sobrando, cortadas
+    assert block.rows == [
+        [(Code('a|b'),), (Text('2'),), ()],
+        [(Text('x | y'),), (Text('3'),), (Text('4'),)],
+    ]
+
+
+def test_pipe_line_without_delimiter_is_paragraph():
+    assert blocks('| só uma linha |\ntexto') == [
+        Paragraph((Text('| só uma linha |'),)),
+        Paragraph((Text('texto'),)),
+    ]
+
+
+def test_rule_and_quote():
+    assert blocks('---\n> citação\n***') == [Rule(), Quote((Text('citação'),)), Rule()]
+
+
+def test_parse_markdown_accepts_lines_with_newlines():
+    source = '# Título\r\n\r\nTexto\n'
+    assert parse_markdown(source.splitlines(keepends=True)) == parse_markdown(source)
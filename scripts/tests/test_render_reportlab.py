@@ -0,0 +1,16 @@
+"""Marcação inline do back end ReportLab (docgen.render_reportlab)"""
+
+from docgen.inline import parse_inline
+from docgen.render_reportlab import render_inline
+
+
+def test_internal_links_point_to_existing_anchors():
+    nodes = parse_inline('[Visão](#vis%C3%A3o) e [Outra](#sumiu) em [site](https://a.b/?x=1&y=2)')
+    assert render_inline(nodes, anchors=frozenset({'visão'})) == (
+        '<a href="#visão" color="#F9A825">Visão</a> e Outra em '
+        '<a href="https://a.b/?x=1&amp;y=2" color="#F9A825">site</a>'
+    )
+
+
+def test_internal_links_without_anchors_keep_only_the_label():
+    assert render_inline(parse_inline('[Visão](#visão)')) == 'Visão'
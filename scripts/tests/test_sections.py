@@ -0,0 +1,118 @@
+"""Seções e cache de seções (docgen.sections)"""
+
+from docgen.nodes import CodeBlock, Heading
+from docgen.parser import parse_markdown
+from docgen.sections import SectionCache, render_sections, sections_blocks, split_sections
+
+SOURCE = '''Preâmbulo
+
+# Capítulo
+Texto
+
+## Parte A
+```
+## não é seção
+```
+
+## Parte A
+Fim
+'''
+
+
+def sections_of(source):
+    return split_sections(source.split('\n'))
+
+
+class Recorder:
+    """render que conta quantas seções realmente renderizou"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, blocks):
+        self.calls += 1
+        return [type(block).__name__ for block in blocks]
+
+
+def test_split_sections():
+    sections = sections_of(SOURCE)
+    assert [section.source.split('\n')[0] for section in sections] == [
+        'Preâmbulo', '# Capítulo', '## Parte A', '## Parte A',
+    ]
+    assert [section.is_chapter for section in sections] == [False, True, False, False]
+    # Âncoras únicas no documento todo, mesmo com as seções tokenizadas separadas
+    assert [entry.anchor for section in sections for entry in section.headings] == ['capítulo', 'parte-a', 'parte-a-1']
+    heading = sections[3].blocks[0]
+    assert isinstance(heading, Heading) and heading.anchor == 'parte-a-1'
+    assert isinstance(sections[2].blocks[1], CodeBlock)
+
+
+def test_sections_match_whole_document_parse():
+    assert sections_blocks(sections_of(SOURCE)) == parse_markdown(SOURCE).blocks
+
+
+def test_unchanged_sections_come_from_cache(tmp_path):
+    cache = SectionCache(str(tmp_path / 'sections'))
+    render = Recorder()
+    first = render_sections(sections_of(SOURCE), 'kind', 'ctx', render, cache)
+    assert (render.calls, cache.misses, cache.hits) == (4, 4, 0)
+
+    # Outro processo (cache só em disco): nada é renderizado de novo
+    disk = SectionCache(str(tmp_path / 'sections'))
+    assert render_sections(sections_of(SOURCE), 'kind', 'ctx', render, disk) == first
+    assert (render.calls, disk.hits) == (4, 4)
+
+
+def test_edit_invalidates_only_its_section(tmp_path):
+    cache = SectionCache(str(tmp_path / 'sections'))
+    render_sections(sections_of(SOURCE), 'kind', 'ctx', Recorder(), cache)
+
+    render = Recorder()
+    render_sections(sections_of(SOURCE.replace('Texto', 'Texto novo')), 'kind', 'ctx', render, cache)
+    assert render.calls == 1
+
+
+def test_anchor_change_invalidates_later_section(tmp_path):
+    # Um novo '## Parte A' antes muda a âncora (e o fragmento) da seção seguinte
+    cache = SectionCache(str(tmp_path / 'sections'))
+    render_sections(sections_of(SOURCE), 'kind', 'ctx', Recorder(), cache)
+
+    edited = SOURCE.replace('Texto\n', 'Texto\n\n## Parte A\n')
+    render = Recorder()
+    render_sections(sections_of(edited), 'kind', 'ctx', render, cache)
+    assert render.calls == 3
+
+
+def test_kind_and_context_are_part_of_the_key(tmp_path):
+    cache = SectionCache(str(tmp_path / 'sections'))
+    render_sections(sections_of(SOURCE), 'kind', 'ctx', Recorder(), cache)
+
+    render = Recorder()
+    render_sections(sections_of(SOURCE), 'kind', 'outro', render, cache)
+    render_sections(sections_of(SOURCE), 'outro', 'ctx', render, cache)
+    assert render.calls == 8
+
+
+def test_corrupt_entry_is_rendered_again(tmp_path):
+    cache = SectionCache(str(tmp_path / 'sections'))
+    render_sections(sections_of(SOURCE), 'kind', 'ctx', Recorder(), cache)
+    for path in (tmp_path / 'sections').rglob('*.pickle'):
+        path.write_bytes(b'corrompido')
+
+    render = Recorder()
+    render_sections(sections_of(SOURCE), 'kind', 'ctx', render, SectionCache(str(tmp_path / 'sections')))
+    assert render.calls == 4
+
+
+def test_internal_link_targets_are_part_of_the_key(tmp_path):
+    # O fragmento com '[..](#nova)' muda quando o título 'Nova' passa a existir
+    source = '# Capítulo\nVeja [a nova parte](#nova)\n\n## Outra\nFim\n'
+    cache = SectionCache(str(tmp_path / 'sections'))
+    render = Recorder()
+    render_sections(sections_of(source), 'kind', 'ctx', render, cache, anchors=frozenset({'capítulo', 'outra'}))
+    render_sections(sections_of(source), 'kind', 'ctx', render, cache, anchors=frozenset({'capítulo'}))
+    assert render.calls == 2
+
+    anchors = frozenset({'capítulo', 'outra', 'nova'})
+    render_sections(sections_of(source), 'kind', 'ctx', render, cache, anchors=anchors)
+    assert render.calls == 3
@@ -0,0 +1,37 @@
+"""Âncoras no formato do GitHub (docgen.toc)"""
+
+import pytest
+
+from docgen.parser import parse_markdown
+from docgen.toc import PresetSlugger, Slugger, TocEntry, slugify, toc_entries
+
+
+@pytest.mark.parametrize('text, anchor', [
+    ('1. Visão Geral', '1-visão-geral'),
+    ('Stack Tecnológico', 'stack-tecnológico'),
+    ('🔐 Segurança e Regras Firestore', '-segurança-e-regras-firestore'),
+    ('API (v2) & Webhooks!', 'api-v2--webhooks'),
+    ('snake_case e kebab-case', 'snake_case-e-kebab-case'),
+    ('  Espaços nas pontas  ', 'espaços-nas-pontas'),
+    ('Ação: Não? Sim.', 'ação-não-sim'),
+])
+def test_slugify_matches_github(text, anchor):
+    assert slugify(text) == anchor
+
+
+def test_repeated_headings_get_suffixes():
+    slugger = Slugger()
+    assert [slugger(text) for text in ['Uso', 'Uso', 'Uso-1', 'Uso']] == ['uso', 'uso-1', 'uso-1-1', 'uso-2']
+
+
+def test_preset_slugger_falls_back_to_slugify():
+    slugger = PresetSlugger(['fixa'])
+    assert [slugger('A'), slugger('Outra Âncora')] == ['fixa', 'outra-âncora']
+
+
+def test_toc_uses_plain_text_of_heading():
+    blocks = parse_markdown('# **Negrito** e `código`\n## [Link](x.md)').blocks
+    assert toc_entries(blocks) == [
+        TocEntry(1, 'Negrito e código', 'negrito-e-código'),
+        TocEntry(2, 'Link', 'link'),
+    ]
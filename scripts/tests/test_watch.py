@@ -0,0 +1,61 @@
+"""Observação de arquivos do modo --watch (docgen.watch)"""
+
+import os
+import sys
+
+import pytest
+
+from docgen.watch import InotifyWatcher, PollingWatcher, WatchedPaths
+
+
+def write(path, text):
+    path.write_text(text, encoding='utf-8')
+    # mtime adiantado: o polling não depende da resolução do relógio do sistema de arquivos
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    return str(path)
+
+
+def test_watched_paths(tmp_path):
+    docs = tmp_path / 'docs'
+    watched = WatchedPaths([str(tmp_path / 'README.md')], [str(docs)])
+    assert str(tmp_path / 'README.md') in watched
+    assert str(docs / 'NOVO.md') in watched
+    assert str(docs / 'NOVO.html') not in watched
+    assert str(tmp_path / 'OUTRO.md') not in watched
+    assert watched.watched_dirs() == [str(tmp_path), str(docs)]
+
+
+def test_polling_sees_new_edited_and_removed_files(tmp_path):
+    old = write(tmp_path / 'A.md', '# A')
+    watcher = PollingWatcher(directories=[str(tmp_path)], interval=0.01)
+    assert watcher.wait(0.05) == set()
+
+    new = write(tmp_path / 'B.md', '# B')
+    write(tmp_path / 'B.html', '<h1>B</h1>')
+    assert watcher.wait(0.5) == {new}
+
+    write(tmp_path / 'A.md', '# A editado')
+    assert watcher.wait(0.5) == {old}
+
+    os.remove(new)
+    assert watcher.wait(0.5) == {new}
+    assert watcher.wait(0.05) == set()
+
+
+def test_polling_files_only(tmp_path):
+    watched = write(tmp_path / 'A.md', '# A')
+    watcher = PollingWatcher([watched], interval=0.01)
+    write(tmp_path / 'B.md', '# B')
+    assert watcher.wait(0.05) == set()
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='inotify só no Linux')
+def test_inotify_sees_new_file_in_directory(tmp_path):
+    watcher = InotifyWatcher(directories=[str(tmp_path)])
+    try:
+        new = write(tmp_path / 'NOVO.md', '# Novo')
+        write(tmp_path / 'NOVO.html', '<h1>Novo</h1>')
+        assert watcher.wait(1) == {new}
+    finally:
+        watcher.close()